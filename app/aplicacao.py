@@ -1,49 +1,28 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pandera.pandas as pa
 import io
 
 
 from core.schemas import metricas_setores, metricas_cargos, metricas_empresas, metricas_funcionarios
-from core.util import tratar_caracteres, validar_sexo, normalizar_coluna_cep, verificar_integridade, settings
-from core.codigos_erro import mapear_codigo_erro, mapear_codigo_erro_pandera, obter_descricao_codigo, eh_campo_opcional
+from core.util import normalizar_textos, validar_sexo, normalizar_coluna_cep, verificar_integridade, settings
+from core.codigos_erro import TabelaCodigos, mapear_codigo_erro, eh_campo_opcional
+from core.coletor_erros import ColetorErros
+from core.validacao_blocos import validar_progressivamente
 from janitor import clean_names
 
 def adicionar_erro_relatorio(lista, mensagem, planilha, linha, coluna, tipo):
     nullable = eh_campo_opcional(coluna)
     codigo_erro = mapear_codigo_erro(mensagem, coluna, nullable)
-    descricao_codigo = obter_descricao_codigo(codigo_erro)
     
-    erro = {
-        "codigoERRO": codigo_erro,
-        "Descrição do Código": descricao_codigo,
-        "Mensagem Detalhada": mensagem,
-        "planilha": planilha,
-        "linha": linha,
-        "coluna": coluna,
-        "tipo": tipo,
-        "severidade": "CRÍTICO" if not nullable else "AVISO"
-    }
-    lista.append(erro)
+    lista.adicionar(codigo_erro, mensagem, planilha, linha, coluna, tipo, "CRÍTICO" if not nullable else "AVISO")
 
-def adicionar_erro_schema(lista, mensagem, planilha, linha, coluna, tipo):
-    """Função específica para erros de validação de schema (pandera)"""
-    codigo_erro = mapear_codigo_erro_pandera(mensagem, coluna)
-    descricao_codigo = obter_descricao_codigo(codigo_erro)
+def adicionar_erro_schema(lista, mensagem, planilha, linha, coluna, tipo, check):
+    """Função específica para erros de validação de schema (pandera); o código vem do (check, coluna)"""
+    codigo_erro = tabela_codigos.codigo(str(check), coluna)
     nullable = eh_campo_opcional(coluna)
     
-    erro = {
-        "codigoERRO": codigo_erro,
-        "Descrição do Código": descricao_codigo,
-        "Mensagem Detalhada": mensagem,
-        "planilha": planilha,
-        "linha": linha,
-        "coluna": coluna,
-        "tipo": tipo,
-        "severidade": "CRÍTICO" if not nullable else "AVISO"
-    }
-    lista.append(erro)
+    lista.adicionar(codigo_erro, mensagem, planilha, linha, coluna, tipo, "CRÍTICO" if not nullable else "AVISO")
 
 
 schemas = {
@@ -52,6 +31,12 @@ schemas = {
     "Cargos": metricas_cargos,
     "Modelo F": metricas_funcionarios
 }
+tabela_codigos = TabelaCodigos(schemas)
+
+CAMPOS_OPCIONAIS = ["cod_empresa","telefone", "cod_cbo","nome_social",
+                    "trabalho_em_altura", "dt_admissao", "pis_pasep", "rg",
+                    "uf_do_rg", "emissor_rg", "ctps", "serie_ctps", "uf_ctps",
+                    "endereco", "numero", "bairro", "cidade", "uf", "celular","cep","inscricao"]
 
 st.title("Validador de Planilhas")
 
@@ -63,12 +48,12 @@ if uploaded_file:
     
     # Normaliza nomes das colunas em todas as abas PRIMEIRO
     for aba_nome, aba_df in df_dict.items():
-        aba_df = aba_df.applymap(tratar_caracteres)
+        aba_df = normalizar_textos(aba_df)
         df_dict[aba_nome] = clean_names(aba_df, case_type="snake")
     
     normalized_dfs = {}
     todas_abas_validas = True  # Variável para controlar se todas as abas são válidas
-    lista = []  # Lista para coletar todos os erros
+    lista = ColetorErros(sem_linha="N/A")  # Coletor de todos os erros; "N/A" = erro sem linha
 
     for aba, df in df_dict.items():
         df = df.replace({np.nan: None})
@@ -234,119 +219,74 @@ if uploaded_file:
 
         normalized_dfs[aba] = df.copy()
 
-        sample_size = max(1, int(len(df) * 0.10))
-        sample_df = df.sample(n=sample_size, random_state=42)
-
-        st.write(f"Amostra usada para validação (10% = {len(sample_df)} linhas):")
-        st.dataframe(sample_df)
-
         schema = schemas[aba]
 
 
         aba_valida = True  # Controla se a aba atual é válida
+        # Validação única, em blocos de linhas, parando após VALIDACAO_MAX_ERROS_CRITICOS erros críticos
         try:
-            schema.validate(sample_df, lazy=True)
-        except pa.errors.SchemaErrors as e:
-            st.error("Erros de validação encontrados na amostra:")
-            aviso_opcional = []
-            erro_critico = False
-            erros_criticos = []
-            for error in e.failure_cases.itertuples():
-                linha_excel = (error.index + 2) if error.index is not None else "N/A"
-                mensagem_erro = f"{error.failure_case}, {error.check}"
-                
-                if error.column in ["cod_empresa","telefone", "cod_cbo","nome_social",
-                                    "trabalho_em_altura", "dt_admissao", "pis_pasep", "rg",
-                                    "uf_do_rg", "emissor_rg", "ctps", "serie_ctps", "uf_ctps",
-                                    "endereco", "numero", "bairro", "cidade", "uf", "celular","cep","inscricao"]:
-                    # Erro opcional - adiciona ao relatório
-                    adicionar_erro_schema(
-                        lista, mensagem_erro, 
-                        aba, linha_excel, error.column, "OPCIONAL"
-                    )
-                    aviso_opcional.append(
-                        f"- Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}"
-                    )
-                    continue
-                # Erro crítico - adiciona ao relatório
-                adicionar_erro_schema(
-                    lista, mensagem_erro,
-                    aba, linha_excel, error.column, "OBRIGATORIO"
-                )
-                erros_criticos.append(f"- Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}")
-                erro_critico = True
-            
-            if erros_criticos:
-                with st.expander("Ver detalhes dos erros críticos na amostra"):
-                    for erro in erros_criticos:
-                        st.write(erro)
-            
-            if aviso_opcional:
-                with st.expander("Ver detalhes dos campos opcionais com problemas na amostra"):
-                    for aviso in aviso_opcional:
-                        st.write(aviso)
-            if erro_critico:
-                aba_valida = False
-                todas_abas_validas = False
-                continue
-            # Se não houver erro crítico, segue para validação total normalmente
+            resultado = validar_progressivamente(schema, df, CAMPOS_OPCIONAIS)
+        except Exception as e:
+            st.error(f"Erro inesperado: {e}")
+            aba_valida = False
+            todas_abas_validas = False
+            continue
 
-        # Valida tudo
-        try:
-            schema.validate(df, lazy=True)
+        if resultado.interrompida:
+            st.warning(
+                f"Validação interrompida pelo limite de erros críticos "
+                f"({resultado.linhas_validadas} de {len(df)} linhas validadas)"
+            )
+
+        if resultado.falhas is None:
             st.success("Planilha válida!")
-        except pa.errors.SchemaErrors as e:
-            st.error("Erros de validação encontrados no arquivo completo:")
-            aviso_opcional = []
-            erro_critico = False
-            erros_criticos = []
-            for error in e.failure_cases.itertuples():
-                linha_excel = (error.index + 2) if error.index is not None else "N/A"
-                mensagem_erro = f"{error.failure_case}, {error.check}"
-                
-                if error.column in ["cod_empresa","telefone", "cod_cbo","nome_social",
-                                    "trabalho_em_altura", "dt_admissao", "pis_pasep", "rg",
-                                    "uf_do_rg", "emissor_rg", "ctps", "serie_ctps", "uf_ctps",
-                                    "endereco", "numero", "bairro", "cidade", "uf", "celular","cep","inscricao"]:
-                    adicionar_erro_schema(
-                        lista, mensagem_erro, 
-                        aba, linha_excel, error.column, "OPCIONAL"
-                    )
-                    aviso_opcional.append(
-                        f"- Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}"
-                    )
-                    continue
-                # Erro crítico - adiciona ao relatório
+            continue
+
+        st.error("Erros de validação encontrados:")
+        aviso_opcional = []
+        erro_critico = False
+        erros_criticos = []
+        for error in resultado.falhas.itertuples():
+            linha_excel = (error.index + 2) if error.index is not None else "N/A"
+            mensagem_erro = f"{error.failure_case}, {error.check}"
+            
+            if error.column in CAMPOS_OPCIONAIS:
+                # Erro opcional - adiciona ao relatório
                 adicionar_erro_schema(
-                    lista, mensagem_erro,
-                    aba, linha_excel, error.column, "OBRIGATORIO"
+                    lista, mensagem_erro, 
+                    aba, linha_excel, error.column, "OPCIONAL", error.check
                 )
-                erros_criticos.append(f"- Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}")
-                erro_critico = True
-            
-            if erros_criticos:
-                with st.expander("Ver detalhes dos erros críticos no arquivo completo"):
-                    for erro in erros_criticos:
-                        st.write(erro)
-            
-            if aviso_opcional:
-                with st.expander("Ver detalhes dos campos opcionais com problemas"):
-                    for aviso in aviso_opcional:
-                        st.write(aviso)
-            if erro_critico:
-                aba_valida = False
-                todas_abas_validas = False
-            else:
-                # Se não há erros críticos, apenas opcionais, considera válida
-                st.success("Planilha válida! (apenas campos opcionais com problemas)")
-        except Exception as e:
-            st.error(f"Erro inesperado: {e}")
+                aviso_opcional.append(
+                    f"- Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}"
+                )
+                continue
+            # Erro crítico - adiciona ao relatório
+            adicionar_erro_schema(
+                lista, mensagem_erro,
+                aba, linha_excel, error.column, "OBRIGATORIO", error.check
+            )
+            erros_criticos.append(f"- Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}")
+            erro_critico = True
+        
+        if erros_criticos:
+            with st.expander("Ver detalhes dos erros críticos"):
+                for erro in erros_criticos:
+                    st.write(erro)
+        
+        if aviso_opcional:
+            with st.expander("Ver detalhes dos campos opcionais com problemas"):
+                for aviso in aviso_opcional:
+                    st.write(aviso)
+        if erro_critico:
             aba_valida = False
             todas_abas_validas = False
+        else:
+            # Se não há erros críticos, apenas opcionais, considera válida
+            st.success("Planilha válida! (apenas campos opcionais com problemas)")
 
     # Botão para baixar relatório de erros
     if lista:
-        df_relatorio = pd.DataFrame(lista)
+        df_relatorio = lista.para_dataframe()
         
         buffer_relatorio = io.BytesIO()
         df_relatorio.to_excel(buffer_relatorio, index=False, sheet_name="Relatório_Erros")
@@ -0,0 +1,98 @@
+"""Planilha normalizada em Parquet.
+
+Além do ``.xlsx`` entregue ao usuário, as abas normalizadas são publicadas como um
+conjunto Parquet comprimido em ``normalized_dataset_prefix_for(arquivo_id)``: um arquivo
+por aba mais um manifesto (``abas.json``) com a ordem e o nome de cada aba. Os tipos da
+validação (texto Arrow, categorias, ``Int64``, datas) sobrevivem à ida e volta, e a
+importação lê só as colunas de que precisa, sem reinterpretar o Excel.
+
+``publicar_planilha_normalizada`` é o ponto único de publicação: grava o ``.xlsx`` em
+``normalized_key_for`` e o conjunto Parquet juntos, então quem publica a planilha
+também deixa o Parquet pronto para a importação.
+"""
+from __future__ import annotations
+import io
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import pandas as pd
+import pyarrow
+
+from .cache_validacao import ler_parquet
+from .schemas import TEXTO
+from .storage_service import get_bytes, normalized_dataset_prefix_for, normalized_key_for, open_cached, put_bytes, put_fileobj
+from .util import logger, settings
+
+MANIFESTO = "abas.json"
+COMPRESSAO_PADRAO = "zstd"
+TIPO_PARQUET = "application/vnd.apache.parquet"
+TIPO_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _serializar(df: pd.DataFrame, compressao: str) -> io.BytesIO:
+    buffer = io.BytesIO()
+    try:
+        df.to_parquet(buffer, index=False, compression=compressao)
+    except (pyarrow.ArrowException, ValueError):
+        # Coluna object que mistura tipos (valor que não converteu no schema): vai como texto
+        mistas = list(df.select_dtypes("object").columns)
+        logger.warning(f"Colunas {mistas} gravadas como texto no Parquet normalizado")
+        buffer = io.BytesIO()
+        df.astype({c: TEXTO for c in mistas}).to_parquet(buffer, index=False, compression=compressao)
+    buffer.seek(0)
+    return buffer
+
+
+def publicar_normalizado(arquivo_id: str, normalized: Mapping[str, pd.DataFrame], compressao: Optional[str] = None) -> List[str]:
+    """Grava cada aba em ``<prefixo>/<i>.parquet`` e, por último, o manifesto; retorna as chaves gravadas."""
+    prefixo = normalized_dataset_prefix_for(arquivo_id)
+    compressao = compressao or settings.get("NORMALIZADO_PARQUET_COMPRESSAO", COMPRESSAO_PADRAO)
+    abas, chaves = [], []
+    for i, (aba, df) in enumerate(normalized.items()):
+        arquivo = f"{i}.parquet"
+        chave = f"{prefixo}/{arquivo}"
+        put_fileobj(chave, _serializar(df, compressao), TIPO_PARQUET)
+        abas.append([aba, arquivo])
+        chaves.append(chave)
+    # O manifesto vai por último: quem o lê encontra todas as abas já gravadas
+    chave = f"{prefixo}/{MANIFESTO}"
+    put_bytes(chave, json.dumps({"abas": abas}, ensure_ascii=False).encode("utf-8"), "application/json")
+    chaves.append(chave)
+    return chaves
+
+
+def publicar_excel(chave: str, abas: Mapping[str, pd.DataFrame]) -> None:
+    """Grava ``abas`` como um ``.xlsx`` (uma planilha por aba) em ``chave``."""
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for aba, df in abas.items():
+            df.to_excel(writer, sheet_name=aba[:31], index=False)
+    buffer.seek(0)
+    put_fileobj(chave, buffer, TIPO_XLSX)
+
+
+def publicar_planilha_normalizada(arquivo_id: str, nome_original: str, normalized: Mapping[str, pd.DataFrame]) -> List[str]:
+    """Publica o conjunto Parquet e o ``.xlsx`` normalizado (download do usuário); retorna as chaves gravadas."""
+    chaves = publicar_normalizado(arquivo_id, normalized)
+    chave_xlsx = normalized_key_for(arquivo_id, Path(nome_original).stem)
+    publicar_excel(chave_xlsx, normalized)
+    chaves.append(chave_xlsx)
+    return chaves
+
+
+def ler_normalizado(arquivo_id: str, colunas: Optional[Mapping[str, Iterable[str]]] = None) -> Dict[str, pd.DataFrame]:
+    """Lê as abas publicadas por ``publicar_normalizado``.
+
+    Com ``colunas`` ({aba: colunas}) só as abas e colunas indicadas são lidas. Levanta
+    ``FileNotFoundError`` se o arquivo não tem conjunto Parquet publicado.
+    """
+    prefixo = normalized_dataset_prefix_for(arquivo_id)
+    manifesto = json.loads(get_bytes(f"{prefixo}/{MANIFESTO}"))
+    dfs = {}
+    for aba, arquivo in manifesto["abas"]:
+        if colunas is not None and aba not in colunas:
+            continue
+        with open_cached(f"{prefixo}/{arquivo}") as origem:
+            dfs[aba] = ler_parquet(origem, None if colunas is None else colunas[aba])
+    return dfs
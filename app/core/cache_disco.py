@@ -0,0 +1,90 @@
+"""Cache local em disco com despejo LRU por tamanho total.
+
+Cada entrada é um diretório nomeado pela chave. A escrita acontece num diretório
+temporário renomeado ao final (atômico), então leitores nunca veem entradas parciais.
+O horário de modificação do diretório marca o último acesso e define a ordem de despejo.
+"""
+from __future__ import annotations
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .util import logger
+
+
+def _tamanho(caminho: Path) -> int:
+    return sum(f.stat().st_size for f in caminho.rglob("*") if f.is_file())
+
+
+class CacheDisco:
+    """Diretório de entradas limitado a ``tamanho_maximo`` bytes.
+
+    Args:
+        diretorio: Raiz do cache (criada se não existir).
+        tamanho_maximo: Soma máxima, em bytes, das entradas; as menos usadas são removidas.
+    """
+
+    def __init__(self, diretorio: str | os.PathLike, tamanho_maximo: int):
+        self.diretorio = Path(diretorio)
+        self.tamanho_maximo = tamanho_maximo
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+
+    def caminho(self, chave: str) -> Path:
+        return self.diretorio / chave
+
+    def obter(self, chave: str) -> Optional[Path]:
+        """Retorna o diretório da entrada (marcando-a como usada) ou None se não existir."""
+        caminho = self.caminho(chave)
+        try:
+            os.utime(caminho)
+        except FileNotFoundError:
+            return None
+        return caminho
+
+    @contextmanager
+    def gravar(self, chave: str) -> Iterator[Path]:
+        """Fornece um diretório temporário; ao sair sem erro ele vira a entrada ``chave``."""
+        temporario = Path(tempfile.mkdtemp(prefix=f".{chave}.", dir=self.diretorio))
+        try:
+            yield temporario
+            try:
+                os.replace(temporario, self.caminho(chave))
+            except OSError:
+                # Outra gravação da mesma chave terminou antes; mantém a existente
+                shutil.rmtree(temporario, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temporario, ignore_errors=True)
+            raise
+        self.despejar()
+
+    def remover(self, chave: str) -> None:
+        caminho = self.caminho(chave)
+        # Renomeia antes de apagar para que leitores concorrentes não vejam entrada pela metade
+        lixo = self.diretorio / f".lixo.{uuid.uuid4().hex}"
+        try:
+            os.replace(caminho, lixo)
+        except FileNotFoundError:
+            return
+        shutil.rmtree(lixo, ignore_errors=True)
+
+    def despejar(self) -> None:
+        """Remove as entradas menos recentemente usadas até caber em ``tamanho_maximo``."""
+        entradas = []
+        for caminho in self.diretorio.iterdir():
+            if caminho.name.startswith(".") or not caminho.is_dir():
+                continue
+            try:
+                entradas.append((caminho.stat().st_mtime, _tamanho(caminho), caminho.name))
+            except FileNotFoundError:
+                continue
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, chave in sorted(entradas):
+            if total <= self.tamanho_maximo:
+                break
+            self.remover(chave)
+            total -= tamanho
+            logger.debug(f"Cache {self.diretorio}: entrada {chave} despejada ({tamanho} bytes)")
@@ -0,0 +1,237 @@
+"""Cache de resultados de ``validar_arquivo_excel``.
+
+A chave combina o SHA-256 do arquivo com uma impressão digital dos schemas
+(colunas, tipos, flags e, de cada Check, o bytecode, os valores capturados em
+closures e o código-fonte dos módulos do pacote que ele usa, como ``derivadas`` e
+``documentos``), de modo que qualquer mudança de regra invalida as entradas antigas
+automaticamente. Cada entrada guarda os DataFrames normalizados em Parquet e um
+manifesto JSON com a ordem das abas, os erros e as estatísticas; nada é lido com
+pickle. Um resultado cuja aba não converte para Parquet não é guardado.
+
+O diretório do cache precisa ser privado: pertencer ao usuário do processo e não
+aceitar escrita de grupo ou de outros. O padrão fica no diretório de cache do usuário
+(``XDG_CACHE_HOME`` ou ``~/.cache``), criado com modo 0700.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import stat
+import sys
+import types
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import pandas as pd
+import pyarrow
+import pyarrow.parquet
+
+from .cache_disco import CacheDisco
+from .coletor_erros import ColetorErros
+from .util import logger, settings
+
+# Incrementar quando a normalização/validação mudar de forma não capturada pelos schemas
+VERSAO_CACHE = 9
+
+DIRETORIO_PADRAO = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "data_quality" / "validacao"
+TAMANHO_MAXIMO_PADRAO = 1 << 30  # 1 GiB
+MANIFESTO = "resultado.json"
+
+# Módulos cujo código-fonte entra na impressão digital quando um Check os usa
+_PACOTE = __name__.rpartition(".")[0]
+
+Resultado = Tuple[Dict[str, pd.DataFrame], ColetorErros, Dict]
+
+
+def diretorio_privado(diretorio: str | os.PathLike) -> Path:
+    """Cria ``diretorio`` com modo 0700 e confere que só o usuário do processo escreve nele.
+
+    Levanta ``PermissionError`` se ele pertence a outro usuário ou aceita escrita de grupo/outros.
+    """
+    caminho = Path(diretorio)
+    caminho.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = caminho.stat()
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"Diretório de cache {caminho} pertence a outro usuário (uid {info.st_uid})")
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"Diretório de cache {caminho} aceita escrita de grupo/outros (modo {stat.filemode(info.st_mode)})")
+    return caminho
+
+
+def _repr_estavel(valor: Any) -> str:
+    # repr de set/frozenset de textos muda de processo para processo (hash aleatório)
+    if isinstance(valor, (set, frozenset)):
+        return f"{type(valor).__name__}({sorted(_repr_estavel(v) for v in valor)!r})"
+    if isinstance(valor, (tuple, list)):
+        return f"{type(valor).__name__}({[_repr_estavel(v) for v in valor]!r})"
+    if isinstance(valor, dict):
+        return f"dict({[(_repr_estavel(k), _repr_estavel(v)) for k, v in valor.items()]!r})"
+    texto = repr(valor)
+    # Objetos sem repr próprio trazem o endereço de memória: vale só o tipo
+    return f"<{type(valor).__qualname__}>" if " at 0x" in texto else texto
+
+
+def _assinatura_codigo(codigo) -> str:
+    partes = [codigo.co_code.hex(), repr(codigo.co_names)]
+    for const in codigo.co_consts:
+        # Lambdas aninhadas aparecem como code objects nas constantes
+        partes.append(_assinatura_codigo(const) if hasattr(const, "co_code") else _repr_estavel(const))
+    return "|".join(partes)
+
+
+def _nomes(codigo) -> Iterable[str]:
+    yield from codigo.co_names
+    for const in codigo.co_consts:
+        if hasattr(const, "co_code"):
+            yield from _nomes(const)
+
+
+def _modulo_do_pacote(valor: Any) -> Optional[types.ModuleType]:
+    if isinstance(valor, types.ModuleType):
+        modulo = valor
+    else:
+        modulo = sys.modules.get(getattr(valor, "__module__", None) or "")
+    if modulo is None or not modulo.__name__.startswith(f"{_PACOTE}.") or not getattr(modulo, "__file__", None):
+        return None
+    return modulo
+
+
+def _registrar_modulos(valor: Any, modulos: Set[str]) -> None:
+    """Acrescenta a ``modulos`` o módulo do pacote de ``valor`` e, transitivamente, os que ele usa."""
+    modulo = _modulo_do_pacote(valor)
+    if modulo is None or modulo.__name__ in modulos:
+        return
+    modulos.add(modulo.__name__)
+    for usado in vars(modulo).values():
+        _registrar_modulos(usado, modulos)
+
+
+@lru_cache(maxsize=None)
+def _hash_fonte(nome_modulo: str) -> str:
+    return hashlib.sha256(Path(sys.modules[nome_modulo].__file__).read_bytes()).hexdigest()
+
+
+def _assinatura_valor(valor: Any, modulos: Set[str]) -> str:
+    if hasattr(valor, "__code__"):
+        return _assinatura_funcao(valor, modulos)
+    _registrar_modulos(valor, modulos)
+    return _repr_estavel(valor)
+
+
+def _assinatura_funcao(fn, modulos: Set[str]) -> str:
+    """Bytecode de ``fn``, valores das closures e defaults; registra os módulos do pacote que ela usa."""
+    partes = [_assinatura_codigo(fn.__code__)]
+    globais = getattr(fn, "__globals__", {})
+    for nome in _nomes(fn.__code__):
+        if nome in globais:
+            _registrar_modulos(globais[nome], modulos)
+    for celula in getattr(fn, "__closure__", None) or ():
+        try:
+            partes.append(_assinatura_valor(celula.cell_contents, modulos))
+        except ValueError:  # célula ainda vazia
+            partes.append("<vazia>")
+    for padrao in getattr(fn, "__defaults__", None) or ():
+        partes.append(_assinatura_valor(padrao, modulos))
+    return "|".join(partes)
+
+
+def _assinatura_check(check, modulos: Set[str]) -> str:
+    fn = getattr(check, "_check_fn", None)
+    corpo = _assinatura_funcao(fn, modulos) if hasattr(fn, "__code__") else ""
+    return f"{check.name}:{check.error}:{sorted(check.statistics.items())!r}:{corpo}"
+
+
+def fingerprint_schemas(schemas: Mapping[str, Any], campos_opcionais: Iterable[str], limites: Iterable[Any] = ()) -> str:
+    """Impressão digital estável dos schemas Pandera, dos campos opcionais e dos limites de erros."""
+    partes = [f"versao={VERSAO_CACHE}", f"opcionais={sorted(campos_opcionais)!r}", f"limites={tuple(limites)!r}"]
+    modulos: Set[str] = set()
+    for aba, schema in schemas.items():
+        partes.append(f"aba={aba}:strict={schema.strict}:coerce={schema.coerce}:unique={schema.unique!r}")
+        partes.extend(_assinatura_check(check, modulos) for check in schema.checks)
+        for nome, coluna in schema.columns.items():
+            partes.append(
+                f"col={nome}:{coluna.dtype}:nullable={coluna.nullable}:unique={coluna.unique}:"
+                f"required={coluna.required}:regex={coluna.regex}"
+            )
+            partes.extend(_assinatura_check(check, modulos) for check in coluna.checks)
+    partes.extend(f"modulo={nome}:{_hash_fonte(nome)}" for nome in sorted(modulos))
+    return hashlib.sha256("\n".join(partes).encode()).hexdigest()
+
+
+def chave_validacao(file_bytes: bytes, fingerprint: str) -> str:
+    return hashlib.sha256(hashlib.sha256(file_bytes).digest() + fingerprint.encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def obter_cache() -> Optional[CacheDisco]:
+    """Cache configurado por VALIDACAO_CACHE_DIR/VALIDACAO_CACHE_MAX_BYTES; None se VALIDACAO_CACHE_ENABLED=false.
+
+    Também é None (com o motivo no log) se o diretório não for privado; ver ``diretorio_privado``.
+    """
+    if not settings.get("VALIDACAO_CACHE_ENABLED", True):
+        return None
+    try:
+        diretorio = diretorio_privado(settings.get("VALIDACAO_CACHE_DIR", DIRETORIO_PADRAO))
+    except OSError as e:
+        logger.error(f"Cache de validação desativado: {e}")
+        return None
+    return CacheDisco(diretorio, int(settings.get("VALIDACAO_CACHE_MAX_BYTES", TAMANHO_MAXIMO_PADRAO)))
+
+
+def ler_parquet(origem, colunas: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Lê o Parquet com os textos de volta em ``string[pyarrow]``, inclusive nas categorias.
+
+    ``origem`` é um caminho ou arquivo aberto; ``colunas`` restringe a leitura às colunas
+    indicadas que existirem no arquivo.
+    """
+    arquivo = pyarrow.parquet.ParquetFile(origem)
+    if colunas is not None:
+        existentes = set(arquivo.schema_arrow.names)
+        colunas = [c for c in colunas if c in existentes]
+    with pd.option_context("mode.string_storage", "pyarrow"):
+        df = arquivo.read(columns=colunas, use_pandas_metadata=True).to_pandas()
+    metadados = arquivo.schema_arrow.pandas_metadata or {}
+    categoricas = {c["name"] for c in metadados.get("columns", []) if c.get("pandas_type") == "categorical"}
+    for i, nome in enumerate(df.columns):
+        if nome not in categoricas:
+            continue
+        # O dicionário volta com categorias object (e sem categorias, como object)
+        serie = df.iloc[:, i].astype("category")
+        if pd.api.types.infer_dtype(serie.cat.categories) in ("string", "empty"):
+            categorias = serie.cat.categories.astype(pd.StringDtype("pyarrow"))
+            serie = pd.Series(pd.Categorical.from_codes(serie.cat.codes, categories=categorias), index=df.index)
+        df.isetitem(i, serie)
+    return df
+
+
+def carregar(cache: CacheDisco, chave: str) -> Optional[Resultado]:
+    entrada = cache.obter(chave)
+    if entrada is None:
+        return None
+    try:
+        manifesto = json.loads((entrada / MANIFESTO).read_text(encoding="utf-8"))
+        normalized = {aba: ler_parquet(entrada / arquivo) for aba, arquivo in manifesto["abas"]}
+        return normalized, ColetorErros.de_colunas(manifesto["erros"]), manifesto["stats"]
+    except Exception as e:
+        logger.warning(f"Entrada de cache de validação {chave} ilegível, descartando: {e}")
+        cache.remover(chave)
+        return None
+
+
+def salvar(cache: CacheDisco, chave: str, resultado: Resultado) -> None:
+    normalized, erros, stats = resultado
+    try:
+        with cache.gravar(chave) as destino:
+            abas = []
+            for i, (aba, df) in enumerate(normalized.items()):
+                arquivo = f"{i}.parquet"
+                df.to_parquet(destino / arquivo)
+                abas.append((aba, arquivo))
+            manifesto = {"abas": abas, "erros": erros.para_colunas(), "stats": stats}
+            (destino / MANIFESTO).write_text(json.dumps(manifesto, ensure_ascii=False), encoding="utf-8")
+    except (pyarrow.ArrowException, ValueError) as e:
+        # Coluna que mistura tipos (valor que não converteu no schema): o resultado não é guardado
+        logger.info(f"Resultado de {chave} não cabe no cache de validação: {e}")
+    except Exception as e:
+        logger.warning(f"Falha ao gravar cache de validação {chave}: {e}")
@@ -1,3 +1,9 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
 CODIGOS_ERRO = {
     # Grupo 001 – Campos Obrigatórios (nullable=False)
     "101": "Campo obrigatório vazio ou nulo",
@@ -25,6 +31,9 @@ CODIGOS_ERRO = {
     # Grupo 6 - Campos únicos e integridade referencial
     "601": "Valor duplicado em campo que deve ser único",
     "602": "Código não encontrado na tabela de referência",
+
+    # Grupo 7 - Limites do relatório
+    "701": "Limite de erros atingido (demais ocorrências omitidas)",
 }
 
 def mapear_codigo_erro(mensagem_erro: str, coluna: str, nullable: bool = False) -> str:
@@ -83,6 +92,14 @@ def mapear_codigo_erro(mensagem_erro: str, coluna: str, nullable: bool = False)
     return "201"
 
 
+# Checks com código fixo, identificados pelo nome (``pa.Check(..., name=...)``): o código
+# não depende do texto da mensagem, que pode ser reescrito à vontade
+CHECK_DIGITOS_VERIFICADORES = "digitos_verificadores"
+CODIGOS_POR_CHECK = {
+    CHECK_DIGITOS_VERIFICADORES: "202",
+}
+
+
 def obter_descricao_codigo(codigo: str) -> str:
     return CODIGOS_ERRO.get(codigo, "Erro não catalogado")
 
@@ -115,3 +132,51 @@ def mapear_codigo_erro_pandera(mensagem_erro: str, coluna: str) -> str:
     # Fallback para função padrão
     nullable = eh_campo_opcional(coluna)
     return mapear_codigo_erro(mensagem_erro, coluna, nullable)
+
+
+@lru_cache(maxsize=4096)
+def codigo_check_pandera(check: str, coluna: str) -> str:
+    """Código de erro de um check Pandera (mensagem ``error=`` ou identificador) numa coluna.
+
+    Depende só do check e da coluna, não do valor que falhou; memorizado para checks
+    que não estão na ``TabelaCodigos``.
+    """
+    return mapear_codigo_erro_pandera(check, coluna)
+
+
+# Identificadores dos checks que o próprio Pandera gera para cada coluna
+_CHECKS_IMPLICITOS = ("not_nullable", "field_uniqueness", "coerce_dtype('{dtype}')", "dtype('{dtype}')")
+
+
+class TabelaCodigos:
+    """Código de erro de cada (check, coluna) dos schemas, resolvido uma vez ao carregar os schemas.
+
+    Checks registrados em ``CODIGOS_POR_CHECK`` (pelo nome) usam o código registrado; os
+    demais são mapeados pela mensagem (``codigo_check_pandera``).
+    """
+
+    def __init__(self, schemas: Mapping[str, Any]):
+        self._tabela: Dict[Tuple[str, str], str] = {}
+        for schema in schemas.values():
+            for nome, coluna in schema.columns.items():
+                for c in coluna.checks:
+                    check = c.error or c.name
+                    self._tabela[(check, nome)] = CODIGOS_POR_CHECK.get(c.name) or codigo_check_pandera(check, nome)
+                for implicito in _CHECKS_IMPLICITOS:
+                    check = implicito.format(dtype=coluna.dtype)
+                    self._tabela[(check, nome)] = codigo_check_pandera(check, nome)
+
+    def codigo(self, check: str, coluna: str) -> str:
+        codigo = self._tabela.get((check, coluna))
+        return codigo if codigo is not None else codigo_check_pandera(check, coluna)
+
+    def codigos(self, checks: Iterable[str], colunas: Iterable[str]) -> np.ndarray:
+        """Códigos de vários casos de falha: cada par (check, coluna) distinto é resolvido uma vez."""
+        codigos_check, checks_unicos = pd.factorize(np.asarray(checks, dtype=object), use_na_sentinel=False)
+        codigos_coluna, colunas_unicas = pd.factorize(np.asarray(colunas, dtype=object), use_na_sentinel=False)
+        posicoes, pares = pd.factorize(codigos_check.astype(np.int64) * len(colunas_unicas) + codigos_coluna)
+        resolvidos = np.empty(len(pares), dtype=object)
+        for i, par in enumerate(pares):
+            check, coluna = checks_unicos[par // len(colunas_unicas)], colunas_unicas[par % len(colunas_unicas)]
+            resolvidos[i] = self.codigo(str(check), None if pd.isna(coluna) else coluna)
+        return resolvidos[posicoes]
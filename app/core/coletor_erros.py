@@ -0,0 +1,231 @@
+"""Acumulador colunar dos erros de validação.
+
+``ColetorErros`` guarda os erros como estrutura de arrays: código, planilha, coluna,
+tipo, severidade e mensagem são categorias codificadas em inteiros (cada texto
+distinto é guardado uma única vez) e a linha é um array de inteiros. A descrição do
+código não é armazenada; sai de ``obter_descricao_codigo`` ao materializar.
+
+Para quem consome, continua sendo uma sequência de dicts com as chaves de sempre
+(``COLUNAS_RELATORIO``): ``len``, iteração, índice e comparação com listas funcionam.
+``para_dataframe()`` monta o relatório com colunas ``Categorical`` sobre os mesmos
+códigos, sem criar um dict por erro, e ``contagens()`` devolve as contagens por
+severidade e tipo, mantidas durante a inserção.
+
+Erro sem linha (falha da coluna inteira) é guardado como -1 e sai como ``sem_linha``:
+None por padrão, ou o marcador que o relatório usa (``ColetorErros(sem_linha="N/A")``),
+que também é aceito como linha na inserção.
+"""
+from __future__ import annotations
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .codigos_erro import obter_descricao_codigo
+
+COLUNAS_RELATORIO = [
+    "codigoERRO", "Descrição do Código", "Mensagem Detalhada", "planilha",
+    "linha", "coluna", "tipo", "severidade",
+]
+
+_SEM_LINHA = -1
+
+
+class _Categorias:
+    """Dicionário valor -> código inteiro, na ordem de primeira ocorrência."""
+
+    def __init__(self):
+        self.valores: List[Any] = []
+        self._codigos: Dict[Hashable, int] = {}
+
+    def codigo(self, valor: Any) -> int:
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def codigos(self, valores: Iterable[Any]) -> np.ndarray:
+        return np.fromiter((self.codigo(v) for v in valores), dtype=np.int32)
+
+    def categorical(self, codigos: array) -> pd.Categorical:
+        # Valores None viram código -1 (nulo) no Categorical
+        categorias = [v for v in self.valores if v is not None]
+        codigos_np = np.frombuffer(codigos, dtype=np.int32) if len(codigos) else np.empty(0, dtype=np.int32)
+        if len(categorias) != len(self.valores):
+            remapear = np.full(len(self.valores), -1, dtype=np.int32)
+            remapear[[i for i, v in enumerate(self.valores) if v is not None]] = np.arange(len(categorias), dtype=np.int32)
+            codigos_np = remapear[codigos_np]
+        return pd.Categorical.from_codes(codigos_np, categories=pd.Index(categorias, dtype=object))
+
+
+def _descricoes(codigos: pd.Categorical) -> pd.Categorical:
+    # Códigos diferentes podem ter a mesma descrição ("Erro não catalogado")
+    descricoes, posicoes = np.unique([obter_descricao_codigo(c) for c in codigos.categories], return_inverse=True)
+    novos = np.append(posicoes.astype(np.int32), -1)[codigos.codes]  # -1 (nulo) continua nulo
+    return pd.Categorical.from_codes(novos, categories=pd.Index(descricoes, dtype=object))
+
+
+_CAMPOS = ("codigoERRO", "Mensagem Detalhada", "planilha", "coluna", "tipo", "severidade")
+
+
+class ColetorErros(Sequence):
+    def __init__(self, sem_linha: Any = None):
+        self.sem_linha = sem_linha
+        self._categorias = {campo: _Categorias() for campo in _CAMPOS}
+        self._codigos = {campo: array("i") for campo in _CAMPOS}
+        self._linhas = array("q")
+        self._por_severidade: Counter = Counter()
+        self._por_tipo: Counter = Counter()
+
+    # -- inserção -------------------------------------------------------------
+
+    def adicionar(self, codigo: str, mensagem: str, planilha: Optional[str], linha, coluna: Optional[str], tipo: str, severidade: str) -> None:
+        valores = {
+            "codigoERRO": codigo, "Mensagem Detalhada": mensagem, "planilha": planilha,
+            "coluna": coluna, "tipo": tipo, "severidade": severidade,
+        }
+        for campo, valor in valores.items():
+            self._codigos[campo].append(self._categorias[campo].codigo(valor))
+        self._linhas.append(_SEM_LINHA if linha is None or self._e_sem_linha(linha) else int(linha))
+        self._por_severidade[severidade] += 1
+        self._por_tipo[tipo] += 1
+
+    def adicionar_lote(self, codigos, mensagens, planilha: Optional[str], linhas, colunas, tipos, severidades) -> None:
+        """Insere vários erros de uma vez; ``linhas`` usa None (ou NaN) para "sem linha"."""
+        lote = {
+            "codigoERRO": codigos, "Mensagem Detalhada": mensagens, "coluna": colunas,
+            "tipo": tipos, "severidade": severidades,
+        }
+        n = len(mensagens)
+        for campo, valores in lote.items():
+            self._codigos[campo].extend(self._categorias[campo].codigos(valores))
+        self._codigos["planilha"].extend(np.full(n, self._categorias["planilha"].codigo(planilha), dtype=np.int32))
+        linhas = pd.Series(linhas, dtype=object)
+        sem_linha = linhas.isna()
+        if self.sem_linha is not None:
+            sem_linha |= linhas.map(self._e_sem_linha).astype(bool)
+        self._linhas.extend(linhas.where(~sem_linha, _SEM_LINHA).astype(np.int64).to_numpy())
+        self._por_severidade.update(severidades)
+        self._por_tipo.update(tipos)
+
+    def _e_sem_linha(self, linha) -> bool:
+        return self.sem_linha is not None and isinstance(linha, type(self.sem_linha)) and linha == self.sem_linha
+
+    def estender(self, outro: "ColetorErros") -> None:
+        """Acrescenta os erros de outro coletor (ex.: devolvido por um worker)."""
+        for campo in _CAMPOS:
+            origem = outro._categorias[campo]
+            remapear = np.fromiter((self._categorias[campo].codigo(v) for v in origem.valores), dtype=np.int32, count=len(origem.valores))
+            if len(outro):
+                self._codigos[campo].extend(remapear[np.frombuffer(outro._codigos[campo], dtype=np.int32)])
+        self._linhas.extend(outro._linhas)
+        self._por_severidade.update(outro._por_severidade)
+        self._por_tipo.update(outro._por_tipo)
+
+    def truncar(self, limite: Optional[int]) -> int:
+        """Mantém só os primeiros ``limite`` erros; devolve quantos foram descartados."""
+        if not limite or len(self) <= limite:
+            return 0
+        descartados = len(self) - limite
+        for campo in ("tipo", "severidade"):
+            cortados = Counter(np.frombuffer(self._codigos[campo], dtype=np.int32)[limite:].tolist())
+            contador = self._por_tipo if campo == "tipo" else self._por_severidade
+            valores = self._categorias[campo].valores
+            for codigo, n in cortados.items():
+                contador[valores[codigo]] -= n
+                if not contador[valores[codigo]]:
+                    del contador[valores[codigo]]
+        for campo in _CAMPOS:
+            del self._codigos[campo][limite:]
+        del self._linhas[limite:]
+        return descartados
+
+    # -- serialização ---------------------------------------------------------
+
+    def para_colunas(self) -> Dict[str, Any]:
+        """Estado em tipos JSON (categorias e códigos por campo, linhas); inverso de ``de_colunas``."""
+        return {
+            "sem_linha": self.sem_linha,
+            "categorias": {campo: self._categorias[campo].valores for campo in _CAMPOS},
+            "codigos": {campo: self._codigos[campo].tolist() for campo in _CAMPOS},
+            "linhas": self._linhas.tolist(),
+        }
+
+    @classmethod
+    def de_colunas(cls, colunas: Dict[str, Any]) -> "ColetorErros":
+        coletor = cls(colunas.get("sem_linha"))
+        for campo in _CAMPOS:
+            for valor in colunas["categorias"][campo]:
+                coletor._categorias[campo].codigo(valor)
+            coletor._codigos[campo].extend(colunas["codigos"][campo])
+        coletor._linhas.extend(colunas["linhas"])
+        for campo, contador in (("severidade", coletor._por_severidade), ("tipo", coletor._por_tipo)):
+            valores = coletor._categorias[campo].valores
+            contador.update(valores[codigo] for codigo in coletor._codigos[campo])
+        return coletor
+
+    # -- leitura --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._linhas)
+
+    def _erro(self, i: int) -> dict:
+        valores = {campo: self._categorias[campo].valores[self._codigos[campo][i]] for campo in _CAMPOS}
+        linha = self._linhas[i]
+        return {
+            "codigoERRO": valores["codigoERRO"],
+            "Descrição do Código": obter_descricao_codigo(valores["codigoERRO"]),
+            "Mensagem Detalhada": valores["Mensagem Detalhada"],
+            "planilha": valores["planilha"],
+            "linha": self.sem_linha if linha == _SEM_LINHA else linha,
+            "coluna": valores["coluna"],
+            "tipo": valores["tipo"],
+            "severidade": valores["severidade"],
+        }
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._erro(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._erro(i)
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self._erro(i)
+
+    def __eq__(self, outro) -> bool:
+        if isinstance(outro, (ColetorErros, list)):
+            return len(self) == len(outro) and all(a == b for a, b in zip(self, outro))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColetorErros({len(self)} erros)"
+
+    def contagens(self) -> tuple[Dict[str, int], Dict[str, int]]:
+        """(por severidade, por tipo), do mais para o menos frequente."""
+        return dict(self._por_severidade.most_common()), dict(self._por_tipo.most_common())
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """Relatório com as colunas de ``COLUNAS_RELATORIO``; as categorias usam os códigos já guardados."""
+        codigo = self._categorias["codigoERRO"].categorical(self._codigos["codigoERRO"])
+        linhas = np.frombuffer(self._linhas, dtype=np.int64) if len(self) else np.empty(0, dtype=np.int64)
+        coluna_linha = pd.arrays.IntegerArray(linhas, linhas == _SEM_LINHA)
+        if self.sem_linha is not None and coluna_linha.isna().any():
+            coluna_linha = pd.Series(coluna_linha, dtype=object).where(linhas != _SEM_LINHA, self.sem_linha)
+        return pd.DataFrame({
+            "codigoERRO": codigo,
+            "Descrição do Código": _descricoes(codigo),
+            "Mensagem Detalhada": self._categorias["Mensagem Detalhada"].categorical(self._codigos["Mensagem Detalhada"]),
+            "planilha": self._categorias["planilha"].categorical(self._codigos["planilha"]),
+            "linha": coluna_linha,
+            "coluna": self._categorias["coluna"].categorical(self._codigos["coluna"]),
+            "tipo": self._categorias["tipo"].categorical(self._codigos["tipo"]),
+            "severidade": self._categorias["severidade"].categorical(self._codigos["severidade"]),
+        }, columns=COLUNAS_RELATORIO)
@@ -1,15 +1,19 @@
 import json
 import sqlite3
+from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Dict, List, Self, Tuple, Union
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterator, List, Self, Sequence, Tuple, Union
 from urllib.parse import quote_plus
 
 import pandas as pd
 import psycopg
+from psycopg.pq import TransactionStatus
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 
 from .dw_model import Base
+from .pool import get_pool
 from .util import logger, settings
 
 
@@ -18,6 +22,78 @@ class DatabaseType(Enum):
     POSTGRESQL = "postgresql"
 
 
+DEFAULT_COPY_BATCH_SIZE = 10_000
+
+
+def _records_to_rows(records: Union[List[Dict], pd.DataFrame]) -> Tuple[List[str], List[Tuple]]:
+    """Convert a DataFrame or list of dicts into (columns, rows) with NaN/NaT as None."""
+    if not isinstance(records, pd.DataFrame):
+        records = pd.DataFrame.from_records(records)
+    columns = [str(col) for col in records.columns]
+    values = records.astype(object)
+    for idx, dtype in enumerate(records.dtypes):
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            # pd.Timestamp is not adaptable by sqlite3; DatetimeArray.to_pydatetime returns an
+            # ndarray of datetime (Series.dt.to_pydatetime is deprecated in favour of a Series)
+            values.isetitem(idx, pd.Series(records.iloc[:, idx].array.to_pydatetime(), index=records.index, dtype=object))
+    values = values.where(records.notna(), None)
+    return columns, list(values.itertuples(index=False, name=None))
+
+
+def _batches(rows: Sequence[Tuple], batch_size: int) -> Iterator[Sequence[Tuple]]:
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def _open_connection(db_type: DatabaseType, database: str) -> Union[sqlite3.Connection, psycopg.Connection]:
+    """Create a database connection based on the specified type and database name.
+    Args:
+        db_type: Database type.
+        database: Name of the database configuration to use (from settings), for PostgreSQL db_name or file path for SQLite.
+    Returns:
+        Union[sqlite3.Connection, psycopg.Connection]: Connection object to the database.
+    """
+    _database = database
+    # SQLite path fallback
+    if db_type == DatabaseType.SQLITE:
+        if not _database or _database == "default":
+            # prefer explicit setting, otherwise use app data dir
+            sqlite_path = settings.get("DATABASE_LOCAL_SQLITE") or (settings.get("APP_DATA_DIR") + "/local.db")
+            _database = sqlite_path
+        return sqlite3.connect(_database, check_same_thread=False)
+
+    # PostgreSQL: use settings.get to avoid KeyError; if any required key is missing, fall back to local sqlite
+    elif db_type == DatabaseType.POSTGRESQL:
+        user = settings.get(f"DATABASE_{_database.upper()}_USER")
+        password = settings.get(f"DATABASE_{_database.upper()}_PASSWORD")
+        host = settings.get(f"DATABASE_{_database.upper()}_HOST")
+        port = settings.get(f"DATABASE_{_database.upper()}_PORT")
+        db_name = settings.get(f"DATABASE_{_database.upper()}_DB")
+
+        missing = [k for k, v in (
+            ("user", user), ("password", password), ("host", host), ("port", port), ("db", db_name)
+        ) if not v]
+        if missing:
+            logger.warning(f"Postgres config incomplete for '{_database}' ({missing}); falling back to local sqlite for development.")
+            sqlite_path = settings.get("DATABASE_LOCAL_SQLITE") or (settings.get("APP_DATA_DIR") + "/local.db")
+            return sqlite3.connect(sqlite_path, check_same_thread=False)
+
+        return psycopg.connect(
+            dbname=db_name,
+            user=user,
+            password=password,
+            host=host,
+            port=port,
+            application_name="dw_import",
+        )
+
+
+@lru_cache(maxsize=None)
+def _cached_engine(url: str) -> Engine:
+    # One engine (and its own connection pool) per URL for the whole process
+    return create_engine(url)
+
+
 class Operator:
     """Table helper for database operations."""
 
@@ -47,59 +123,46 @@ class Operator:
         if db_type == DatabaseType.SQLITE and (not database or database == "default"):
             database = settings.DATABASE_LOCAL_SQLITE
         self.database = database
-        self.conn = self.create_connection()
+        # Connections are borrowed from a process-wide pool per database profile
+        self._pool = get_pool((db_type.value, database), partial(_open_connection, db_type, database))
+        self.conn = self._pool.acquire()
+        self.last_stats: Dict[str, int] = {}
 
     def create_connection(self) -> Union[sqlite3.Connection, psycopg.Connection]:
-        """Create a database connection based on the specified type and database name.
-        Args:
-            database: Name of the database configuration to use (from settings), for PostgreSQL db_name or file path for SQLite.
+        """Create a new database connection (not pooled) for this operator's profile.
         Returns:
             Union[sqlite3.Connection, psycopg.Connection]: Connection object to the database.
         """
-        _database = self.database
-        # SQLite path fallback
-        if self.db_type == DatabaseType.SQLITE:
-            if not _database or _database == "default":
-                # prefer explicit setting, otherwise use app data dir
-                sqlite_path = settings.get("DATABASE_LOCAL_SQLITE") or (settings.get("APP_DATA_DIR") + "/local.db")
-                _database = sqlite_path
-            return sqlite3.connect(_database)
+        return _open_connection(self.db_type, self.database)
 
-        # PostgreSQL: use settings.get to avoid KeyError; if any required key is missing, fall back to local sqlite
-        elif self.db_type == DatabaseType.POSTGRESQL:
-            user = settings.get(f"DATABASE_{_database.upper()}_USER")
-            password = settings.get(f"DATABASE_{_database.upper()}_PASSWORD")
-            host = settings.get(f"DATABASE_{_database.upper()}_HOST")
-            port = settings.get(f"DATABASE_{_database.upper()}_PORT")
-            db_name = settings.get(f"DATABASE_{_database.upper()}_DB")
-
-            missing = [k for k, v in (
-                ("user", user), ("password", password), ("host", host), ("port", port), ("db", db_name)
-            ) if not v]
-            if missing:
-                logger.warning(f"Postgres config incomplete for '{_database}' ({missing}); falling back to local sqlite for development.")
-                sqlite_path = settings.get("DATABASE_LOCAL_SQLITE") or (settings.get("APP_DATA_DIR") + "/local.db")
-                return sqlite3.connect(sqlite_path)
-
-            return psycopg.connect(
-                dbname=db_name,
-                user=user,
-                password=password,
-                host=host,
-                port=port,
-                application_name="dw_import",
-            )
+    def close(self) -> None:
+        """Return the borrowed connection to the pool."""
+        conn, self.conn = getattr(self, "conn", None), None
+        if conn is not None:
+            self._pool.release(conn)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def create_engine(self) -> Engine:
-        """Create a SQLAlchemy engine for PostgreSQL or SQLite based on the database configuration.
+        """Return the (cached) SQLAlchemy engine for PostgreSQL or SQLite based on the database configuration.
         Returns:
             Engine: SQLAlchemy engine object.
         """
         _database = self.database
         if self.db_type == DatabaseType.SQLITE:
-            return create_engine(f"sqlite:///{self.database}")
+            return _cached_engine(f"sqlite:///{self.database}")
         elif self.db_type == DatabaseType.POSTGRESQL:
-            return create_engine(
+            return _cached_engine(
                 f"postgresql+psycopg://{settings[f"DATABASE_{_database.upper()}_USER"]}:{quote_plus(
                     settings[f"DATABASE_{_database.upper()}_PASSWORD"]
                 )}@{settings[f"DATABASE_{_database.upper()}_HOST"]}:{settings[f"DATABASE_{_database.upper()}_PORT"]}/{settings[f"DATABASE_{_database.upper()}_DB"]}",
@@ -116,6 +179,35 @@ class Operator:
         Base.metadata.create_all(engine, tables=[model.__table__], checkfirst=True)
         return self
 
+    def _upsert_clauses(
+        self,
+        columns: List[str],
+        updated_at_field: str,
+        exclude_update_columns: Tuple[str, ...],
+    ) -> Tuple[str, str]:
+        """Build the SET and WHERE clauses of the ON CONFLICT ... DO UPDATE part."""
+        # Keys excluding key_field and excluded columns
+        update_columns = [
+            col
+            for col in columns
+            if col not in exclude_update_columns and col != self.key_field
+        ]
+
+        # Build SET clause (include updated_at) for update when there are columns to update
+        set_parts = [f"{col} = EXCLUDED.{col}" for col in update_columns]
+        set_parts.append(f"{updated_at_field} = CURRENT_TIMESTAMP")
+        set_clause = ",\n    ".join(set_parts)
+
+        # Build WHERE clause - true if any monitored column differs from EXCLUDED
+        where_conditions = [
+            f"{self.table}.{col} IS DISTINCT FROM EXCLUDED.{col}"
+            for col in update_columns
+        ]
+        where_clause = (
+            " OR\n       ".join(where_conditions) if where_conditions else "FALSE"
+        )
+        return set_clause, where_clause
+
     def generate_upsert_query(
         self,
         data: Dict[str, Any],
@@ -136,27 +228,9 @@ class Operator:
         Returns:
             Tuple of (query, parameters dict).
         """
-        # Keys excluding key_field and excluded columns
-        update_columns = [
-            col
-            for col in data.keys()
-            if col not in exclude_update_columns and col != self.key_field
-        ]
-
         insert_columns = list(data.keys())
-
-        # Build SET clause (include updated_at) for update when there are columns to update
-        set_parts = [f"{col} = EXCLUDED.{col}" for col in update_columns]
-        set_parts.append(f"{updated_at_field} = CURRENT_TIMESTAMP")
-        set_clause = ",\n    ".join(set_parts)
-
-        # Build WHERE clause - true if any monitored column differs from EXCLUDED
-        where_conditions = [
-            f"{self.table}.{col} IS DISTINCT FROM EXCLUDED.{col}"
-            for col in update_columns
-        ]
-        where_clause = (
-            " OR\n       ".join(where_conditions) if where_conditions else "FALSE"
+        set_clause, where_clause = self._upsert_clauses(
+            insert_columns, updated_at_field, exclude_update_columns
         )
 
         if self.db_type == DatabaseType.SQLITE:
@@ -199,7 +273,7 @@ class Operator:
         
 
         if self.db_type == DatabaseType.SQLITE:
-            placeholders = [f":{col})" for col in columns]
+            placeholders = [f":{col}" for col in columns]
             query = (
                 f"INSERT INTO {self.table} ({', '.join(columns)}) \n"
                 f"VALUES ({', '.join(placeholders)});"
@@ -240,6 +314,8 @@ class Operator:
     ) -> Self:
         """
         Insert records into the table.
+        On SQLite the inserted rows are committed at the end, unless the caller already
+        had a transaction open (the pool rolls back whatever is left on release).
         Args:
             records: List of dictionaries or DataFrame to insert.
         """
@@ -253,6 +329,7 @@ class Operator:
 
         _inserted = 0
         _rollbacks = 0
+        own_transaction = self.db_type == DatabaseType.SQLITE and not self.conn.in_transaction
         for idx, data in enumerate(records):
             query, params = self.generate_insert_query(data)
             logger.debug(f"Inserting record {idx+1}: {params}")
@@ -276,18 +353,149 @@ class Operator:
                     self.conn.rollback()
                     _rollbacks += 1
                     continue
+        if own_transaction:
+            self.conn.commit()
         logger.info(
             f"[INSERT] Inserted data into table '{self.table}'\n{json.dumps({'inserted': _inserted, 'rollbacks': _rollbacks, 'total': len(records)}, indent=2,)}"
         )
         return self
 
+    def _is_sqlite(self) -> bool:
+        # create_connection may fall back to SQLite even when db_type is POSTGRESQL
+        return isinstance(self.conn, sqlite3.Connection)
+
+    @contextmanager
+    def _bulk_transaction(self) -> Iterator[None]:
+        """Outer transaction of a PostgreSQL bulk load.
+
+        On an idle connection the load runs in its own transaction, committed on exit.
+        If the caller already has a transaction open, the load joins it (as a savepoint)
+        and committing stays with the caller; pending work is never committed here.
+        """
+        status = self.conn.info.transaction_status
+        if status == TransactionStatus.INERROR:
+            raise RuntimeError(f"Connection for '{self.table}' is in a failed transaction; roll it back before loading")
+        if status == TransactionStatus.INTRANS:
+            logger.warning(f"Bulk load into '{self.table}' joins the caller's open transaction; the caller must commit it")
+        with self.conn.transaction():
+            yield
+
+    def _copy_batch(self, cur, columns: List[str], batch: Sequence[Tuple]) -> None:
+        with cur.copy(f"COPY {self.table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in batch:
+                copy.write_row(row)
+
+    def _insert_rows_isolated(self, cur, columns: List[str], batch: Sequence[Tuple]) -> Tuple[int, int]:
+        """Insert each row of a rejected batch in its own savepoint. Returns (inserted, rejected)."""
+        inserted = rejected = 0
+        if self._is_sqlite():
+            query = f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+            for row in batch:
+                cur.execute("SAVEPOINT bulk_row")
+                try:
+                    cur.execute(query, row)
+                    inserted += 1
+                except sqlite3.Error as e:
+                    logger.error(f"Row rejected in {self.table}: {e} {row}")
+                    cur.execute("ROLLBACK TO bulk_row")
+                    rejected += 1
+                cur.execute("RELEASE bulk_row")
+            return inserted, rejected
+
+        query = f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join('%s' for _ in columns)})"
+        for row in batch:
+            try:
+                with self.conn.transaction():
+                    cur.execute(query, row)
+                inserted += 1
+            except psycopg.Error as e:
+                logger.error(f"Row rejected in {self.table}: {e} {row}")
+                rejected += 1
+        return inserted, rejected
+
+    def bulk_insert(
+        self,
+        records: Union[List[Dict], pd.DataFrame],
+        batch_size: int | None = None,
+    ) -> Self:
+        """
+        Insert records in a single transaction using COPY ... FROM STDIN (PostgreSQL)
+        or executemany (SQLite), one batch at a time. The load commits its own
+        transaction; inside a transaction the caller opened it joins it instead.
+        A batch that fails is rolled back to its savepoint and retried row by row,
+        so a bad row is rejected without aborting the whole load.
+
+        Args:
+            records: List of dictionaries or DataFrame to insert.
+            batch_size: Rows per batch. Defaults to settings DATABASE_COPY_BATCH_SIZE.
+        """
+        columns, rows = _records_to_rows(records)
+        if not rows:
+            raise ValueError("No records to insert.")
+        batch_size = batch_size or int(settings.get("DATABASE_COPY_BATCH_SIZE", DEFAULT_COPY_BATCH_SIZE))
+        logger.info(
+            f"Starting bulk insert for {len(rows)} records into table '{self.table}' (batch_size={batch_size})"
+        )
+
+        _inserted = 0
+        _rejected = 0
+        _failed_batches = 0
+        if self._is_sqlite():
+            query = f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+            cur = self.conn.cursor()
+            # Same rule as _bulk_transaction: commit only a transaction this load opened
+            own_transaction = not self.conn.in_transaction
+            cur.execute("SAVEPOINT bulk_load")
+            for idx, batch in enumerate(_batches(rows, batch_size)):
+                cur.execute("SAVEPOINT bulk_batch")
+                try:
+                    cur.executemany(query, batch)
+                    _inserted += len(batch)
+                except sqlite3.Error as e:
+                    logger.warning(f"Batch {idx+1} rejected in {self.table}, retrying row by row: {e}")
+                    cur.execute("ROLLBACK TO bulk_batch")
+                    _failed_batches += 1
+                    inserted, rejected = self._insert_rows_isolated(cur, columns, batch)
+                    _inserted += inserted
+                    _rejected += rejected
+                cur.execute("RELEASE bulk_batch")
+            cur.execute("RELEASE bulk_load")
+            if own_transaction:
+                self.conn.commit()
+        else:  # PostgreSQL
+            with self._bulk_transaction():
+                with self.conn.cursor() as cur:
+                    for idx, batch in enumerate(_batches(rows, batch_size)):
+                        try:
+                            with self.conn.transaction():
+                                self._copy_batch(cur, columns, batch)
+                            _inserted += len(batch)
+                        except psycopg.Error as e:
+                            logger.warning(f"Batch {idx+1} rejected in {self.table}, retrying row by row: {e}")
+                            _failed_batches += 1
+                            inserted, rejected = self._insert_rows_isolated(cur, columns, batch)
+                            _inserted += inserted
+                            _rejected += rejected
+
+        self.last_stats = {
+            "inserted": _inserted,
+            "rejected": _rejected,
+            "failed_batches": _failed_batches,
+            "total": len(rows),
+        }
+        logger.info(
+            f"[BULK INSERT] Inserted data into table '{self.table}'\n{json.dumps(self.last_stats, indent=2)}"
+        )
+        return self
+
     def upsert(
         self,
         records: Union[List[Dict], pd.DataFrame],
     ) -> Self:
         """
         Upsert using a generated query with conditional update.
-        Logs progress and wrap execution in a transaction.
+        Logs progress and wrap execution in a transaction. On SQLite the changes are
+        committed at the end, unless the caller already had a transaction open.
         """
         if isinstance(records, pd.DataFrame):
             records = records.to_dict(orient="records")
@@ -298,6 +506,7 @@ class Operator:
         _inserted = 0
         _updated = 0
         _rollbacks = 0
+        own_transaction = self.db_type == DatabaseType.SQLITE and not self.conn.in_transaction
         for idx, data in enumerate(records):
             query, params = self.generate_upsert_query(data)
             logger.debug(f"Upserting record {idx+1}: {params}")
@@ -326,6 +535,8 @@ class Operator:
                     self.conn.rollback()
                     _rollbacks += 1
                     continue
+        if own_transaction:
+            self.conn.commit()
         stats = {
             "inserted": _inserted,
             "updated": _updated,
@@ -337,8 +548,117 @@ class Operator:
         )
         return self
 
+    def bulk_upsert(
+        self,
+        records: Union[List[Dict], pd.DataFrame],
+        batch_size: int | None = None,
+        updated_at_field: str = "updated_at",
+        exclude_update_columns: Tuple[str, ...] = ("id", "created_at"),
+    ) -> Self:
+        """
+        Set-based upsert: bulk-load the records into a temporary staging table and merge
+        them with a single INSERT ... SELECT ... ON CONFLICT (key_field) DO UPDATE,
+        updating only rows where some column IS DISTINCT FROM the incoming value.
+        Runs in one transaction (committed here only if the connection was idle, as in
+        bulk_insert); inserted/updated counts are aggregated server-side.
+
+        Args:
+            records: List of dictionaries or DataFrame to upsert.
+            batch_size: Rows per COPY batch into the staging table.
+            updated_at_field: Column name to set to now() on update.
+            exclude_update_columns: Columns excluded from update checks.
+        """
+        if not isinstance(records, pd.DataFrame):
+            records = pd.DataFrame.from_records(records)
+        if self.key_field in records.columns:
+            # ON CONFLICT cannot touch the same row twice in one statement: last one wins
+            records = records.drop_duplicates(subset=[self.key_field], keep="last")
+        columns, rows = _records_to_rows(records)
+        batch_size = batch_size or int(settings.get("DATABASE_COPY_BATCH_SIZE", DEFAULT_COPY_BATCH_SIZE))
+        logger.info(
+            f"Starting bulk upsert for {len(rows)} records into table '{self.table}'"
+        )
+
+        staging = f"_stg_{self.table.replace('.', '_')}"
+        column_list = ", ".join(columns)
+        set_clause, where_clause = self._upsert_clauses(columns, updated_at_field, exclude_update_columns)
+        _inserted = 0
+        _updated = 0
+        if not rows:
+            pass
+        elif self._is_sqlite():
+            cur = self.conn.cursor()
+            own_transaction = not self.conn.in_transaction
+            cur.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+            cur.execute(f"CREATE TEMP TABLE {staging} AS SELECT {column_list} FROM {self.table} WHERE 0")
+            cur.execute("SAVEPOINT bulk_upsert")
+            try:
+                placeholders = ", ".join("?" for _ in columns)
+                for batch in _batches(rows, batch_size):
+                    cur.executemany(f"INSERT INTO {staging} ({column_list}) VALUES ({placeholders})", batch)
+                cur.execute(
+                    f"SELECT count(*) FROM {staging} s WHERE NOT EXISTS "
+                    f"(SELECT 1 FROM {self.table} t WHERE t.{self.key_field} = s.{self.key_field})"
+                )
+                _inserted = cur.fetchone()[0]
+                # "WHERE true" resolves the INSERT ... SELECT / ON CONFLICT parsing ambiguity in SQLite
+                cur.execute(
+                    f"INSERT INTO {self.table} ({column_list}) \n"
+                    f"SELECT {column_list} FROM {staging} WHERE true \n"
+                    f"ON CONFLICT ({self.key_field}) DO UPDATE SET \n"
+                    f"{set_clause} \n"
+                    f"WHERE {where_clause};"
+                )
+                _updated = cur.rowcount - _inserted
+                cur.execute("RELEASE bulk_upsert")
+                if own_transaction:
+                    self.conn.commit()
+            except sqlite3.Error:
+                cur.execute("ROLLBACK TO bulk_upsert")
+                cur.execute("RELEASE bulk_upsert")
+                raise
+            finally:
+                cur.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+        else:  # PostgreSQL
+            with self._bulk_transaction():
+                with self.conn.cursor() as cur:
+                    cur.execute(
+                        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                        f"SELECT {column_list} FROM {self.table} WITH NO DATA"
+                    )
+                    for batch in _batches(rows, batch_size):
+                        with cur.copy(f"COPY {staging} ({column_list}) FROM STDIN") as copy:
+                            for row in batch:
+                                copy.write_row(row)
+                    cur.execute(
+                        f"WITH upserted AS ( \n"
+                        f"INSERT INTO {self.table} ({column_list}) \n"
+                        f"SELECT {column_list} FROM {staging} \n"
+                        f"ON CONFLICT ({self.key_field}) DO UPDATE \n"
+                        f"SET {set_clause} \n"
+                        f"WHERE {where_clause} \n"
+                        f"RETURNING (xmax = 0) AS inserted \n"
+                        f") \n"
+                        f"SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted;"
+                    )
+                    _inserted, _updated = cur.fetchone()
+
+        self.last_stats = {
+            "inserted": _inserted,
+            "updated": _updated,
+            "unchanged": len(rows) - _inserted - _updated,
+            "total": len(rows),
+        }
+        logger.info(
+            f"[STATS] Bulk upsert executed for {len(rows)} records into table '{self.table}'\n{json.dumps(self.last_stats, indent=2)}"
+        )
+        return self
+
     # Check if table exists otherwise create it
     def _table_exists(self) -> bool:
+        # The lookup must not leave an implicit transaction open (a later bulk load would
+        # only get a savepoint inside it and never commit)
+        idle = self.conn.info.transaction_status == TransactionStatus.IDLE
         with self.conn.cursor() as cur:
             cur.execute(
                 f"""
@@ -354,6 +674,8 @@ class Operator:
                 """
             )
             exists = cur.fetchone()[0]
+            if idle:
+                self.conn.rollback()
 
             if not exists:
                 logger.info(f"Table '{self.table}' does not exist. Creating it.")
@@ -391,6 +713,22 @@ class Operator:
             "complex64": "TEXT",
             "complex128": "TEXT",
             "bytes": "BYTEA",
+            # Nullable/Arrow dtypes of the typed validation frames (str() differs from numpy's)
+            "Int64": "BIGINT",
+            "Int32": "BIGINT",
+            "Int16": "BIGINT",
+            "Int8": "BIGINT",
+            "UInt8": "BIGINT",
+            "UInt16": "BIGINT",
+            "UInt32": "BIGINT",
+            "UInt64": "BIGINT",
+            "Float64": "NUMERIC(18,6)",
+            "Float32": "NUMERIC(18,6)",
+            "boolean": "BOOLEAN",
+            "string[pyarrow]": "TEXT",
+            "datetime64[us]": "TIMESTAMP",
+            "datetime64[ms]": "TIMESTAMP",
+            "datetime64[s]": "TIMESTAMP",
         }
 
         columns = []
@@ -0,0 +1,220 @@
+"""Séries derivadas compartilhadas entre os Checks dos schemas.
+
+Vários Checks de uma mesma coluna recalculam as mesmas transformações
+(``str.strip()``, ``str.len()``, só dígitos, maiúsculas sem acento...). As funções
+deste módulo calculam cada transformação no máximo uma vez por coluna e a
+reaproveitam entre os Checks:
+
+* a transformação é aplicada aos valores distintos da coluna, na ordem da primeira
+  ocorrência, e espalhada de volta para as linhas (``take`` pelos códigos do
+  ``factorize``) — colunas como UF, cidade, setor ou situação repetem poucos valores.
+  Em colunas quase sem repetição a transformação roda direto na coluna;
+* dentro de ``escopo()`` (aberto em ``validacao_blocos.falhas``) os resultados ficam
+  memorizados por coluna até o fim da validação;
+* colunas categóricas (dicionário) usam as próprias categorias, no dtype delas, como
+  valores distintos — sem fatorar a coluna — e as de texto Arrow rodam os ``.str``
+  no Arrow. Nelas o ``casa`` usa a sintaxe de regex do Arrow (RE2: ``\\d`` só ASCII,
+  ``$`` só no fim do texto), equivalente ao ``re`` nos textos já normalizados.
+
+O resultado é idêntico ao da expressão pandas equivalente sobre a coluna inteira,
+inclusive exceções (o primeiro valor inválido é o mesmo, já que a ordem é a de
+primeira ocorrência). O código-fonte deste módulo entra na impressão digital dos
+schemas (``cache_validacao``): mudar uma transformação invalida o cache sozinho.
+"""
+from __future__ import annotations
+import threading
+import unicodedata
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+# Acima desta proporção de valores distintos a transformação roda direto na coluna
+LIMITE_CARDINALIDADE = 0.5
+
+_estado = threading.local()
+
+
+@contextmanager
+def escopo() -> Iterator[None]:
+    """Memoriza as séries derivadas por coluna até o fim do bloco (escopos aninhados compartilham a memória)."""
+    externo = getattr(_estado, "memo", None) is not None
+    if not externo:
+        _estado.memo = {}
+    try:
+        yield
+    finally:
+        if not externo:
+            _estado.memo = None
+
+
+def _chave(s: pd.Series) -> Optional[Hashable]:
+    """Identifica a coluna pela memória dos valores: endereço dos arrays NumPy (inclusive os
+    códigos das categóricas) ou o próprio array de extensão (Arrow), mantido vivo pelo memo."""
+    valores = s._values
+    if isinstance(valores, pd.Categorical):
+        return _chave_ndarray(valores.codes, s) + (id(s.dtype.categories),)
+    if isinstance(valores, np.ndarray):
+        return _chave_ndarray(valores, s)
+    return (id(valores), len(s), str(s.dtype), id(s.index))
+
+
+def _chave_ndarray(valores: np.ndarray, s: pd.Series) -> Hashable:
+    return (valores.__array_interface__["data"][0], valores.strides, len(s), valores.dtype.str, id(s.index))
+
+
+class _Coluna:
+    """Uma coluna e as transformações já calculadas sobre seus valores distintos."""
+
+    def __init__(self, s: pd.Series):
+        self.serie = s  # mantém viva a memória usada na chave
+        self.codigos: Optional[np.ndarray] = None
+        self.base = s
+        self._base: Dict[str, pd.Series] = {}
+        self._expandidas: Dict[str, pd.Series] = {}
+        if len(s) == 0:
+            return
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            # Dicionário: as transformações rodam sobre as categorias (mais o nulo, no fim)
+            categorias = s.cat.categories
+            codigos = s.cat.codes.to_numpy().astype(np.intp)
+            codigos[codigos < 0] = len(categorias)
+            self.codigos = codigos
+            self.base = pd.Series(pd.array(list(categorias) + [None], dtype=categorias.dtype))
+            return
+        nulos = s.isna().to_numpy()
+        if s.dtype == object and nulos.any() and s[nulos].map(type).nunique() > 1:
+            return  # None e NaN misturados: factorize os unificaria
+        codigos, unicos = pd.factorize(s, use_na_sentinel=False)
+        if len(unicos) > LIMITE_CARDINALIDADE * len(s):
+            return
+        unicos = unicos.to_numpy(dtype=s.dtype, copy=True) if s.dtype == object else unicos
+        if nulos.any() and s.dtype == object:
+            # factorize devolve NaN no lugar do nulo original
+            unicos[codigos[np.argmax(nulos)]] = s[nulos].iloc[0]
+        self.codigos = codigos
+        self.base = pd.Series(unicos, dtype=s.dtype)
+
+    def derivada(self, nome: str, fn: Callable[["_Coluna"], pd.Series]) -> pd.Series:
+        """``fn`` calculada sobre ``self.base`` (valores distintos ou a coluna inteira), memorizada por nome."""
+        if nome not in self._base:
+            self._base[nome] = fn(self)
+        return self._base[nome]
+
+    def expandir(self, nome: str, fn: Callable[["_Coluna"], pd.Series]) -> pd.Series:
+        """``derivada`` espalhada de volta para as linhas da coluna original."""
+        if nome not in self._expandidas:
+            base = self.derivada(nome, fn)
+            if self.codigos is None:
+                self._expandidas[nome] = base
+            else:
+                self._expandidas[nome] = pd.Series(base.array.take(self.codigos), index=self.serie.index, name=self.serie.name)
+        return self._expandidas[nome]
+
+
+def _coluna(s: pd.Series) -> _Coluna:
+    memo = getattr(_estado, "memo", None)
+    chave = _chave(s) if memo is not None else None
+    if chave is None:
+        return _Coluna(s)
+    coluna = memo.get(chave)
+    if coluna is None:
+        coluna = memo[chave] = _Coluna(s)
+    return coluna
+
+
+def derivada(s: pd.Series, nome: str, fn: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Transformação elemento a elemento ``fn`` de ``s``, calculada uma vez por valor distinto e por escopo.
+
+    ``nome`` identifica a transformação dentro da coluna: o mesmo nome deve sempre
+    corresponder à mesma ``fn``.
+    """
+    return _coluna(s).expandir(nome, lambda c: fn(c.base))
+
+
+# Transformações usadas pelos schemas. As encadeadas reaproveitam as anteriores.
+
+def _sem_espacos(c: _Coluna) -> pd.Series:
+    return c.base.str.strip()
+
+
+def _tamanho_sem_espacos(c: _Coluna) -> pd.Series:
+    return c.derivada("sem_espacos", _sem_espacos).str.len()
+
+
+def _texto(c: _Coluna) -> pd.Series:
+    return c.base.astype(str)
+
+
+def _texto_tamanho_sem_espacos(c: _Coluna) -> pd.Series:
+    return c.derivada("texto", _texto).str.strip().str.len()
+
+
+def _texto_preenchido_sem_espacos(c: _Coluna) -> pd.Series:
+    return c.base.fillna("").astype(str).str.strip()
+
+
+def _ascii_maiusculo(valor: str) -> str:
+    return unicodedata.normalize("NFKD", valor).encode("ASCII", "ignore").decode()
+
+
+def sem_espacos(s: pd.Series) -> pd.Series:
+    """``s.str.strip()``"""
+    return _coluna(s).expandir("sem_espacos", _sem_espacos)
+
+
+def tamanho(s: pd.Series) -> pd.Series:
+    """``s.str.len()``"""
+    return _coluna(s).expandir("tamanho", lambda c: c.base.str.len())
+
+
+def tamanho_sem_espacos(s: pd.Series) -> pd.Series:
+    """``s.str.strip().str.len()``"""
+    return _coluna(s).expandir("tamanho_sem_espacos", _tamanho_sem_espacos)
+
+
+def texto_tamanho_sem_espacos(s: pd.Series) -> pd.Series:
+    """``s.astype(str).str.strip().str.len()``"""
+    return _coluna(s).expandir("texto_tamanho_sem_espacos", _texto_tamanho_sem_espacos)
+
+
+def tamanho_somente_digitos(s: pd.Series) -> pd.Series:
+    """``s.str.replace(r"\\D+", "", regex=True).str.len()``"""
+    return _coluna(s).expandir(
+        "tamanho_somente_digitos",
+        lambda c: c.derivada("somente_digitos", lambda c: c.base.str.replace(r"\D+", "", regex=True)).str.len(),
+    )
+
+
+def inteiro_sem_pontos(s: pd.Series) -> pd.Series:
+    """``s.str.replace(".", "", regex=False).astype(int)``"""
+    return _coluna(s).expandir("inteiro_sem_pontos", lambda c: c.base.str.replace(".", "", regex=False).astype(int))
+
+
+def casa(s: pd.Series, padrao: str, na=None) -> pd.Series:
+    """``s.str.match(padrao)``; com ``na=False`` equivale ao ``pa.Check.str_matches``.
+
+    O padrão vai entre ``(?:...)``: em texto Arrow o ``str.match`` só ancora o início
+    prefixando ``^``, o que deixaria soltas as demais alternativas de ``a|b``.
+    """
+    padrao = f"(?:{padrao})"
+    if na is None:
+        return _coluna(s).expandir(f"casa:{padrao}", lambda c: c.base.str.match(padrao))
+    return _coluna(s).expandir(f"casa:{padrao}:{na!r}", lambda c: c.base.str.match(padrao, na=na))
+
+
+def minusculo_sem_espacos(s: pd.Series) -> pd.Series:
+    """``s.fillna("").astype(str).str.strip().str.lower()``"""
+    return _coluna(s).expandir(
+        "minusculo_sem_espacos",
+        lambda c: c.derivada("texto_preenchido_sem_espacos", _texto_preenchido_sem_espacos).str.lower(),
+    )
+
+
+def maiusculo_ascii(s: pd.Series) -> pd.Series:
+    """``s.fillna("").astype(str).str.strip().str.upper()`` sem acentos (NFKD → ASCII)."""
+    return _coluna(s).expandir(
+        "maiusculo_ascii",
+        lambda c: c.derivada("texto_preenchido_sem_espacos", _texto_preenchido_sem_espacos).str.upper().map(_ascii_maiusculo),
+    )
@@ -0,0 +1,89 @@
+"""Dígitos verificadores de CPF e CNPJ (módulo 11) calculados para a coluna inteira.
+
+As máscaras são removidas, os dígitos viram uma matriz ``uint8`` (uma linha por
+documento) e os dois verificadores saem de produtos matriciais com os pesos —
+sem laço Python por valor.
+
+As funções só julgam documentos com a quantidade certa de dígitos: valores nulos
+ou fora do formato devolvem True, porque já são reportados pelos checks de
+formato/tamanho e não devem gerar um segundo erro na mesma linha.
+"""
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+_PESOS_CPF = (np.arange(10, 1, -1), np.arange(11, 1, -1))
+_PESOS_CNPJ = (np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]), np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+
+
+# Máscara padrão de cada documento: (largura, posições dos dígitos)
+_MASCARAS = {
+    11: (14, np.array([0, 1, 2, 4, 5, 6, 8, 9, 10, 12, 13])),  # XXX.XXX.XXX-XX
+    14: (18, np.array([0, 1, 3, 4, 5, 7, 8, 9, 11, 12, 13, 14, 16, 17])),  # XX.XXX.XXX/XXXX-XX
+}
+
+
+def _codigos(valores: list, largura: int) -> np.ndarray:
+    # UTF-32 de largura fixa: cada caractere vira um inteiro, sem codificar string a string
+    return np.asarray(valores, dtype=f"U{largura}").view(np.uint32).reshape(-1, largura)
+
+
+def _matriz_digitos(s: pd.Series, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """(posições com exatamente ``n`` dígitos, matriz ``len(posições) x n`` com os dígitos).
+
+    Valores só com dígitos ou na máscara padrão são lidos direto da matriz de
+    caracteres; os demais passam pela remoção dos não dígitos.
+    """
+    tamanhos = s.str.len().to_numpy(dtype=float, na_value=-1)
+    restantes = tamanhos >= n
+    posicoes, matrizes = [], []
+    for largura, colunas in ((n, np.arange(n)), _MASCARAS[n]):
+        candidatas = np.flatnonzero(tamanhos == largura)
+        if not len(candidatas):
+            continue
+        codigos = _codigos(s.iloc[candidatas].tolist(), largura)
+        e_digito = (codigos >= ord("0")) & (codigos <= ord("9"))
+        separadores = np.setdiff1d(np.arange(largura), colunas)
+        diretas = e_digito[:, colunas].all(axis=1) & ~e_digito[:, separadores].any(axis=1)
+        posicoes.append(candidatas[diretas])
+        matrizes.append(codigos[diretas][:, colunas] - ord("0"))
+        restantes[candidatas[diretas]] = False
+    candidatas = np.flatnonzero(restantes)
+    if len(candidatas):
+        digitos = s.iloc[candidatas].str.replace(r"[^0-9]+", "", regex=True)
+        com_n = (digitos.str.len() == n).to_numpy(dtype=bool, na_value=False)
+        if com_n.any():
+            posicoes.append(candidatas[com_n])
+            matrizes.append(_codigos(digitos[com_n].tolist(), n) - ord("0"))
+    if not posicoes:
+        return np.empty(0, dtype=np.intp), np.empty((0, n), dtype=np.uint8)
+    return np.concatenate(posicoes), np.concatenate(matrizes).astype(np.uint8)
+
+
+def _verificador(matriz: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+    resto = (matriz[:, :len(pesos)].astype(np.int32) @ pesos) % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def _valido(s: pd.Series, n: int, pesos: tuple[np.ndarray, np.ndarray]) -> pd.Series:
+    resultado = np.ones(len(s), dtype=bool)
+    posicoes, matriz = _matriz_digitos(s, n)
+    if len(posicoes):
+        corpo = n - 2
+        confere = (
+            (_verificador(matriz, pesos[0]) == matriz[:, corpo])
+            & (_verificador(matriz, pesos[1]) == matriz[:, corpo + 1])
+            & (matriz != matriz[:, :1]).any(axis=1)  # 111.111.111-11 passa no módulo 11, mas é inválido
+        )
+        resultado[posicoes] = confere
+    return pd.Series(resultado, index=s.index, name=s.name)
+
+
+def cpf_valido(s: pd.Series) -> pd.Series:
+    """True onde o CPF tem dígitos verificadores corretos (ou não tem 11 dígitos)."""
+    return _valido(s, 11, _PESOS_CPF)
+
+
+def cnpj_valido(s: pd.Series) -> pd.Series:
+    """True onde o CNPJ tem dígitos verificadores corretos (ou não tem 14 dígitos)."""
+    return _valido(s, 14, _PESOS_CNPJ)
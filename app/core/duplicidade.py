@@ -0,0 +1,105 @@
+"""Detecção de duplicatas por hash, em tempo linear.
+
+As colunas da chave são fatoradas uma única vez (tabela hash do pandas) em códigos
+inteiros na ordem da primeira ocorrência; chaves compostas combinam os códigos de
+cada coluna. Um ``bincount`` dos códigos marca as chaves repetidas e só as linhas
+dessas chaves são agrupadas — a memória extra é de alguns arrays de inteiros do
+tamanho da aba, sem objetos Python por linha.
+
+Cada grupo é reportado com a primeira ocorrência (listando as linhas repetidas) e
+uma falha por repetição apontando para a primeira ocorrência, no mesmo formato de
+``failure_cases`` do Pandera (``check`` ``field_uniqueness`` ou
+``multiple_fields_uniqueness``, código 601). Linhas com alguma parte da chave nula
+não são comparadas: a nulidade já é reportada pelos checks da coluna.
+"""
+from __future__ import annotations
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Linhas repetidas citadas na mensagem da primeira ocorrência; as demais são só contadas
+MAX_LINHAS_NA_MENSAGEM = 10
+
+
+def codigos_chave(df: pd.DataFrame, colunas: Sequence[str]) -> np.ndarray:
+    """Código inteiro da chave de cada linha (ordem de primeira ocorrência); -1 se alguma parte for nula."""
+    codigos: Optional[np.ndarray] = None
+    for coluna in colunas:
+        atuais, distintos = pd.factorize(df[coluna])
+        atuais = atuais.astype(np.int64)
+        if codigos is None:
+            codigos = atuais
+            continue
+        nulos = (codigos < 0) | (atuais < 0)
+        # Menor que (linhas distintas até aqui) x (distintos da coluna) <= n², cabe em int64
+        codigos = pd.factorize(np.where(nulos, -1, codigos * len(distintos) + atuais))[0].astype(np.int64)
+        codigos[nulos] = -1
+    if codigos is None:
+        return np.full(len(df), -1, dtype=np.int64)
+    return codigos
+
+
+def posicoes_duplicadas(df: pd.DataFrame, colunas: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(posições das linhas com chave repetida agrupadas por chave, início de cada grupo).
+
+    Os grupos seguem a ordem da primeira ocorrência e, dentro de cada grupo, a ordem das linhas.
+    """
+    codigos = codigos_chave(df, colunas)
+    preenchidos = codigos >= 0
+    contagem = np.bincount(codigos[preenchidos])
+    repetidas = np.flatnonzero(preenchidos & (contagem[np.maximum(codigos, 0)] > 1)) if len(contagem) else np.empty(0, dtype=np.intp)
+    if not len(repetidas):
+        return repetidas, np.empty(0, dtype=np.intp)
+    chaves = codigos[repetidas]
+    ordem = np.argsort(chaves, kind="stable")
+    agrupadas = repetidas[ordem]
+    chaves = chaves[ordem]
+    inicios = np.flatnonzero(np.r_[True, chaves[1:] != chaves[:-1]])
+    return agrupadas, inicios
+
+
+def _textos_valores(df: pd.DataFrame, colunas: Sequence[str], posicoes: np.ndarray) -> np.ndarray:
+    if len(colunas) == 1:
+        return df[colunas[0]].iloc[posicoes].astype(str).to_numpy(dtype=object)
+    return np.array([str(chave) for chave in zip(*(df[c].iloc[posicoes].tolist() for c in colunas))], dtype=object)
+
+
+def falhas_duplicidade(df: pd.DataFrame, colunas: Sequence[str]) -> Optional[pd.DataFrame]:
+    """Casos de falha de unicidade de ``colunas`` no formato de ``failure_cases``, em ordem de linha.
+
+    Uma falha por linha envolvida: a primeira ocorrência lista as linhas do Excel
+    em que o valor se repete (até ``MAX_LINHAS_NA_MENSAGEM``) e cada repetição aponta
+    a linha da primeira ocorrência. Chaves compostas usam a coluna ``"a+b"``.
+    None se não houver duplicatas.
+    """
+    colunas = list(colunas)
+    agrupadas, inicios = posicoes_duplicadas(df, colunas)
+    if not len(agrupadas):
+        return None
+    tamanhos = np.diff(np.r_[inicios, len(agrupadas)])
+    grupo = np.repeat(np.arange(len(inicios)), tamanhos)
+    ordem_no_grupo = np.arange(len(agrupadas)) - inicios[grupo]  # 0 = primeira ocorrência
+    linhas = (df.index.to_numpy()[agrupadas] + 2).astype(str).astype(object)
+    valores = _textos_valores(df, colunas, agrupadas[inicios])
+
+    # Linhas repetidas de cada grupo concatenadas sem laço por grupo (reduceat soma as strings)
+    citadas = (ordem_no_grupo >= 1) & (ordem_no_grupo <= MAX_LINHAS_NA_MENSAGEM)
+    pedacos = np.where(ordem_no_grupo[citadas] == 1, linhas[citadas], ", " + linhas[citadas])
+    repetidas = np.add.reduceat(pedacos, np.flatnonzero(ordem_no_grupo[citadas] == 1))
+    excedentes = tamanhos - 1 - MAX_LINHAS_NA_MENSAGEM
+    if (excedentes > 0).any():
+        repetidas = np.where(excedentes > 0, repetidas + " e mais " + excedentes.astype(str).astype(object), repetidas)
+
+    casos = valores[grupo] + " (repetição da linha " + linhas[inicios][grupo] + ")"
+    casos[inicios] = valores + " (primeira ocorrência; repetido nas linhas " + repetidas + ")"
+    ordem = np.argsort(agrupadas, kind="stable")
+    composta = len(colunas) > 1
+    return pd.DataFrame({
+        "schema_context": "DataFrameSchema" if composta else "Column",
+        "column": "+".join(colunas),
+        "check": "multiple_fields_uniqueness" if composta else "field_uniqueness",
+        "check_number": None,
+        "failure_case": casos[ordem],
+        "index": df.index[agrupadas[ordem]],
+    })
@@ -1,80 +1,96 @@
 """Serviço de importação pós-validação.
 
 Fluxo resumido:
-1. Ler arquivo normalizado do S3 (normalized/ path)
-2. Carregar planilhas em DataFrames
+1. Ler o conjunto Parquet normalizado (normalized/<arquivo_id>/parquet), só com as colunas dos schemas
+2. Carregar planilhas em DataFrames (já tipados; o .xlsx normalizado só é lido para arquivos antigos)
 3. Persistir em tabelas de staging (1:1 com colunas da planilha)
 4. Transformar e inserir/upsert em tabelas finais (dw.*) se necessário
 5. Retornar estatísticas da importação
 
+``validar_e_importar`` (tenants com importação automática) faz validação e importação no mesmo
+processo: os DataFrames validados vão direto para os passos 3-4, sem a ida e volta pelo storage,
+e os artefatos (Parquet, .xlsx normalizado e relatório de erros) são publicados em segundo plano.
+
 Observação: Ajuste nomes de tabelas conforme seu DW real. Aqui usamos nomes sugestivos.
 """
 from __future__ import annotations
-from typing import Dict, Any
-import io
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List
 import pandas as pd
-from .storage_service import get_bytes
+from .artefato_normalizado import ler_normalizado, publicar_excel, publicar_planilha_normalizada
+from .coletor_erros import ColetorErros
+from .storage_service import open_cached, report_key_for
 from .util import settings
 from .repository import ArquivoRepository
 from .models_validacao import StatusArquivo
 from .util import logger
 from .db import Operator
+from .validator_service import COLUNAS_ESPERADAS, validar_arquivo_excel
+
+_uploads: ThreadPoolExecutor | None = None
+_uploads_lock = threading.Lock()
 
 
 def _save_staging(df: pd.DataFrame, tabela: str):
-    op = Operator(table=tabela)
-    # Estratégia: criar tabela se não existir e inserir tudo
-    try:
-        op.create_table_from_df(df)
-    except Exception as e:
-        logger.debug(f"Tabela pode já existir: {e}")
-    # Limpa (opcional)
-    try:
-        op.delete()
-    except Exception as e:
-        logger.warning(f"Falha ao limpar staging {tabela}: {e}")
-    # Insere
-    registros = df.to_dict(orient="records")
-    op.insert(registros)
+    with Operator(table=tabela) as op:
+        # Estratégia: criar tabela se não existir e inserir tudo
+        try:
+            op.create_table_from_df(df)
+        except Exception as e:
+            logger.debug(f"Tabela pode já existir: {e}")
+        # Limpa (opcional)
+        try:
+            op.delete()
+        except Exception as e:
+            logger.warning(f"Falha ao limpar staging {tabela}: {e}")
+        # Insere em lote (COPY); lotes rejeitados caem para inserção linha a linha
+        op.bulk_insert(df)
+        return op.last_stats
 
 
 def _load_to_dw(df: pd.DataFrame, tabela: str, key_field: str | None = None):
     """Carrega um DataFrame na tabela final do DW.
-    Estratégia: criar tabela a partir do DataFrame se não existir e executar upsert.
+    Estratégia: criar tabela a partir do DataFrame se não existir e executar upsert em lote
+    (tabela temporária + um único INSERT ... SELECT ... ON CONFLICT).
     key_field: coluna usada para ON CONFLICT; se None, usa o padrão do Operator.
     """
     if df is None or df.empty:
         logger.info(f"Nada a carregar para {tabela}")
         return {"loaded": False, "rows": 0}
 
-    op = Operator(table=tabela)
-    if key_field:
-        op.key_field = key_field
-
-    try:
-        op.create_table_from_df(df)
-    except Exception as e:
-        logger.debug(f"create_table_from_df pode já existir ou falhou para {tabela}: {e}")
+    with Operator(table=tabela) as op:
+        if key_field:
+            op.key_field = key_field
 
-    try:
-        op.upsert(df)
-        return {"loaded": True, "rows": len(df)}
-    except Exception as e:
-        logger.error(f"Falha ao carregar dados em {tabela}: {e}")
-        return {"loaded": False, "rows": len(df), "error": str(e)}
+        try:
+            op.create_table_from_df(df)
+        except Exception as e:
+            logger.debug(f"create_table_from_df pode já existir ou falhou para {tabela}: {e}")
 
+        try:
+            op.bulk_upsert(df)
+            return {"loaded": True, "rows": len(df), **op.last_stats}
+        except Exception as e:
+            logger.error(f"Falha ao carregar dados em {tabela}: {e}")
+            return {"loaded": False, "rows": len(df), "error": str(e)}
 
-def importar_dados(arquivo_id: str, nome_original: str) -> Dict[str, Any]:
-    repo = ArquivoRepository()
-    repo.atualizar_status(arquivo_id, StatusArquivo.IMPORTANDO)
 
+def _ler_planilhas(arquivo_id: str, nome_original: str) -> Dict[str, pd.DataFrame]:
+    try:
+        return ler_normalizado(arquivo_id, COLUNAS_ESPERADAS)
+    except FileNotFoundError:
+        logger.info(f"Arquivo {arquivo_id} sem Parquet normalizado; lendo a planilha .xlsx")
     # Use the normalized file path that matches our S3 structure
     base_path = "yavix-dev/data_integration"
     chave_norm = f"{base_path}/normalized/{nome_original}"
-    logger.info(f"Iniciando import: {chave_norm}")
-    conteudo = get_bytes(chave_norm)
-    dfs = pd.read_excel(io.BytesIO(conteudo), sheet_name=None)
+    # Leitura via cache local (chave + ETag): retentativas e reimportações não baixam o arquivo de novo
+    with open_cached(chave_norm) as arquivo:
+        return pd.read_excel(arquivo, sheet_name=None)
+
 
+def _carregar_planilhas(dfs: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """Staging + tabelas finais; retorna as estatísticas da importação."""
     stats_import = {}
 
     # Exemplo: salvar cada sheet em staging
@@ -90,8 +106,8 @@ def importar_dados(arquivo_id: str, nome_original: str) -> Dict[str, Any]:
         if not tabela:
             continue
         try:
-            _save_staging(df, tabela)
-            stats_import[nome_sheet] = {"linhas": len(df)}
+            carga = _save_staging(df, tabela)
+            stats_import[nome_sheet] = {"linhas": len(df), "inseridas": carga["inserted"], "rejeitadas": carga["rejected"]}
         except Exception as e:
             logger.error(f"Erro staging {tabela}: {e}")
             stats_import[nome_sheet] = {"erro": str(e)}
@@ -117,6 +133,85 @@ def importar_dados(arquivo_id: str, nome_original: str) -> Dict[str, Any]:
         load_stats[nome_sheet] = res
 
     stats_import["load"] = load_stats
+    return stats_import
+
+
+def importar_dados(arquivo_id: str, nome_original: str) -> Dict[str, Any]:
+    repo = ArquivoRepository()
+    repo.atualizar_status(arquivo_id, StatusArquivo.IMPORTANDO)
+
+    logger.info(f"Iniciando import: {arquivo_id} ({nome_original})")
+    stats_import = _carregar_planilhas(_ler_planilhas(arquivo_id, nome_original))
 
     repo.atualizar_status(arquivo_id, StatusArquivo.IMPORTADO, stats_import)
     return {"arquivo_id": arquivo_id, "status": StatusArquivo.IMPORTADO, "stats_import": stats_import}
+
+
+def _obter_executor_uploads() -> ThreadPoolExecutor:
+    # Reaproveitado entre arquivos; threads bastam (upload é E/S, Parquet/zstd liberam o GIL)
+    global _uploads
+    with _uploads_lock:
+        if _uploads is None:
+            workers = max(1, int(settings.get("PIPELINE_UPLOAD_WORKERS", 2)))
+            _uploads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artefatos")
+        return _uploads
+
+
+def _publicar_artefatos(arquivo_id: str, nome_original: str, normalized: Dict[str, pd.DataFrame], erros: ColetorErros) -> List[str]:
+    """Publica o conjunto Parquet, a planilha normalizada e, se houver erros, o relatório."""
+    chaves = publicar_planilha_normalizada(arquivo_id, nome_original, normalized)
+    if len(erros):
+        chave_relatorio = report_key_for(arquivo_id, f"erros_{arquivo_id}.xlsx")
+        publicar_excel(chave_relatorio, {"Relatório_Erros": erros.para_dataframe()})
+        chaves.append(chave_relatorio)
+    logger.info(f"Artefatos de {arquivo_id} publicados: {len(chaves)} objetos")
+    return chaves
+
+
+def _registrar_falha_artefatos(arquivo_id: str):
+    def callback(futuro: Future) -> None:
+        if futuro.exception() is not None:
+            logger.error(f"Falha ao publicar artefatos de {arquivo_id}: {futuro.exception()}")
+    return callback
+
+
+def validar_e_importar(arquivo_id: str, nome_original: str, file_bytes: bytes) -> Dict[str, Any]:
+    """Valida e importa o arquivo no mesmo processo, reaproveitando os DataFrames em memória.
+
+    Status: VALIDANDO → VALIDADO → IMPORTANDO → IMPORTADO (ERROS se houver erro crítico;
+    FALHA_VALIDACAO ou FALHA_IMPORT se a validação ou a carga levantar exceção, que é
+    propagada). Os artefatos são publicados em segundo plano,
+    sem bloquear a carga; ``artefatos`` no retorno é o Future com as chaves gravadas.
+    """
+    repo = ArquivoRepository()
+    repo.atualizar_status(arquivo_id, StatusArquivo.VALIDANDO)
+    logger.info(f"Iniciando validação e import: {arquivo_id} ({nome_original})")
+    try:
+        normalized, erros, stats = validar_arquivo_excel(file_bytes)
+    except Exception:
+        repo.atualizar_status(arquivo_id, StatusArquivo.FALHA_VALIDACAO)
+        raise
+
+    artefatos = _obter_executor_uploads().submit(_publicar_artefatos, arquivo_id, nome_original, normalized, erros)
+    artefatos.add_done_callback(_registrar_falha_artefatos(arquivo_id))
+
+    por_severidade, _ = erros.contagens()
+    if por_severidade.get("CRÍTICO"):
+        repo.atualizar_status(arquivo_id, StatusArquivo.ERROS, stats)
+        return {"arquivo_id": arquivo_id, "status": StatusArquivo.ERROS, "stats": stats, "artefatos": artefatos}
+    repo.atualizar_status(arquivo_id, StatusArquivo.VALIDADO, stats)
+
+    repo.atualizar_status(arquivo_id, StatusArquivo.IMPORTANDO)
+    try:
+        stats_import = _carregar_planilhas(normalized)
+    except Exception:
+        repo.atualizar_status(arquivo_id, StatusArquivo.FALHA_IMPORT)
+        raise
+    repo.atualizar_status(arquivo_id, StatusArquivo.IMPORTADO, stats_import)
+    return {
+        "arquivo_id": arquivo_id,
+        "status": StatusArquivo.IMPORTADO,
+        "stats": stats,
+        "stats_import": stats_import,
+        "artefatos": artefatos,
+    }
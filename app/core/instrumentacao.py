@@ -0,0 +1,126 @@
+"""Medição de tempo e memória por etapa da validação.
+
+``criar_medidor()`` devolve um ``Medidor`` quando ``VALIDACAO_INSTRUMENTACAO`` está
+ligado (padrão) ou o ``MEDIDOR_NULO``, cujo ``etapa()`` devolve sempre o mesmo
+contexto vazio — desligado, o custo é só uma chamada de método por etapa.
+
+Cada etapa registra tempo de parede, tempo de CPU do processo e o pico de RSS do
+processo até ali. Com ``VALIDACAO_INSTRUMENTACAO_TRACEMALLOC`` também registra o
+pico de memória alocada pelo Python dentro da etapa (tracemalloc deixa a execução
+bem mais lenta, então fica desligado por padrão).
+"""
+from __future__ import annotations
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, List, Optional
+
+from .util import logger, settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _rss_pico_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KiB no Linux e em bytes no macOS
+    return round(pico / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+class Medidor:
+    """Acumula as medições de cada etapa em ``etapas`` (lista de dicts serializáveis em JSON).
+
+    É serializável com pickle: ``novo()`` gera um medidor vazio com a mesma configuração
+    para ser usado num worker, e o worker o devolve para ``incorporar()``.
+    """
+
+    def __init__(self, usar_tracemalloc: bool = False):
+        self.usar_tracemalloc = usar_tracemalloc
+        self.etapas: List[dict] = []
+        self._picos: List[int] = []  # pico parcial de cada etapa aberta (tracemalloc)
+        self._iniciou_tracemalloc = False
+
+    def novo(self) -> "Medidor":
+        return Medidor(self.usar_tracemalloc)
+
+    @contextmanager
+    def etapa(self, nome: str, aba: str | None = None) -> Iterator[None]:
+        if self.usar_tracemalloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._iniciou_tracemalloc = True
+            if self._picos:
+                # Guarda o pico da etapa externa antes de zerar para a interna
+                self._picos[-1] = max(self._picos[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._picos.append(0)
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            registro = {
+                "etapa": nome,
+                "aba": aba,
+                "wall_s": round(time.perf_counter() - inicio, 4),
+                "cpu_s": round(time.process_time() - inicio_cpu, 4),
+                "rss_pico_mb": _rss_pico_mb(),
+            }
+            if self.usar_tracemalloc:
+                pico = max(self._picos.pop(), tracemalloc.get_traced_memory()[1])
+                registro["alocado_pico_mb"] = round(pico / (1 << 20), 2)
+                if self._picos:
+                    self._picos[-1] = max(self._picos[-1], pico)
+            self.etapas.append(registro)
+
+    def incorporar(self, outro: "Medidor") -> None:
+        self.etapas.extend(outro.etapas)
+
+    def encerrar(self) -> None:
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+
+    def resultado(self) -> List[dict]:
+        return list(self.etapas)
+
+    def registrar_log(self, contexto: str) -> None:
+        logger.info(f"{contexto}: {json.dumps(self.etapas, ensure_ascii=False)}")
+
+
+class MedidorNulo:
+    """Medidor desligado: não mede nada e não aloca nada por etapa."""
+
+    _vazio = nullcontext()
+
+    def novo(self) -> "MedidorNulo":
+        return self
+
+    def etapa(self, nome: str, aba: str | None = None):
+        return self._vazio
+
+    def incorporar(self, outro) -> None:
+        pass
+
+    def encerrar(self) -> None:
+        pass
+
+    def resultado(self) -> None:
+        return None
+
+    def registrar_log(self, contexto: str) -> None:
+        pass
+
+
+MEDIDOR_NULO = MedidorNulo()
+
+
+def criar_medidor() -> Medidor | MedidorNulo:
+    if not settings.get("VALIDACAO_INSTRUMENTACAO", True):
+        return MEDIDOR_NULO
+    return Medidor(usar_tracemalloc=bool(settings.get("VALIDACAO_INSTRUMENTACAO_TRACEMALLOC", False)))
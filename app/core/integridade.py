@@ -0,0 +1,137 @@
+"""Verificação de integridade referencial entre abas em uma única passada vetorizada.
+
+As chaves da dimensão são indexadas uma vez (hash) e as linhas do fato são testadas
+com ``isin``; as linhas inválidas são agrupadas por código com ``groupby``.
+Suporta chaves compostas (ex.: ``cod_setor`` + ``cnpj_da_empresa``).
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+Colunas = Union[str, Sequence[str]]
+
+
+@dataclass(frozen=True)
+class Relacao:
+    aba_fato: str
+    aba_dim: str
+    colunas_fato: Tuple[str, ...]
+    colunas_dim: Tuple[str, ...]
+
+    @property
+    def rotulo_fato(self) -> str:
+        return "+".join(self.colunas_fato)
+
+    @property
+    def rotulo_dim(self) -> str:
+        return "+".join(self.colunas_dim)
+
+
+# Relações verificadas na validação do arquivo (na ordem em que os erros são reportados)
+RELACOES = (
+    Relacao("Modelo F", "Setores", ("cod_setor",), ("cod_setor",)),
+    Relacao("Cargos", "Setores", ("cod_setor",), ("cod_setor",)),
+    Relacao("Modelo F", "Cargos", ("cod_cargo",), ("cod_cargo",)),
+)
+
+
+def _tupla(colunas: Colunas) -> Tuple[str, ...]:
+    return (colunas,) if isinstance(colunas, str) else tuple(colunas)
+
+
+def _chaves(df: pd.DataFrame, colunas: Tuple[str, ...]) -> pd.Index:
+    if len(colunas) == 1:
+        return pd.Index(df[colunas[0]])
+    return pd.MultiIndex.from_frame(df[list(colunas)])
+
+
+def _alinhar_tipos(fato: pd.DataFrame, dim: pd.DataFrame, colunas_fato: Tuple[str, ...], colunas_dim: Tuple[str, ...]):
+    """Compara como número as partes da chave em que um lado é texto e o outro numérico.
+
+    Os schemas podem tipar a mesma chave de forma diferente em cada aba (ex.: ``cod_cargo``
+    é texto em Modelo F e inteiro em Cargos): "00415" deve casar com 415. Textos que
+    não são números não casam com nada.
+    """
+    numero = pd.api.types.is_numeric_dtype
+    texto = lambda s: pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)
+    convertidas_fato, convertidas_dim = {}, {}
+    for cf, cd in zip(colunas_fato, colunas_dim):
+        if texto(fato[cf]) and numero(dim[cd]):
+            convertidas_fato[cf] = pd.to_numeric(fato[cf], errors="coerce")
+        elif texto(dim[cd]) and numero(fato[cf]):
+            convertidas_dim[cd] = pd.to_numeric(dim[cd], errors="coerce")
+    if convertidas_fato:
+        fato = fato.assign(**convertidas_fato)
+    if convertidas_dim:
+        dim = dim.assign(**convertidas_dim)
+    return fato, dim
+
+
+def mascara_invalidos(fato: pd.DataFrame, dim: pd.DataFrame, colunas_fato: Colunas, colunas_dim: Colunas) -> np.ndarray:
+    """Retorna a máscara booleana das linhas do fato cuja chave não existe na dimensão.
+
+    Linhas com qualquer parte da chave nula não são consideradas inválidas.
+    """
+    colunas_fato, colunas_dim = _tupla(colunas_fato), _tupla(colunas_dim)
+    if len(colunas_fato) != len(colunas_dim):
+        raise ValueError("Chaves do fato e da dimensão devem ter o mesmo número de colunas")
+    preenchidas = fato[list(colunas_fato)].notna().all(axis=1).to_numpy()
+    fato, dim = _alinhar_tipos(fato, dim, colunas_fato, colunas_dim)
+    validas = _chaves(dim.dropna(subset=list(colunas_dim)), colunas_dim).unique()
+    return preenchidas & ~_chaves(fato, colunas_fato).isin(validas)
+
+
+def agrupar_invalidos(fato: pd.DataFrame, mascara: np.ndarray, colunas_fato: Colunas) -> Iterator[Tuple[Any, List[int]]]:
+    """Agrupa as linhas inválidas por código, na ordem da primeira ocorrência.
+
+    Produz (código, linhas do Excel) — linha = índice + 2 (cabeçalho + base 1).
+    """
+    colunas_fato = list(_tupla(colunas_fato))
+    invalidos = fato.loc[mascara, colunas_fato]
+    if invalidos.empty:
+        return
+    chave = colunas_fato[0] if len(colunas_fato) == 1 else colunas_fato
+    linhas_excel = invalidos.index.to_numpy() + 2
+    for codigo, posicoes in invalidos.groupby(chave, sort=False, observed=True).indices.items():
+        yield codigo, linhas_excel[posicoes].tolist()
+
+
+def verificar_relacao(df_fk: pd.DataFrame, df_pk: pd.DataFrame, colunas_fk: Colunas, colunas_pk: Colunas) -> List[Dict[str, Any]]:
+    """Mesmo contrato de ``util.verificar_integridade``: um dict por código inválido."""
+    colunas_fk, colunas_pk = _tupla(colunas_fk), _tupla(colunas_pk)
+    rotulo = "+".join(colunas_fk)
+    mascara = mascara_invalidos(df_fk, df_pk, colunas_fk, colunas_pk)
+    erros = []
+    for codigo, linhas in agrupar_invalidos(df_fk, mascara, colunas_fk):
+        erros.append({
+            "codigo_invalido": codigo,
+            "quantidade_registros": len(linhas),
+            "linhas_afetadas": linhas,
+            "erro": f"Código '{codigo}' da coluna '{rotulo}' não existe na tabela de referência",
+        })
+    return erros
+
+
+def linhas_invalidas(relacao: Relacao, df_dict: Dict[str, pd.DataFrame]) -> Iterator[Tuple[int, Any]]:
+    """Produz (linha do Excel, valor) de cada linha do fato que viola a relação, em ordem de linha.
+
+    Relações cujas abas ou colunas não existem no arquivo são ignoradas.
+    """
+    fato = df_dict.get(relacao.aba_fato)
+    dim = df_dict.get(relacao.aba_dim)
+    if fato is None or dim is None:
+        return
+    if not set(relacao.colunas_fato) <= set(fato.columns) or not set(relacao.colunas_dim) <= set(dim.columns):
+        return
+    mascara = mascara_invalidos(fato, dim, relacao.colunas_fato, relacao.colunas_dim)
+    if not mascara.any():
+        return
+    invalidos = fato.loc[mascara, list(relacao.colunas_fato)]
+    linhas_excel = invalidos.index.to_numpy() + 2
+    if len(relacao.colunas_fato) == 1:
+        valores = invalidos.iloc[:, 0].tolist()
+    else:
+        valores = list(invalidos.itertuples(index=False, name=None))
+    yield from zip(linhas_excel.tolist(), valores)
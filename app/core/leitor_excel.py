@@ -0,0 +1,462 @@
+"""Leitura das abas do Excel com escolha de motor.
+
+Motores disponíveis:
+- "streaming": percorre as linhas em modo read-only do openpyxl e tipa cada lote
+  de linhas assim que ele é lido; a aba é montada a partir das colunas já tipadas,
+  sem guardar a planilha inteira como objetos Python.
+- "pandas": caminho original, ``pd.read_excel(..., engine="openpyxl")``.
+- "calamine": ``pd.read_excel(..., engine="calamine")`` (requer python-calamine).
+
+Todos os motores devolvem o mesmo contrato de ``pd.read_excel(buf, sheet_name=abas)``:
+um dict aba -> DataFrame com cabeçalho na primeira linha e tipos inferidos.
+
+``ler_planilhas_tipadas`` recebe as colunas esperadas de cada aba (nome já
+normalizado por ``clean_names`` -> tipo final) e lê só essas colunas, convertendo
+cada uma uma única vez para o tipo final (texto direto em ``string[pyarrow]`` ou
+categoria, inteiros ``Int64`` com nulos). As demais colunas do arquivo não são
+convertidas nem montadas; só os nomes voltam em ``LeituraAba.colunas_extras``.
+"""
+from __future__ import annotations
+import io
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from janitor import clean_names
+from pandas.api.types import union_categoricals
+from pandas.io.parsers import TextParser
+
+from .util import settings
+
+Origem = Union[bytes, str, io.IOBase]
+# Colunas esperadas de uma aba: nome normalizado -> tipo final ("string[pyarrow]", "category", "Int64", "datetime64[ns]"...)
+Colunas = Mapping[str, str]
+
+MOTORES = ("streaming", "pandas", "calamine")
+MOTOR_PADRAO = "streaming"
+TAMANHO_LOTE_PADRAO = 20_000
+# Texto das colunas "category": dicionário cujas categorias são textos Arrow
+TEXTO_ARROW = pd.StringDtype("pyarrow")
+
+# Valores de células com erro do Excel (openpyxl devolve o texto em values_only)
+_ERROS_EXCEL = {"#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A"}
+
+
+def _como_buffer(origem: Origem):
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        return io.BytesIO(origem)
+    if hasattr(origem, "seek"):
+        origem.seek(0)
+    return origem
+
+
+def _converter_celula(valor):
+    """Mesma conversão do leitor openpyxl do pandas (vazio -> "", float inteiro -> int)."""
+    if valor is None:
+        return ""
+    if isinstance(valor, float):
+        if valor.is_integer():
+            return int(valor)
+        return valor
+    if isinstance(valor, str) and valor in _ERROS_EXCEL:
+        return float("nan")
+    return valor
+
+
+def _converter_linha(linha) -> list:
+    convertida = [_converter_celula(v) for v in linha]
+    while convertida and convertida[-1] == "":
+        convertida.pop()
+    return convertida
+
+
+def _nomes_colunas(cabecalho: list) -> List:
+    """Gera os nomes de colunas exatamente como o TextParser (Unnamed: n, duplicadas .1)."""
+    if not cabecalho:
+        return []
+    return list(TextParser([cabecalho], header=0, skip_blank_lines=False).read().columns)
+
+
+def _lote_para_df(linhas: List[list], nomes: List) -> pd.DataFrame:
+    """Converte as linhas em colunas object, já com os valores nulos do pandas como NaN."""
+    if not linhas:
+        return pd.DataFrame(columns=nomes, dtype=object) if nomes else pd.DataFrame()
+    largura = len(nomes)
+    dados = [linha + [""] * (largura - len(linha)) for linha in linhas]
+    return TextParser(dados, names=nomes, header=None, skip_blank_lines=False, dtype=object).read()
+
+
+def _tipar_coluna(col: pd.Series) -> pd.Series:
+    """Inferência de tipo equivalente à do TextParser para uma coluna inteira."""
+    if col.empty:
+        return col
+    if col.isna().all():
+        return col.astype("float64")
+    try:
+        return pd.to_numeric(col)
+    except (ValueError, TypeError):
+        return col.infer_objects()
+
+
+def _tipar(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({c: _tipar_coluna(df[c]) for c in df.columns}, index=df.index, columns=df.columns)
+
+
+def _abrir_workbook(origem: Origem):
+    from openpyxl import load_workbook
+
+    return load_workbook(_como_buffer(origem), read_only=True, data_only=True, keep_links=False)
+
+
+def _cabecalho(wb, aba: str) -> Tuple[List, Iterator]:
+    """(nomes das colunas, iterador das linhas de dados) de uma aba."""
+    if aba not in wb.sheetnames:
+        raise ValueError(f"Worksheet named '{aba}' not found")
+    ws = wb[aba]
+    ws.reset_dimensions()
+    linhas = ws.iter_rows(values_only=True)
+
+    nomes: List = []
+    for linha in linhas:
+        nomes = _nomes_colunas(_converter_linha(linha))
+        break
+    return nomes, linhas
+
+
+def _largura(linha) -> int:
+    """Quantidade de células até a última preenchida (0 para linha vazia)."""
+    largura = len(linha)
+    while largura and (linha[largura - 1] is None or linha[largura - 1] == ""):
+        largura -= 1
+    return largura
+
+
+def _iterar_lotes_aba(wb, aba: str, tamanho_lote: int) -> Iterator[pd.DataFrame]:
+    nomes, linhas = _cabecalho(wb, aba)
+    inicio = 0
+    lote: List[list] = []
+    vazias_pendentes = 0
+    for linha in linhas:
+        convertida = _converter_linha(linha)
+        if not convertida:
+            # só entra no lote se aparecer alguma linha com dados depois
+            vazias_pendentes += 1
+            continue
+        if vazias_pendentes:
+            lote.extend([] for _ in range(vazias_pendentes))
+            vazias_pendentes = 0
+        if len(convertida) > len(nomes):
+            nomes = nomes + [f"Unnamed: {i}" for i in range(len(nomes), len(convertida))]
+        lote.append(convertida)
+        if len(lote) >= tamanho_lote:
+            df = _lote_para_df(lote, nomes)
+            df.index = pd.RangeIndex(inicio, inicio + len(df))
+            inicio += len(df)
+            lote = []
+            yield df
+    if lote or inicio == 0:
+        df = _lote_para_df(lote, nomes)
+        df.index = pd.RangeIndex(inicio, inicio + len(df))
+        yield df
+
+
+def _lote_selecionado(linhas: List[list], nomes: List[str], inicio: int) -> pd.DataFrame:
+    indice = pd.RangeIndex(inicio, inicio + len(linhas))
+    if not nomes:
+        return pd.DataFrame(index=indice)
+    df = TextParser(linhas, names=nomes, header=None, skip_blank_lines=False, dtype=object).read() if linhas else pd.DataFrame(columns=nomes, dtype=object)
+    df.index = indice
+    return df
+
+
+def _ler_aba_selecionada(wb, aba: str, colunas: Colunas, tamanho_lote: int) -> "LeituraAba":
+    """Como ``_iterar_lotes_aba``, mas converte e guarda só as células das colunas esperadas.
+
+    As linhas vazias são decididas pela linha inteira, então o índice (linha do Excel)
+    é o mesmo da leitura completa.
+    """
+    nomes, linhas = _cabecalho(wb, aba)
+    posicoes, selecionadas, extras = _selecionar(nomes, colunas)
+    partes: Dict[str, List[pd.Series]] = {nome: [] for nome in selecionadas}
+    lote: List[list] = []
+    inicio = 0
+    vazias_pendentes = 0
+    largura_maxima = 0
+    for linha in linhas:
+        largura = _largura(linha)
+        if not largura:
+            vazias_pendentes += 1
+            continue
+        if vazias_pendentes:
+            lote.extend([""] * len(posicoes) for _ in range(vazias_pendentes))
+            vazias_pendentes = 0
+        largura_maxima = max(largura_maxima, largura)
+        lote.append([_converter_celula(linha[i]) if i < largura else "" for i in posicoes])
+        if len(lote) >= tamanho_lote:
+            _acumular_tipado(partes, _lote_selecionado(lote, selecionadas, inicio), colunas)
+            inicio += len(lote)
+            lote = []
+    if lote or not inicio:
+        _acumular_tipado(partes, _lote_selecionado(lote, selecionadas, inicio), colunas)
+        inicio += len(lote)
+    # Células preenchidas além do cabeçalho viram colunas "Unnamed: n" na leitura completa
+    extras += nomes_normalizados([f"Unnamed: {i}" for i in range(len(nomes), largura_maxima)])
+    tipadas = {nome: _juntar_tipadas(partes.pop(nome), colunas[nome]) for nome in selecionadas}
+    return LeituraAba(pd.DataFrame(tipadas, index=pd.RangeIndex(inicio), columns=selecionadas), extras)
+
+
+def _tamanho_lote(tamanho_lote: int | None) -> int:
+    return tamanho_lote or int(settings.get("EXCEL_READER_BATCH_SIZE", TAMANHO_LOTE_PADRAO))
+
+
+def iterar_lotes(origem: Origem, aba: str, tamanho_lote: int | None = None) -> Iterator[pd.DataFrame]:
+    """Lê uma aba em modo streaming e produz DataFrames tipados de até ``tamanho_lote`` linhas.
+
+    Linhas vazias no final da aba são descartadas (mesmo comportamento do pandas).
+    O índice de cada lote continua a numeração das linhas anteriores. Os tipos são
+    inferidos por lote; para o tipo da coluna inteira use ``ler_planilhas``.
+    """
+    wb = _abrir_workbook(origem)
+    try:
+        for lote in _iterar_lotes_aba(wb, aba, _tamanho_lote(tamanho_lote)):
+            yield _tipar(lote)
+    finally:
+        wb.close()
+
+
+# Tipo da coluna tipada (kind do dtype) -> o que ``infer_dtype`` precisa dizer dos valores
+# originais para que ela volte exatamente aos mesmos objetos ("7" texto ou 1 com NaN, que
+# vira 1.0, não voltam)
+_TIPAGEM_REVERSIVEL = {"i": ("integer", "empty"), "f": ("floating", "empty"), "M": ("datetime", "datetime64", "empty")}
+
+
+def _reversivel(original: pd.Series, tipada: pd.Series) -> bool:
+    return pd.api.types.infer_dtype(original, skipna=True) in _TIPAGEM_REVERSIVEL.get(tipada.dtype.kind, ())
+
+
+def _tipar_parte(col: pd.Series) -> pd.Series:
+    """Tipa a coluna de um lote quando a conversão é reversível; senão guarda uma cópia object."""
+    tipada = _tipar_coluna(col)
+    if _reversivel(col, tipada):
+        return tipada
+    # Cópia: a coluna do lote é uma fatia do bloco object do lote inteiro
+    return col.copy()
+
+
+def _como_objetos(parte: pd.Series) -> pd.Series:
+    """Parte tipada de volta aos objetos da leitura (datas como ``datetime``, nulos NaN)."""
+    if parte.dtype == object:
+        return parte
+    valores = parte.array.to_pydatetime() if parte.dtype.kind == "M" else parte.astype(object).to_numpy()
+    return pd.Series(valores, index=parte.index, name=parte.name, dtype=object).where(parte.notna(), np.nan)
+
+
+def _juntar_partes(partes: List[pd.Series]) -> pd.Series:
+    """Junta as partes de uma coluna com o mesmo tipo da inferência sobre a coluna inteira."""
+    partes = [p for p in partes if len(p)] or partes[:1]
+    tipos = {p.dtype.kind for p in partes}
+    if tipos <= {"i", "f"} or tipos == {"M"}:
+        # pd.to_numeric da coluna inteira promove int + float como o concat
+        return partes[0] if len(partes) == 1 else pd.concat(partes)
+    # Alguma parte ficou object: a coluna inteira volta a objetos e é inferida de uma vez
+    objetos = pd.concat([_como_objetos(p) for p in partes])
+    return _tipar_coluna(objetos)
+
+
+def _ler_aba_streaming(wb, aba: str, tamanho_lote: int) -> pd.DataFrame:
+    partes: Dict = {}
+    total = 0
+    for lote in _iterar_lotes_aba(wb, aba, tamanho_lote):
+        for nome in lote.columns:
+            if nome not in partes:
+                # "Unnamed: n" que só aparece neste lote: vazia nas linhas anteriores
+                partes[nome] = [pd.Series(np.nan, index=pd.RangeIndex(total), name=nome)] if total else []
+            partes[nome].append(_tipar_parte(lote[nome]))
+        total += len(lote)
+    if not partes:
+        return pd.DataFrame(index=pd.RangeIndex(total))
+    nomes = list(partes)
+    return pd.DataFrame({nome: _juntar_partes(partes.pop(nome)) for nome in nomes}, index=pd.RangeIndex(total), columns=nomes)
+
+
+def _ler_streaming(origem: Origem, abas: Sequence[str], tamanho_lote: int | None) -> Dict[str, pd.DataFrame]:
+    resultado = {}
+    wb = _abrir_workbook(origem)
+    try:
+        for aba in abas:
+            resultado[aba] = _ler_aba_streaming(wb, aba, _tamanho_lote(tamanho_lote))
+    finally:
+        wb.close()
+    return resultado
+
+
+def ler_planilhas(
+    origem: Origem,
+    abas: Sequence[str],
+    motor: str | None = None,
+    tamanho_lote: int | None = None,
+) -> Dict[str, pd.DataFrame]:
+    """Lê as abas informadas e retorna um dict aba -> DataFrame.
+
+    motor: "streaming", "pandas" ou "calamine"; se None usa ``EXCEL_READER_ENGINE``
+    das configurações (padrão "streaming").
+    """
+    motor = motor or settings.get("EXCEL_READER_ENGINE", MOTOR_PADRAO)
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de leitura inválido: {motor} (opções: {', '.join(MOTORES)})")
+    abas = list(abas)
+    if motor == "streaming":
+        return _ler_streaming(origem, abas, tamanho_lote)
+    engine = "openpyxl" if motor == "pandas" else "calamine"
+    return pd.read_excel(_como_buffer(origem), sheet_name=abas, engine=engine)
+
+
+class LeituraAba(NamedTuple):
+    df: pd.DataFrame
+    colunas_extras: List[str]  # colunas do arquivo fora das esperadas (nomes normalizados), não lidas
+
+
+def nomes_normalizados(nomes: Sequence) -> List[str]:
+    """Nomes de colunas como ``clean_names(df, case_type="snake")`` os deixa."""
+    if not len(nomes):
+        return []
+    return list(clean_names(pd.DataFrame(columns=list(nomes)), case_type="snake").columns)
+
+
+def _selecionar(nomes: Sequence, colunas: Colunas) -> Tuple[List[int], List[str], List[str]]:
+    """(posições a ler, nomes normalizados delas, nomes normalizados das colunas extras)."""
+    posicoes: List[int] = []
+    selecionadas: List[str] = []
+    extras: List[str] = []
+    for posicao, nome in enumerate(nomes_normalizados(nomes)):
+        if nome in colunas and nome not in selecionadas:
+            posicoes.append(posicao)
+            selecionadas.append(nome)
+        else:
+            extras.append(nome)
+    return posicoes, selecionadas, extras
+
+
+def _nulos_como_none(col: pd.Series) -> pd.Series:
+    nulos = col.isna()
+    if not nulos.any():
+        return col
+    return col.astype(object).where(~nulos, None)
+
+
+def _converter_coluna(col: pd.Series, tipo: str) -> pd.Series:
+    """Converte uma coluna object (nulos como NaN) para o tipo final, numa única passada.
+
+    Texto: cada célula vira ``str`` (sem passar por float, então 123 não vira "123.0"
+    nem "0123" perde o zero); ``"str"`` mantém object com nulos None, ``"string..."``
+    vai direto para o array Arrow e ``"category"`` para um dicionário de textos Arrow.
+    Inteiros e datas só assumem o tipo final quando todos os valores convertem
+    (``"Int64"`` aceita nulos); senão a coluna fica com o tipo inferido e nulos None,
+    e a coerção do schema reporta os valores inválidos.
+    """
+    if tipo == "str" or tipo.startswith("string") or tipo == "category":
+        nulos = col.isna().to_numpy()
+        textos = col.astype(str).to_numpy(dtype=object)
+        textos[nulos] = None
+        if tipo == "str":
+            return pd.Series(textos, index=col.index, name=col.name, dtype=object)
+        serie = pd.Series(textos, index=col.index, name=col.name, dtype=TEXTO_ARROW if tipo == "category" else tipo)
+        return serie.astype("category") if tipo == "category" else serie
+    inferida = _tipar_coluna(col)
+    if inferida.empty:
+        return inferida.astype(tipo)
+    if tipo.startswith("datetime64") and (inferida.isna().all() or pd.api.types.is_datetime64_dtype(inferida)):
+        return inferida.astype(tipo)
+    if tipo.lower().startswith("int") and (pd.api.types.is_integer_dtype(inferida) or (tipo == "Int64" and _inteiros_com_nulos(inferida))):
+        return inferida.astype(tipo)
+    return _nulos_como_none(inferida)
+
+
+def _inteiros_com_nulos(col: pd.Series) -> bool:
+    """Coluna float cujos valores preenchidos são todos inteiros (inteiros com células vazias)."""
+    if not pd.api.types.is_float_dtype(col):
+        return False
+    valores = col.to_numpy()
+    valores = valores[~np.isnan(valores)]
+    return bool(np.all(valores == np.round(valores)))
+
+
+def _tipar_colunas(df: pd.DataFrame, colunas: Colunas) -> pd.DataFrame:
+    return pd.DataFrame({c: _converter_coluna(df[c], colunas[c]) for c in df.columns}, index=df.index, columns=df.columns)
+
+
+def _e_texto(tipo: str) -> bool:
+    return tipo == "str" or tipo.startswith("string") or tipo == "category"
+
+
+def _acumular_tipado(partes: Dict[str, List[pd.Series]], lote: pd.DataFrame, colunas: Colunas) -> None:
+    """Converte cada coluna do lote para o tipo final e guarda a parte em ``partes``.
+
+    Texto converte célula a célula, então o lote tipado é definitivo. Inteiros e datas
+    só valem se o lote inteiro converter de forma reversível; senão a parte fica object
+    (nulos NaN) e a decisão é tomada na coluna inteira em ``_juntar_tipadas``.
+    """
+    for nome in lote.columns:
+        tipo = colunas[nome]
+        convertida = _converter_coluna(lote[nome], tipo)
+        if not _e_texto(tipo) and (convertida.dtype != pd.api.types.pandas_dtype(tipo) or not _reversivel(lote[nome], convertida)):
+            convertida = lote[nome].copy()
+        partes[nome].append(convertida)
+
+
+def _juntar_tipadas(partes: List[pd.Series], tipo: str) -> pd.Series:
+    if tipo == "category" and len(partes) > 1:
+        categorias = union_categoricals(partes, sort_categories=True)
+        return pd.Series(categorias, index=pd.RangeIndex(len(categorias)), name=partes[0].name)
+    if _e_texto(tipo) or all(p.dtype == pd.api.types.pandas_dtype(tipo) for p in partes):
+        return partes[0] if len(partes) == 1 else pd.concat(partes)
+    # Algum lote não converteu: a coluna inteira decide o tipo, como na leitura de uma vez só
+    objetos = pd.concat([_como_objetos(p) for p in partes])
+    return _converter_coluna(objetos, tipo)
+
+
+def _ler_pandas_tipado(origem: Origem, colunas_por_aba: Mapping[str, Colunas], engine: str) -> Dict[str, LeituraAba]:
+    resultado = {}
+    arquivo = pd.ExcelFile(_como_buffer(origem), engine=engine)
+    for aba, colunas in colunas_por_aba.items():
+        lidas: List[str] = []
+        extras: List[str] = []
+
+        def _usar(nome, colunas=colunas, lidas=lidas, extras=extras) -> bool:
+            normalizado = nomes_normalizados([nome])[0]
+            if normalizado in colunas and normalizado not in lidas:
+                lidas.append(normalizado)
+                return True
+            extras.append(normalizado)
+            return False
+
+        df = arquivo.parse(aba, dtype=object, usecols=_usar)
+        df.columns = nomes_normalizados(df.columns)
+        resultado[aba] = LeituraAba(_tipar_colunas(df, colunas), extras)
+    return resultado
+
+
+def ler_planilhas_tipadas(
+    origem: Origem,
+    colunas_por_aba: Mapping[str, Colunas],
+    motor: str | None = None,
+    tamanho_lote: int | None = None,
+) -> Dict[str, LeituraAba]:
+    """Lê só as colunas esperadas de cada aba, já com nomes normalizados e tipos finais.
+
+    colunas_por_aba: aba -> {nome normalizado: tipo}, como em ``colunas_esperadas``
+    do schema. As colunas ficam na ordem do arquivo; as esperadas que faltam no
+    arquivo simplesmente não aparecem (o schema reporta a ausência).
+    """
+    motor = motor or settings.get("EXCEL_READER_ENGINE", MOTOR_PADRAO)
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de leitura inválido: {motor} (opções: {', '.join(MOTORES)})")
+    if motor != "streaming":
+        return _ler_pandas_tipado(origem, colunas_por_aba, "openpyxl" if motor == "pandas" else "calamine")
+    resultado = {}
+    wb = _abrir_workbook(origem)
+    try:
+        for aba, colunas in colunas_por_aba.items():
+            resultado[aba] = _ler_aba_selecionada(wb, aba, colunas, _tamanho_lote(tamanho_lote))
+    finally:
+        wb.close()
+    return resultado
@@ -13,6 +13,7 @@ class StatusArquivo(str, Enum):
     IMPORTANDO = "IMPORTANDO"
     IMPORTADO = "IMPORTADO"
     FALHA_IMPORT = "FALHA_IMPORT"
+    FALHA_VALIDACAO = "FALHA_VALIDACAO"
 
 @dataclass
 class ArquivoRegistro:
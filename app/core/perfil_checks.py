@@ -0,0 +1,120 @@
+"""Perfil de execução dos Checks Pandera dos schemas.
+
+``perfilar_checks(SCHEMAS)`` cronometra, enquanto o contexto estiver aberto, cada
+``pa.Check`` (de coluna e de DataFrame) e acumula, por (aba, coluna, mensagem do
+check), o número de chamadas, o tempo gasto e as linhas avaliadas. Ao sair, os checks
+voltam ao normal.
+
+Os workers de processo não enxergam o envoltório: perfile com ``max_workers=1``.
+
+Exemplo::
+
+    with perfilar_checks(SCHEMAS) as perfil:
+        validar_arquivo_excel(conteudo, usar_cache=False, max_workers=1)
+    print(perfil.relatorio())
+"""
+from __future__ import annotations
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+import pandas as pd
+
+COLUNAS_TABELA = ["aba", "coluna", "check", "chamadas", "tempo_s", "linhas", "linhas_por_s"]
+
+Chave = Tuple[str, str, str]
+
+
+@dataclass
+class _Medida:
+    chamadas: int = 0
+    tempo_s: float = 0.0
+    linhas: int = 0
+
+
+def _get_backend_medido(get_backend: Callable, medida: _Medida) -> Callable:
+    """Substitui ``check.get_backend`` na instância para cronometrar a execução do backend.
+
+    Envolver ``_check_fn`` não basta: os checks embutidos (``str_matches``...) recarregam a
+    função a cada chamada. O tempo medido inclui a extração dos casos de falha.
+    """
+    def medido(check_obj):
+        backend_cls = get_backend(check_obj)
+
+        def criar(check):
+            backend = backend_cls(check)
+
+            def executar(obj, column=None):
+                inicio = time.perf_counter()
+                try:
+                    return backend(obj, column)
+                finally:
+                    medida.tempo_s += time.perf_counter() - inicio
+                    medida.chamadas += 1
+                    medida.linhas += len(obj)
+
+            return executar
+
+        return criar
+
+    return medido
+
+
+class PerfilChecks:
+    def __init__(self):
+        self._medidas: Dict[Chave, _Medida] = {}
+
+    def _instrumentar(self, chave: Chave, check: Any) -> None:
+        check.get_backend = _get_backend_medido(type(check).get_backend, self._medidas.setdefault(chave, _Medida()))
+
+    def tabela(self, ordenar_por: str = "tempo_s") -> pd.DataFrame:
+        """Uma linha por (aba, coluna, check), em ordem decrescente de ``ordenar_por``."""
+        linhas = [
+            {
+                "aba": aba,
+                "coluna": coluna,
+                "check": check,
+                "chamadas": m.chamadas,
+                "tempo_s": m.tempo_s,
+                "linhas": m.linhas,
+                "linhas_por_s": m.linhas / m.tempo_s if m.tempo_s else None,
+            }
+            for (aba, coluna, check), m in self._medidas.items()
+            if m.chamadas
+        ]
+        tabela = pd.DataFrame(linhas, columns=COLUNAS_TABELA)
+        return tabela.sort_values(ordenar_por, ascending=False, na_position="last", kind="stable").reset_index(drop=True)
+
+    def relatorio(self, ordenar_por: str = "tempo_s", limite: Optional[int] = None) -> str:
+        tabela = self.tabela(ordenar_por)
+        total = tabela["tempo_s"].sum()
+        if limite is not None:
+            tabela = tabela.head(limite)
+        return tabela.to_string(index=False, float_format=lambda v: f"{v:,.4f}") + f"\n\nTempo total em checks: {total:.3f}s"
+
+    def to_json(self, ordenar_por: str = "tempo_s") -> str:
+        tabela = self.tabela(ordenar_por).astype(object)
+        return json.dumps(tabela.where(tabela.notna(), None).to_dict("records"), ensure_ascii=False)
+
+
+def _rotulo(check: Any) -> str:
+    return check.error or check.name or repr(check)
+
+
+@contextmanager
+def perfilar_checks(schemas: Mapping[str, Any]) -> Iterator[PerfilChecks]:
+    perfil = PerfilChecks()
+    instrumentados = []
+    try:
+        for aba, schema in schemas.items():
+            alvos = [("*", check) for check in schema.checks]
+            alvos += [(nome, check) for nome, coluna in schema.columns.items() for check in coluna.checks]
+            for coluna, check in alvos:
+                perfil._instrumentar((aba, coluna, _rotulo(check)), check)
+                instrumentados.append(check)
+        yield perfil
+    finally:
+        for check in instrumentados:
+            check.__dict__.pop("get_backend", None)
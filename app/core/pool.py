@@ -0,0 +1,190 @@
+"""Process-wide database connection pools keyed by database profile."""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from .util import logger, settings
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+DEFAULT_ACQUIRE_TIMEOUT = 30.0
+
+
+class PoolTimeout(RuntimeError):
+    """Raised when no connection becomes available within the acquire timeout."""
+
+
+def _is_broken(conn: Any) -> bool:
+    # psycopg exposes closed/broken; sqlite3 connections have neither
+    return bool(getattr(conn, "closed", False) or getattr(conn, "broken", False))
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception as e:
+        logger.debug(f"Error closing pooled connection: {e}")
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections created by ``connect``.
+
+    Args:
+        connect: Factory that opens a new connection.
+        size: Maximum number of open connections (idle + borrowed).
+        idle_timeout: Idle connections older than this (seconds) are closed instead of reused.
+            Use None to keep idle connections indefinitely.
+        health_check_interval: Connections idle longer than this (seconds) are checked
+            with ``SELECT 1`` before being handed out. Use None to disable.
+        acquire_timeout: Seconds to wait for a free connection before raising PoolTimeout.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+        health_check_interval: Optional[float] = DEFAULT_HEALTH_CHECK_INTERVAL,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._connect = connect
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._idle: deque = deque()  # (connection, last_used)
+        self._open = 0
+        self._cond = threading.Condition()
+
+    @property
+    def open_connections(self) -> int:
+        return self._open
+
+    @property
+    def idle_connections(self) -> int:
+        return len(self._idle)
+
+    def _healthy(self, conn: Any, idle_for: float) -> bool:
+        if _is_broken(conn):
+            return False
+        if self.health_check_interval is None or idle_for < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding pooled connection that failed health check: {e}")
+            return False
+
+    def _discard(self, conn: Any) -> None:
+        _close_quietly(conn)
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def acquire(self) -> Any:
+        """Borrow a connection, reusing an idle one when possible."""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f"No connection available after {self.acquire_timeout}s (size={self.size})")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    self._open += 1
+                    conn, last_used = None, None
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+
+            idle_for = time.monotonic() - last_used
+            expired = self.idle_timeout is not None and idle_for > self.idle_timeout
+            if expired or not self._healthy(conn, idle_for):
+                self._discard(conn)
+                continue
+            return conn
+
+    def release(self, conn: Any) -> None:
+        """Return a borrowed connection. Any open transaction is rolled back."""
+        if _is_broken(conn):
+            self._discard(conn)
+            return
+        try:
+            conn.rollback()
+        except Exception as e:
+            logger.warning(f"Discarding pooled connection that failed to roll back: {e}")
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections. Borrowed connections go back to the pool when released."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+
+_pools: Dict[Hashable, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _optional_seconds(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def get_pool(key: Hashable, connect: Callable[[], Any]) -> ConnectionPool:
+    """Return the process-wide pool for ``key`` (e.g. ("postgresql", "default")), creating it on first use.
+
+    Size and timeouts come from settings DATABASE_POOL_SIZE, DATABASE_POOL_IDLE_TIMEOUT,
+    DATABASE_POOL_HEALTH_CHECK_INTERVAL and DATABASE_POOL_TIMEOUT. Setting the idle timeout
+    or the health check interval to None (null in settings) disables it.
+    """
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                connect,
+                size=int(settings.get("DATABASE_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                idle_timeout=_optional_seconds(settings.get("DATABASE_POOL_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT)),
+                health_check_interval=_optional_seconds(settings.get("DATABASE_POOL_HEALTH_CHECK_INTERVAL", DEFAULT_HEALTH_CHECK_INTERVAL)),
+                acquire_timeout=float(settings.get("DATABASE_POOL_TIMEOUT", DEFAULT_ACQUIRE_TIMEOUT)),
+            )
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -1,9 +1,58 @@
+"""Object storage for uploads, normalized workbooks and error reports.
+
+The module-level helpers (``put_bytes``, ``get_bytes``, ``generate_presigned_put/get``)
+go through one process-wide backend, chosen by STORAGE_BACKEND:
+
+- "s3" (default): ``S3Backend``, a single long-lived boto3 client shared by all threads,
+  with its HTTP connection pool sized by STORAGE_MAX_POOL_CONNECTIONS;
+- "local": ``LocalBackend``, files under STORAGE_LOCAL_DIR, for offline use and tests.
+
+Keys are the same on both backends (see ``upload_key_for`` and friends).
+
+Large artifacts can be streamed instead of held in memory: ``put_stream`` writes from an
+iterator of chunks (S3 multipart upload, STORAGE_PART_SIZE bytes per part, up to
+STORAGE_CONCURRENCY parts uploading at once) and ``open_object`` returns a seekable
+file-like object that downloads ranges of STORAGE_PART_SIZE bytes, up to
+STORAGE_CONCURRENCY ahead of the reader. Either way at most (concurrency + 1) parts are
+in memory, regardless of the object size.
+
+``open_cached`` reads through a local disk cache (``CacheDisco``) keyed by bucket, key
+and ETag: a changed object gets a new entry, retries and re-imports of the same object
+read local disk. Cached files are memory-mapped. Configured by STORAGE_CACHE_ENABLED,
+STORAGE_CACHE_DIR and STORAGE_CACHE_MAX_BYTES (LRU eviction).
+"""
 from __future__ import annotations
+import hashlib
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from .cache_disco import CacheDisco
 from .util import settings, logger
 
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 minimum for every multipart part but the last
+DEFAULT_CONCURRENCY = 4
+DEFAULT_LOCAL_DIR = Path(tempfile.gettempdir()) / "data_quality" / "storage"
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "data_quality" / "objetos"
+DEFAULT_CACHE_MAX_BYTES = 2 << 30  # 2 GiB
+_S3_NOT_FOUND = {"404", "NoSuchKey", "NotFound"}
+
+
 @dataclass
 class S3ObjectInfo:
     bucket: str
@@ -11,51 +60,421 @@ class S3ObjectInfo:
     url: Optional[str] = None
 
 
-def get_s3_client():
-    return boto3.client(
-        "s3",
+class StorageBackend(ABC):
+    """Where the app's files live. Implementations are shared between threads."""
+
+    bucket: str
+
+    @abstractmethod
+    def put_bytes(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        ...
+
+    @abstractmethod
+    def get_bytes(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def put_stream(self, key: str, chunks: Iterable[bytes], content_type: str = "application/octet-stream") -> None:
+        """Write the concatenation of ``chunks`` without holding the whole object in memory."""
+
+    @abstractmethod
+    def open_object(self, key: str) -> BinaryIO:
+        """Seekable binary file-like object reading ``key``; close it when done."""
+
+    @abstractmethod
+    def etag(self, key: str) -> str:
+        """Version tag of ``key``: changes whenever the object content changes."""
+
+    @abstractmethod
+    def presigned_url(self, operation: str, key: str, expires: int) -> str:
+        """URL for ``operation`` ("put_object" or "get_object") on ``key``."""
+
+    def generate_presigned_put(self, key: str, expires: int = 900) -> S3ObjectInfo:
+        url = self.presigned_url("put_object", key, expires)
+        logger.debug(f"Presigned PUT gerado para {key}")
+        return S3ObjectInfo(bucket=self.bucket, key=key, url=url)
+
+    def generate_presigned_get(self, key: str, expires: int = 900) -> S3ObjectInfo:
+        url = self.presigned_url("get_object", key, expires)
+        logger.debug(f"Presigned GET gerado para {key}")
+        return S3ObjectInfo(bucket=self.bucket, key=key, url=url)
+
+
+def _parts(chunks: Iterable[bytes], part_size: int) -> Iterator[bytes]:
+    """Regroup ``chunks`` into blocks of exactly ``part_size`` bytes (the last one may be shorter)."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+class _RangedReader(io.RawIOBase):
+    """Seekable reader over ``read_range(start, end)`` calls of ``part_size`` bytes.
+
+    Parts are fetched in a thread pool, up to ``concurrency`` ahead of the current
+    position; a seek outside that window drops it and starts a new one at the target.
+    """
+
+    def __init__(self, read_range: Callable[[int, int], bytes], size: int, part_size: int, concurrency: int):
+        self._read_range = read_range
+        self._size = size
+        self._part_size = part_size
+        self._concurrency = concurrency
+        self._position = 0
+        self._next = 0  # start of the next part to request
+        self._pending: Deque[Tuple[int, Future]] = deque()
+        self._current: Optional[Tuple[int, bytes]] = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        position = {io.SEEK_SET: offset, io.SEEK_CUR: self._position + offset, io.SEEK_END: self._size + offset}[whence]
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        self._position = position
+        return position
+
+    def _fill(self) -> None:
+        while len(self._pending) < self._concurrency and self._next < self._size:
+            end = min(self._next + self._part_size, self._size)
+            self._pending.append((self._next, self._executor.submit(self._read_range, self._next, end)))
+            self._next = end
+
+    def _drop_pending(self) -> None:
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+
+    def _part(self, start: int) -> bytes:
+        if self._current is not None and self._current[0] == start:
+            return self._current[1]
+        while self._pending and self._pending[0][0] < start:
+            self._pending.popleft()[1].cancel()
+        if not self._pending or self._pending[0][0] != start:
+            self._drop_pending()
+            self._next = start
+        self._current = None
+        self._fill()
+        _, future = self._pending.popleft()
+        self._current = (start, future.result())
+        self._fill()
+        return self._current[1]
+
+    def readinto(self, buffer) -> int:
+        if self._position >= self._size:
+            return 0
+        start = self._position - self._position % self._part_size
+        data = self._part(start)
+        offset = self._position - start
+        n = min(len(buffer), len(data) - offset)
+        buffer[:n] = data[offset:offset + n]
+        self._position += n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._drop_pending()
+            self._current = None
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        super().close()
+
+
+def _create_s3_client(max_pool_connections: int):
+    session = boto3.session.Session(
         aws_access_key_id=settings.get("AWS_ACCESS_KEY_ID"),
         aws_secret_access_key=settings.get("AWS_SECRET_ACCESS_KEY"),
         region_name=settings.get("AWS_REGION", "us-east-1"),
     )
+    return session.client("s3", config=Config(max_pool_connections=max_pool_connections))
 
 
-def generate_presigned_put(key: str, expires: int = 900) -> S3ObjectInfo:
-    bucket = settings.get("AWS_BUCKET")
-    client = get_s3_client()
-    url = client.generate_presigned_url(
-        "put_object",
-        Params={"Bucket": bucket, "Key": key},
-        ExpiresIn=expires,
+class S3Backend(StorageBackend):
+    """S3 bucket accessed through one boto3 client, created on first use.
+
+    boto3 clients are thread-safe once created (sessions are not), so the client is
+    built once under a lock and reused: endpoint metadata and credentials are resolved
+    a single time and HTTP connections are kept alive in a pool of
+    ``max_pool_connections``.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        client=None,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+        part_size: int = DEFAULT_PART_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        self.bucket = bucket
+        self.max_pool_connections = max_pool_connections
+        self.part_size = part_size
+        self.concurrency = concurrency
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = _create_s3_client(self.max_pool_connections)
+        return self._client
+
+    def put_bytes(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, ContentType=content_type)
+        logger.info(f"Upload concluído: s3://{self.bucket}/{key}")
+
+    def _not_found(self, key: str, error: ClientError) -> Exception:
+        """FileNotFoundError for a missing object, as in LocalBackend; other errors unchanged."""
+        if error.response.get("Error", {}).get("Code") in _S3_NOT_FOUND:
+            return FileNotFoundError(f"s3://{self.bucket}/{key}")
+        return error
+
+    def _head(self, key: str) -> Dict[str, object]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            raise self._not_found(key, e) from e
+
+    def get_bytes(self, key: str) -> bytes:
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            raise self._not_found(key, e) from e
+        return obj["Body"].read()
+
+    def presigned_url(self, operation: str, key: str, expires: int) -> str:
+        return self.client.generate_presigned_url(operation, Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=expires)
+
+    def put_stream(self, key: str, chunks: Iterable[bytes], content_type: str = "application/octet-stream") -> None:
+        """Multipart upload of ``chunks``; objects that fit in one part use a single PUT."""
+        parts = _parts(chunks, self.part_size)
+        first = next(parts, b"")
+        second = next(parts, None)
+        if second is None:
+            self.put_bytes(key, first, content_type)
+            return
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=key, ContentType=content_type)["UploadId"]
+        try:
+            uploaded = self._upload_parts(key, upload_id, chain([first, second], parts))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": uploaded}
+            )
+        except BaseException:
+            try:
+                self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            except Exception as e:
+                logger.warning(f"Falha ao abortar upload multipart de {key}: {e}")
+            raise
+        logger.info(f"Upload concluído: s3://{self.bucket}/{key} ({len(uploaded)} partes)")
+
+    def _upload_part(self, key: str, upload_id: str, number: int, data: bytes) -> Dict[str, object]:
+        resposta = self.client.upload_part(Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=data)
+        return {"PartNumber": number, "ETag": resposta["ETag"]}
+
+    def _upload_parts(self, key: str, upload_id: str, parts: Iterable[bytes]) -> List[Dict[str, object]]:
+        # The semaphore bounds parts in flight, so at most concurrency + 1 parts are in memory
+        slots = threading.Semaphore(self.concurrency)
+        futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for number, data in enumerate(parts, start=1):
+                slots.acquire()
+                if any(f.done() and f.exception() is not None for f in futures):
+                    break
+                future = executor.submit(self._upload_part, key, upload_id, number, data)
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
+                del data
+        return [f.result() for f in futures]
+
+    def etag(self, key: str) -> str:
+        return self._head(key)["ETag"]
+
+    def open_object(self, key: str) -> BinaryIO:
+        """File-like reader fetching ``part_size`` ranges in parallel, pinned to the current ETag."""
+        head = self._head(key)
+        etag = head["ETag"]
+
+        def read_range(start: int, end: int) -> bytes:
+            obj = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end - 1}", IfMatch=etag)
+            return obj["Body"].read()
+
+        raw = _RangedReader(read_range, int(head["ContentLength"]), self.part_size, self.concurrency)
+        return io.BufferedReader(raw)
+
+
+class LocalBackend(StorageBackend):
+    """Files under ``root``, the key being the relative path.
+
+    Writes go to a temporary file in the same directory and are renamed into place,
+    so readers never see a partial object. Presigned URLs are ``file://`` URLs (no expiry).
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.bucket = str(self.root)
+
+    def path_for(self, key: str) -> Path:
+        raiz = self.root.resolve()
+        caminho = (raiz / key).resolve()
+        if not caminho.is_relative_to(raiz) or caminho == raiz:
+            raise ValueError(f"Chave fora do diretório de armazenamento: {key}")
+        return caminho
+
+    def put_bytes(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        self.put_stream(key, [data], content_type)
+
+    def put_stream(self, key: str, chunks: Iterable[bytes], content_type: str = "application/octet-stream") -> None:
+        caminho = self.path_for(key)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=caminho.parent, prefix=f".{caminho.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(temporario, caminho)
+        except BaseException:
+            Path(temporario).unlink(missing_ok=True)
+            raise
+        logger.info(f"Upload concluído: {caminho}")
+
+    def get_bytes(self, key: str) -> bytes:
+        return self.path_for(key).read_bytes()
+
+    def open_object(self, key: str) -> BinaryIO:
+        return open(self.path_for(key), "rb")
+
+    def etag(self, key: str) -> str:
+        info = self.path_for(key).stat()
+        return f"{info.st_mtime_ns:x}-{info.st_size:x}"
+
+    def presigned_url(self, operation: str, key: str, expires: int) -> str:
+        return self.path_for(key).as_uri()
+
+
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
+
+
+def _storage_from_settings() -> StorageBackend:
+    backend = str(settings.get("STORAGE_BACKEND", "s3")).lower()
+    if backend == "s3":
+        return S3Backend(
+            settings.get("AWS_BUCKET"),
+            max_pool_connections=int(settings.get("STORAGE_MAX_POOL_CONNECTIONS", DEFAULT_MAX_POOL_CONNECTIONS)),
+            part_size=max(int(settings.get("STORAGE_PART_SIZE", DEFAULT_PART_SIZE)), MIN_PART_SIZE),
+            concurrency=max(int(settings.get("STORAGE_CONCURRENCY", DEFAULT_CONCURRENCY)), 1),
+        )
+    if backend == "local":
+        return LocalBackend(settings.get("STORAGE_LOCAL_DIR", DEFAULT_LOCAL_DIR))
+    raise ValueError(f"STORAGE_BACKEND inválido: {backend!r} (use 's3' ou 'local')")
+
+
+def get_storage() -> StorageBackend:
+    """Return the process-wide storage backend, creating it from settings on first use."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = _storage_from_settings()
+        return _storage
+
+
+def set_storage(backend: Optional[StorageBackend]) -> None:
+    """Replace the process-wide backend (None: rebuild from settings on next use)."""
+    global _storage
+    with _storage_lock:
+        _storage = backend
+
+
+@lru_cache(maxsize=1)
+def download_cache() -> Optional[CacheDisco]:
+    """Cache configured by STORAGE_CACHE_DIR/STORAGE_CACHE_MAX_BYTES; None if STORAGE_CACHE_ENABLED=false."""
+    if not settings.get("STORAGE_CACHE_ENABLED", True):
+        return None
+    return CacheDisco(
+        settings.get("STORAGE_CACHE_DIR", DEFAULT_CACHE_DIR),
+        int(settings.get("STORAGE_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)),
     )
-    logger.debug(f"Presigned PUT gerado para {key}")
-    return S3ObjectInfo(bucket=bucket, key=key, url=url)
+
+
+def _open_mapped(path: Path) -> BinaryIO:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return io.BytesIO()  # empty files cannot be mapped
+        # The mapping outlives the descriptor and the file (eviction only unlinks it)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def open_cached(key: str) -> BinaryIO:
+    """Like ``open_object``, reading through the local download cache (memory-mapped file)."""
+    storage = get_storage()
+    cache = download_cache()
+    if cache is None:
+        return storage.open_object(key)
+    etag = storage.etag(key)
+    entry_key = hashlib.sha256(f"{storage.bucket}\0{key}\0{etag}".encode()).hexdigest()
+    entry = cache.obter(entry_key)
+    if entry is None:
+        with cache.gravar(entry_key) as destination:
+            with storage.open_object(key) as source, open(destination / "objeto", "wb") as f:
+                shutil.copyfileobj(source, f, 1024 * 1024)
+        logger.debug(f"Download de {key} ({etag}) gravado no cache local")
+        entry = cache.obter(entry_key)
+        if entry is None:  # larger than the whole cache: evicted right away
+            return storage.open_object(key)
+    try:
+        return _open_mapped(entry / "objeto")
+    except FileNotFoundError:  # evicted by another worker in between
+        return storage.open_object(key)
+
+
+def get_s3_client():
+    """Shared boto3 client of the process-wide backend (STORAGE_BACKEND must be "s3")."""
+    storage = get_storage()
+    if not isinstance(storage, S3Backend):
+        raise RuntimeError(f"Backend de armazenamento atual não é S3: {type(storage).__name__}")
+    return storage.client
+
+
+def generate_presigned_put(key: str, expires: int = 900) -> S3ObjectInfo:
+    return get_storage().generate_presigned_put(key, expires)
 
 
 def generate_presigned_get(key: str, expires: int = 900) -> S3ObjectInfo:
-    bucket = settings.get("AWS_BUCKET")
-    client = get_s3_client()
-    url = client.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": bucket, "Key": key},
-        ExpiresIn=expires,
-    )
-    logger.debug(f"Presigned GET gerado para {key}")
-    return S3ObjectInfo(bucket=bucket, key=key, url=url)
+    return get_storage().generate_presigned_get(key, expires)
 
 
 def put_bytes(key: str, data: bytes, content_type: str = "application/octet-stream"):
-    client = get_s3_client()
-    bucket = settings.get("AWS_BUCKET")
-    client.put_object(Bucket=bucket, Key=key, Body=data, ContentType=content_type)
-    logger.info(f"Upload concluído: s3://{bucket}/{key}")
+    get_storage().put_bytes(key, data, content_type)
 
 
 def get_bytes(key: str) -> bytes:
-    client = get_s3_client()
-    bucket = settings.get("AWS_BUCKET")
-    obj = client.get_object(Bucket=bucket, Key=key)
-    return obj["Body"].read()
+    return get_storage().get_bytes(key)
+
+
+def put_stream(key: str, chunks: Iterable[bytes], content_type: str = "application/octet-stream"):
+    get_storage().put_stream(key, chunks, content_type)
+
+
+def put_fileobj(key: str, fileobj: BinaryIO, content_type: str = "application/octet-stream", chunk_size: int = 1024 * 1024):
+    """Upload a readable binary file-like object in chunks of ``chunk_size`` bytes."""
+    get_storage().put_stream(key, iter(lambda: fileobj.read(chunk_size), b""), content_type)
+
+
+def open_object(key: str) -> BinaryIO:
+    return get_storage().open_object(key)
 
 
 # Helper key builders using default prefix
@@ -75,6 +494,12 @@ def normalized_key_for(arquivo_id: str, filename: str | None = None) -> str:
     return f"{base}/normalized/{arquivo_id}/{name}"
 
 
+def normalized_dataset_prefix_for(arquivo_id: str) -> str:
+    """Prefix of the Parquet dataset (one file per sheet) next to the normalized ``.xlsx``."""
+    base = _s3_base_prefix().strip("/")
+    return f"{base}/normalized/{arquivo_id}/parquet"
+
+
 def report_key_for(arquivo_id: str, filename: str | None = None) -> str:
     base = _s3_base_prefix().strip("/")
     name = (filename or f"erros_{arquivo_id}")
@@ -1,10 +1,16 @@
 from unidecode import unidecode
+from functools import lru_cache
 import re
 
 import os
 import sys
 from datetime import datetime, timedelta
 
+import numpy as np
+import pandas as pd
+
+from .integridade import verificar_relacao
+
 from dynaconf import LazySettings
 from loguru import logger
 
@@ -47,17 +53,97 @@ def tratar_caracteres(texto):
             texto = unidecode(texto)
         return texto
 
+
+# Cache limitado de strings já transliteradas, compartilhado entre abas e arquivos
+_transliterar = lru_cache(maxsize=int(settings.get("NORMALIZACAO_CACHE_SIZE", 65536)))(tratar_caracteres)
+
+
+_NAO_ASCII = r"[^\x00-\x7F]"
+
+
+def _mapear_distintos(ser: pd.Series, fn) -> pd.Series:
+    """``ser.map(fn)`` calculado uma vez por valor distinto não nulo.
+
+    Colunas de texto (``string[pyarrow]``) e categóricas mantêm o dtype; as demais
+    viram object. Nas categóricas (dicionário) só as categorias são transformadas e os
+    códigos remapeados; valores que passam a coincidir viram a mesma categoria. Nulos
+    continuam nulos (em object, o próprio valor nulo original).
+    """
+    if isinstance(ser.dtype, pd.CategoricalDtype):
+        categorias = ser.cat.categories
+        codigos, novas = pd.factorize(np.array([fn(v) for v in categorias.tolist()], dtype=object))
+        codigos = np.append(codigos, -1)[ser.cat.codes.to_numpy()]  # código -1 (nulo) continua -1
+        return pd.Series(
+            pd.Categorical.from_codes(codigos, categories=pd.Index(novas, dtype=categorias.dtype)),
+            index=ser.index, name=ser.name,
+        )
+    codigos, unicos = pd.factorize(ser)
+    if isinstance(ser.dtype, pd.StringDtype):
+        convertidos = pd.array([fn(v) for v in unicos.tolist()], dtype=ser.dtype)
+        return pd.Series(convertidos.take(codigos, allow_fill=True), index=ser.index, name=ser.name)
+    resultado = np.array([fn(v) for v in unicos] + [None], dtype=object)[codigos]
+    nulos = codigos < 0
+    resultado[nulos] = ser.to_numpy(dtype=object)[nulos]
+    return pd.Series(resultado, index=ser.index, name=ser.name, dtype=object)
+
+
+def _normalizar_coluna_texto(ser: pd.Series) -> pd.Series:
+    if ser.dtype != object:
+        # string[pyarrow] ou categoria: só textos; ASCII puro já está normalizado
+        textos = pd.Series(ser.cat.categories) if isinstance(ser.dtype, pd.CategoricalDtype) else ser
+        if isinstance(textos.dtype, pd.StringDtype) and not textos.str.contains(_NAO_ASCII, regex=True).any():
+            return ser
+        return _mapear_distintos(ser, _transliterar)
+    valores = ser.to_numpy(dtype=object)
+    if pd.api.types.infer_dtype(valores, skipna=True) == "string":
+        mascara = None
+        textos = valores
+    else:
+        # Coluna mista (ex.: números e textos): só as células str são transliteradas
+        mascara = np.fromiter((isinstance(v, str) for v in valores), dtype=bool, count=len(valores))
+        if not mascara.any():
+            return ser
+        textos = valores[mascara]
+    codigos, unicos = pd.factorize(textos)
+    convertidos = np.array([_transliterar(v) for v in unicos] + [None], dtype=object)
+    resultado = convertidos[codigos]
+    nulos = codigos < 0
+    resultado[nulos] = textos[nulos]
+    if mascara is not None:
+        valores = valores.copy()
+        valores[mascara] = resultado
+        resultado = valores
+    return pd.Series(resultado, index=ser.index, name=ser.name, dtype=ser.dtype)
+
+
+def normalizar_textos(df: pd.DataFrame) -> pd.DataFrame:
+    """Equivalente vetorizado de ``df.applymap(tratar_caracteres)``.
+
+    Só percorre colunas object/string/categoria, mantendo o dtype; cada valor distinto é
+    transliterado uma vez (com cache) e o resultado é replicado para as linhas pelo código
+    do factorize (nas categóricas, só as categorias são transliteradas).
+    """
+    df = df.copy(deep=False)  # as colunas alteradas são substituídas, não escritas no lugar
+    for i, tipo in enumerate(df.dtypes):
+        if pd.api.types.is_object_dtype(tipo) or pd.api.types.is_string_dtype(tipo) or isinstance(tipo, pd.CategoricalDtype):
+            df.isetitem(i, _normalizar_coluna_texto(df.iloc[:, i]))
+    return df
+
+_SEXOS = {'f': 'F',
+          'feminino': 'F',
+          'm': 'M',
+          'masculino': 'M'}
+
+
+def _sexo(valor):
+    return _SEXOS.get(str(valor).strip().lower())
+
+
 def validar_sexo(df, coluna='sexo'):
+    """Padroniza ``coluna`` para F/M (demais valores viram nulo), mantendo o dtype da coluna."""
     if coluna not in df.columns:
         return df
-    ser = df[coluna].astype(str).str.strip()
-    ser_norm = (ser
-                .str.lower()
-                .map({'f': 'F',
-                      'feminino': 'F',
-                      'm': 'M',
-                      'masculino': 'M'}))
-    df[coluna] = ser_norm.where(ser_norm.isin(['F','M']))
+    df[coluna] = _mapear_distintos(df[coluna], _sexo)
     return df
          
 
@@ -72,44 +158,31 @@ def tratar_cep(valor):
 
 def normalizar_coluna_cep(df, coluna='cep'):
     if coluna in df.columns:
-        df[coluna] = df[coluna].apply(tratar_cep)
+        df[coluna] = _mapear_distintos(df[coluna], tratar_cep)
     return df
 
 def verificar_integridade(df_fk, df_pk, coluna_fk, coluna_pk):
-    erros = []
-    
+    """coluna_fk/coluna_pk aceitam o nome de uma coluna ou uma lista (chave composta)."""
+    colunas_fk = [coluna_fk] if isinstance(coluna_fk, str) else list(coluna_fk)
+    colunas_pk = [coluna_pk] if isinstance(coluna_pk, str) else list(coluna_pk)
+
     # Verifica se as colunas existem
-    if coluna_fk not in df_fk.columns:
-        return [{
-            "codigo_invalido": "N/A",
-            "quantidade_registros": 0,
-            "linhas_afetadas": [],
-            "erro": f"Coluna '{coluna_fk}' não encontrada na tabela principal"
-        }]
-    
-    if coluna_pk not in df_pk.columns:
-        return [{
-            "codigo_invalido": "N/A", 
-            "quantidade_registros": 0,
-            "linhas_afetadas": [],
-            "erro": f"Coluna '{coluna_pk}' não encontrada na tabela de referência"
-        }]
-    
-    valores_pk = set(df_pk[coluna_pk].dropna().unique())  # Chaves primárias válidas
-    valores_fk = set(df_fk[coluna_fk].dropna().unique())  # Chaves estrangeiras usadas
-    
-    fks_invalidas = valores_fk - valores_pk
-    
-    if fks_invalidas:
-        for fk_invalida in fks_invalidas:
-            linhas_com_erro = df_fk[df_fk[coluna_fk] == fk_invalida].index.tolist()
-            linhas_excel = [linha + 2 for linha in linhas_com_erro]
-            
-            erros.append({
-                "codigo_invalido": fk_invalida,  # Nome genérico em vez de "codigo_setor_invalido"
-                "quantidade_registros": len(linhas_com_erro),
-                "linhas_afetadas": linhas_excel,
-                "erro": f"Código '{fk_invalida}' da coluna '{coluna_fk}' não existe na tabela de referência"
-            })
-    
-    return erros
\ No newline at end of file
+    for coluna in colunas_fk:
+        if coluna not in df_fk.columns:
+            return [{
+                "codigo_invalido": "N/A",
+                "quantidade_registros": 0,
+                "linhas_afetadas": [],
+                "erro": f"Coluna '{coluna}' não encontrada na tabela principal"
+            }]
+
+    for coluna in colunas_pk:
+        if coluna not in df_pk.columns:
+            return [{
+                "codigo_invalido": "N/A", 
+                "quantidade_registros": 0,
+                "linhas_afetadas": [],
+                "erro": f"Coluna '{coluna}' não encontrada na tabela de referência"
+            }]
+
+    return verificar_relacao(df_fk, df_pk, colunas_fk, colunas_pk)
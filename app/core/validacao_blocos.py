@@ -0,0 +1,353 @@
+"""Validação de schema por blocos de linhas.
+
+As checagens de coluna do Pandera são locais à linha, então cada bloco pode ser
+validado de forma independente (inclusive em outro processo) sem alterar os casos
+de falha. A exceção é a unicidade (``unique=True`` na coluna ou ``unique=[...]`` no
+schema), que depende do conjunto inteiro: ela é removida do schema dos blocos e
+avaliada uma única vez sobre o DataFrame completo (etapa de redução), pelo detector
+de duplicatas de ``duplicidade``.
+
+Os blocos preservam o índice original, então ``index + 2`` continua sendo a linha do Excel.
+"""
+from __future__ import annotations
+import copy
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Collection, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pandera.pandas as pa
+
+from . import derivadas, duplicidade
+from .util import settings
+
+
+def colunas_unicas(schema: pa.DataFrameSchema) -> List[str]:
+    return [nome for nome, coluna in schema.columns.items() if coluna.unique]
+
+
+def schema_sem_unicidade(schema: pa.DataFrameSchema) -> pa.DataFrameSchema:
+    """Cópia do schema sem as restrições de unicidade (usada na validação de cada bloco)."""
+    local = copy.deepcopy(schema)
+    unicas = colunas_unicas(local)
+    if unicas:
+        local = local.update_columns({nome: {"unique": False} for nome in unicas})
+    local.unique = None
+    return local
+
+
+def colunas_esperadas(schema: pa.DataFrameSchema) -> Dict[str, str]:
+    """Nome -> tipo final (``"string[pyarrow]"``, ``"category"``, ``"int64"``...) de cada coluna do schema."""
+    return {nome: str(coluna.dtype) for nome, coluna in schema.columns.items()}
+
+
+def falhas_colunas_extras(colunas: Sequence[str]) -> Optional[pd.DataFrame]:
+    """Casos de falha de ``strict=True`` para colunas do arquivo que não foram lidas.
+
+    Mesmo formato que o Pandera produziria se as colunas tivessem sido carregadas.
+    """
+    if not colunas:
+        return None
+    return pd.DataFrame({
+        "schema_context": "DataFrameSchema",
+        "column": None,
+        "check": "column_in_schema",
+        "check_number": None,
+        "failure_case": list(colunas),
+        "index": None,
+    }, dtype=object)
+
+
+def chaves_unicas(schema: pa.DataFrameSchema) -> List[Tuple[str, ...]]:
+    """Chaves que devem ser únicas: cada coluna com ``unique=True`` e o ``unique=[...]`` do schema."""
+    chaves = [(nome,) for nome in colunas_unicas(schema)]
+    if schema.unique:
+        chaves.append(tuple([schema.unique] if isinstance(schema.unique, str) else schema.unique))
+    return chaves
+
+
+def falhas(schema: pa.DataFrameSchema, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """``failure_cases`` de ``schema.validate(df, lazy=True)``, ou None se o DataFrame for válido."""
+    try:
+        with derivadas.escopo():
+            schema.validate(df, lazy=True)
+    except pa.errors.SchemaErrors as e:
+        return e.failure_cases
+    return None
+
+
+def falhas_unicidade(schema: pa.DataFrameSchema, df: pd.DataFrame, ignorar: Collection[str] = ()) -> Optional[pd.DataFrame]:
+    """Etapa de redução: casos de falha de unicidade avaliados sobre o DataFrame completo.
+
+    A unicidade declarada no schema é verificada por ``duplicidade`` (hash, tempo
+    linear) em vez do Pandera. ``ignorar``: colunas cuja unicidade não deve ser verificada.
+    """
+    partes = [
+        duplicidade.falhas_duplicidade(df, chave)
+        for chave in chaves_unicas(schema)
+        if set(chave) <= set(df.columns) and not set(chave) & set(ignorar)
+    ]
+    return combinar(partes)
+
+
+def falhas_completas(schema: pa.DataFrameSchema, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Como ``falhas(schema, df)``, com a unicidade verificada por ``falhas_unicidade``."""
+    return combinar([falhas_unicidade(schema, df), falhas(schema_sem_unicidade(schema), df)])
+
+
+def numero_de_blocos(linhas: int, max_workers: int, tamanho_minimo: int) -> int:
+    """Quantidade de blocos: um por worker, sem criar blocos menores que ``tamanho_minimo``."""
+    return max(1, min(max_workers, math.ceil(linhas / max(tamanho_minimo, 1))))
+
+
+def dividir(df: pd.DataFrame, n_blocos: int) -> List[pd.DataFrame]:
+    tamanho = math.ceil(len(df) / n_blocos)
+    return [df.iloc[inicio:inicio + tamanho] for inicio in range(0, len(df), tamanho)]
+
+
+def tem_falha_de_tabela(falhas_blocos: Sequence[Optional[pd.DataFrame]]) -> bool:
+    """Falhas sem índice (dtype, coerção da coluna, exceção num Check) dependem da coluna inteira.
+
+    Nesses casos o resultado por bloco não é equivalente e a aba deve ser validada inteira.
+    """
+    return any(f is not None and f["index"].isna().any() for f in falhas_blocos)
+
+
+def combinar(falhas_partes: Sequence[Optional[pd.DataFrame]]) -> Optional[pd.DataFrame]:
+    """Concatena as falhas (unicidade primeiro, depois blocos em ordem) agrupando por checagem.
+
+    Dentro de cada (coluna, checagem) as linhas ficam em ordem crescente, como numa validação única.
+    """
+    partes = [f for f in falhas_partes if f is not None and not f.empty]
+    if not partes:
+        return None
+    combinadas = pd.concat(partes, ignore_index=True)
+    chave = combinadas["schema_context"].astype(str) + "\x1f" + combinadas["column"].astype(str) + "\x1f" + combinadas["check"].astype(str)
+    ordem = np.argsort(pd.factorize(chave)[0], kind="stable")
+    return combinadas.iloc[ordem].reset_index(drop=True)
+
+
+class ResultadoProgressivo(NamedTuple):
+    falhas: Optional[pd.DataFrame]
+    interrompida: bool
+    linhas_validadas: int
+
+
+def _criticas(falhas_bloco: Optional[pd.DataFrame], campos_opcionais: Collection[str]) -> int:
+    if falhas_bloco is None:
+        return 0
+    return int((~falhas_bloco["column"].isin(list(campos_opcionais))).sum())
+
+
+def validar_progressivamente(
+    schema: pa.DataFrameSchema,
+    df: pd.DataFrame,
+    campos_opcionais: Collection[str],
+    max_erros_criticos: Optional[int] = None,
+    tamanho_bloco: Optional[int] = None,
+) -> ResultadoProgressivo:
+    """Valida ``df`` uma única vez, em blocos de linhas na ordem da planilha, parando cedo.
+
+    A validação para ao fim do bloco em que os erros críticos (colunas fora de
+    ``campos_opcionais``) chegam a ``max_erros_criticos`` (padrão
+    ``VALIDACAO_MAX_ERROS_CRITICOS``; 0 ou None valida tudo). Sem interrupção, o
+    resultado tem as mesmas falhas de ``schema.validate(df, lazy=True)``; a unicidade
+    só é avaliada quando todas as linhas foram validadas.
+    """
+    if max_erros_criticos is None:
+        max_erros_criticos = int(settings.get("VALIDACAO_MAX_ERROS_CRITICOS", 100) or 0)
+    if tamanho_bloco is None:
+        tamanho_bloco = int(settings.get("VALIDACAO_PROGRESSIVA_TAMANHO_BLOCO", 10_000))
+    local = schema_sem_unicidade(schema)
+    partes: List[Optional[pd.DataFrame]] = []
+    criticas = 0
+    linhas = 0
+    blocos = dividir(df, math.ceil(len(df) / max(tamanho_bloco, 1))) if len(df) else [df]
+    for bloco in blocos:
+        falhas_bloco = falhas(local, bloco)
+        if tem_falha_de_tabela([falhas_bloco]):
+            # Coerção/exceção depende da coluna inteira: cai para a validação única
+            return ResultadoProgressivo(falhas_completas(schema, df), False, len(df))
+        partes.append(falhas_bloco)
+        linhas += len(bloco)
+        criticas += _criticas(falhas_bloco, campos_opcionais)
+        if max_erros_criticos and criticas >= max_erros_criticos and linhas < len(df):
+            return ResultadoProgressivo(combinar(partes), True, linhas)
+    return ResultadoProgressivo(combinar([falhas_unicidade(schema, df), *partes]), False, len(df))
+
+
+class LimitesErros(NamedTuple):
+    """Orçamento de casos de falha; None (ou 0) é ilimitado."""
+    por_coluna: Optional[int] = None
+    por_aba: Optional[int] = None
+    total: Optional[int] = None
+
+    @property
+    def ativos(self) -> bool:
+        return bool(self.por_coluna or self.por_aba or self.total)
+
+
+def limites_de_settings() -> LimitesErros:
+    """``VALIDACAO_MAX_ERROS_POR_COLUNA``/``_POR_ABA``/``_TOTAL`` (0 desliga cada limite)."""
+    def _ler(nome: str, padrao: int) -> Optional[int]:
+        return int(settings.get(nome, padrao) or 0) or None
+
+    return LimitesErros(
+        por_coluna=_ler("VALIDACAO_MAX_ERROS_POR_COLUNA", 10_000),
+        por_aba=_ler("VALIDACAO_MAX_ERROS_POR_ABA", 50_000),
+        total=_ler("VALIDACAO_MAX_ERROS_TOTAL", 100_000),
+    )
+
+
+class ResultadoLimitado(NamedTuple):
+    falhas: Optional[pd.DataFrame]
+    omitidas: Dict[str, int]  # coluna -> casos de falha descartados ("*" = limite da aba)
+    linhas_nao_avaliadas: Dict[str, int]  # coluna -> linhas que deixaram de ser avaliadas ("*" = aba inteira)
+
+
+class _Orcamento:
+    def __init__(self, limites: LimitesErros):
+        self.limites = limites
+        self.usadas: Counter = Counter()
+        self.total = 0
+        self.omitidas: Counter = Counter()
+
+    def esgotadas(self) -> List[str]:
+        if not self.limites.por_coluna:
+            return []
+        return [coluna for coluna, n in self.usadas.items() if n >= self.limites.por_coluna]
+
+    @property
+    def aba_esgotada(self) -> bool:
+        return bool(self.limites.por_aba) and self.total >= self.limites.por_aba
+
+    def aplicar(self, falhas_parte: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Mantém os primeiros casos de cada coluna e da aba que cabem no orçamento."""
+        if falhas_parte is None or falhas_parte.empty:
+            return falhas_parte
+        colunas = falhas_parte["column"].astype(str).to_numpy()
+        manter = np.ones(len(colunas), dtype=bool)
+        if self.limites.por_coluna:
+            for coluna in pd.unique(colunas):
+                posicoes = np.flatnonzero(colunas == coluna)
+                restante = max(self.limites.por_coluna - self.usadas[coluna], 0)
+                manter[posicoes[restante:]] = False
+                self.omitidas[coluna] += max(len(posicoes) - restante, 0)
+        if self.limites.por_aba:
+            restante = max(self.limites.por_aba - self.total, 0)
+            excedentes = np.flatnonzero(manter)[restante:]
+            manter[excedentes] = False
+            self.omitidas["*"] += len(excedentes)
+        for coluna, n in Counter(colunas[manter].tolist()).items():
+            self.usadas[coluna] += n
+        self.total += int(manter.sum())
+        return falhas_parte[manter] if not manter.all() else falhas_parte
+
+    def resultado(self, falhas_finais: Optional[pd.DataFrame], nao_avaliadas: Dict[str, int]) -> ResultadoLimitado:
+        return ResultadoLimitado(falhas_finais, {c: n for c, n in self.omitidas.items() if n}, nao_avaliadas)
+
+
+def schema_sem_checks(schema: pa.DataFrameSchema, colunas: Iterable[str]) -> pa.DataFrameSchema:
+    """Cópia do schema que deixa de avaliar as colunas (mantém só a coerção de tipo)."""
+    colunas = [c for c in colunas if c in schema.columns]
+    if not colunas:
+        return schema
+    return copy.deepcopy(schema).update_columns(
+        {c: {"checks": [], "nullable": True, "unique": False} for c in colunas}
+    )
+
+
+def dividir_para_limites(df: pd.DataFrame, tamanho_bloco: int, limites: LimitesErros) -> List[pd.DataFrame]:
+    """Blocos de linhas, em ordem, para ``validar_com_limites``.
+
+    O primeiro bloco não passa do menor limite ativo e os seguintes dobram até
+    ``tamanho_bloco``: uma coluna que estoura o limite no começo da aba deixa de ser
+    avaliada cedo mesmo em abas menores que ``tamanho_bloco``, e uma aba limpa não
+    vira uma multidão de blocos pequenos.
+    """
+    tamanho = max(min([tamanho_bloco, *(n for n in (limites.por_coluna, limites.por_aba) if n)]), 1)
+    blocos = []
+    inicio = 0
+    while inicio < len(df):
+        blocos.append(df.iloc[inicio:inicio + tamanho])
+        inicio += tamanho
+        tamanho = max(min(tamanho * 2, tamanho_bloco), 1)
+    return blocos or [df]
+
+
+ValidadorBlocos = Callable[[Sequence[pd.DataFrame], Tuple[str, ...]], List[Optional[pd.DataFrame]]]
+
+
+def _validador_local(schema: pa.DataFrameSchema) -> ValidadorBlocos:
+    local = schema_sem_unicidade(schema)
+    sem_checks = lru_cache(maxsize=None)(lambda ignorar: schema_sem_checks(local, ignorar))
+
+    def validar(blocos: Sequence[pd.DataFrame], ignorar: Tuple[str, ...]) -> List[Optional[pd.DataFrame]]:
+        return [falhas(sem_checks(ignorar), bloco) for bloco in blocos]
+
+    return validar
+
+
+def validar_com_limites(
+    schema: pa.DataFrameSchema,
+    df: pd.DataFrame,
+    limites: LimitesErros,
+    tamanho_bloco: Optional[int] = None,
+    validar_blocos: Optional[ValidadorBlocos] = None,
+    blocos_por_rodada: int = 1,
+) -> ResultadoLimitado:
+    """Valida ``df`` em blocos de linhas respeitando os limites de erros por coluna e por aba.
+
+    Os blocos (``dividir_para_limites``) são validados em rodadas de ``blocos_por_rodada``
+    por ``validar_blocos(blocos, ignorar)``, que recebe as colunas a deixar de avaliar
+    (padrão: no próprio processo, um bloco por rodada). O orçamento é conferido ao fim
+    de cada rodada: a coluna que esgota o limite sai do schema das rodadas seguintes (e
+    a unicidade dela não é verificada) e, quando a aba esgota, o restante não é
+    validado. Uma falha de coerção (ver ``tem_falha_de_tabela``) faz a aba ser validada
+    de uma vez, já sem as colunas esgotadas. ``limites.total`` é aplicado por quem
+    junta as abas.
+    """
+    if tamanho_bloco is None:
+        tamanho_bloco = int(settings.get("VALIDACAO_PROGRESSIVA_TAMANHO_BLOCO", 10_000))
+    if validar_blocos is None:
+        validar_blocos = _validador_local(schema)
+    orcamento = _Orcamento(limites)
+    partes: List[Optional[pd.DataFrame]] = []
+    nao_avaliadas: Dict[str, int] = {}
+    linhas = 0
+    blocos = dividir_para_limites(df, tamanho_bloco, limites)
+    for inicio in range(0, len(blocos), max(blocos_por_rodada, 1)):
+        rodada = blocos[inicio:inicio + max(blocos_por_rodada, 1)]
+        falhas_rodada = validar_blocos(rodada, tuple(nao_avaliadas))
+        if tem_falha_de_tabela(falhas_rodada):
+            return _validar_inteira(schema, df, orcamento, partes, nao_avaliadas)
+        partes.extend(orcamento.aplicar(falhas_bloco) for falhas_bloco in falhas_rodada)
+        linhas += sum(len(bloco) for bloco in rodada)
+        restantes = len(df) - linhas
+        if not restantes:
+            break
+        if orcamento.aba_esgotada:
+            nao_avaliadas["*"] = restantes
+            return orcamento.resultado(combinar(partes), nao_avaliadas)
+        nao_avaliadas.update({c: restantes for c in orcamento.esgotadas() if c not in nao_avaliadas})
+    unicidade = orcamento.aplicar(falhas_unicidade(schema, df, ignorar=nao_avaliadas))
+    return orcamento.resultado(combinar([unicidade, *partes]), nao_avaliadas)
+
+
+def _validar_inteira(
+    schema: pa.DataFrameSchema,
+    df: pd.DataFrame,
+    orcamento: _Orcamento,
+    partes: Sequence[Optional[pd.DataFrame]],
+    nao_avaliadas: Dict[str, int],
+) -> ResultadoLimitado:
+    # Coerção/exceção depende da coluna inteira: valida a aba de uma vez. As colunas que
+    # já esgotaram o limite não são reavaliadas e mantêm as falhas dos blocos anteriores.
+    esgotadas = list(nao_avaliadas)
+    anteriores = [p[p["column"].isin(esgotadas)] for p in partes if p is not None]
+    refeito = _Orcamento(orcamento.limites)
+    refeito.omitidas.update({c: orcamento.omitidas[c] for c in esgotadas})
+    inteira = falhas_completas(schema_sem_checks(schema, esgotadas), df)
+    return refeito.resultado(refeito.aplicar(combinar([*anteriores, inteira])), nao_avaliadas)
@@ -1,13 +1,20 @@
-import io
-from typing import Dict, List, Tuple
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Tuple
 import pandas as pd
 import numpy as np
 import pandera.pandas as pa
-from janitor import clean_names
 
 from .schemas import metricas_setores, metricas_cargos, metricas_empresas, metricas_funcionarios
-from .util import tratar_caracteres, validar_sexo, normalizar_coluna_cep, verificar_integridade, logger
-from .codigos_erro import mapear_codigo_erro, mapear_codigo_erro_pandera, obter_descricao_codigo, eh_campo_opcional
+from .integridade import RELACOES, Relacao, linhas_invalidas
+from .leitor_excel import LeituraAba, ler_planilhas_tipadas
+from . import cache_validacao, validacao_blocos
+from .instrumentacao import MEDIDOR_NULO, criar_medidor
+from .coletor_erros import ColetorErros
+from .util import normalizar_textos, validar_sexo, normalizar_coluna_cep, logger, settings
+from .codigos_erro import COLUNAS_OPCIONAIS, TabelaCodigos, mapear_codigo_erro, eh_campo_opcional
 
 SCHEMAS = {
     "Setores": metricas_setores,
@@ -16,6 +23,16 @@ SCHEMAS = {
     "Modelo F": metricas_funcionarios,
 }
 
+# Código de erro de cada (check, coluna) dos schemas
+TABELA_CODIGOS = TabelaCodigos(SCHEMAS)
+
+# Colunas lidas de cada aba (nome normalizado -> tipo final), derivadas dos schemas
+COLUNAS_ESPERADAS = {aba: validacao_blocos.colunas_esperadas(schema) for aba, schema in SCHEMAS.items()}
+
+# Abas grandes cuja validação de schema é dividida em blocos de linhas no modo paralelo
+ABAS_EM_BLOCOS = ("Modelo F",)
+TAMANHO_MINIMO_BLOCO = 10_000
+
 CAMPOS_OPCIONAIS = {
     "cod_empresa","telefone", "cod_cbo","nome_social",
     "trabalho_em_altura", "dt_admissao", "pis_pasep", "rg",
@@ -24,84 +41,281 @@ CAMPOS_OPCIONAIS = {
 }
 
 
-def _add_erro(lista: List[dict], codigo: str, desc: str, msg: str, planilha: str, linha, coluna: str, tipo: str):
-    nullable = eh_campo_opcional(coluna)
-    lista.append({
-        "codigoERRO": codigo,
-        "Descrição do Código": desc,
-        "Mensagem Detalhada": msg,
-        "planilha": planilha,
-        "linha": linha,
-        "coluna": coluna,
-        "tipo": tipo,
-        "severidade": "CRÍTICO" if not nullable else "AVISO"
-    })
+def _severidade(coluna: str | None) -> str:
+    return "AVISO" if eh_campo_opcional(coluna) else "CRÍTICO"
+
 
+def _add_erro(erros: ColetorErros, codigo: str, msg: str, planilha: str | None, linha, coluna: str | None, tipo: str):
+    erros.adicionar(codigo, msg, planilha, linha, coluna, tipo, _severidade(coluna))
 
-def _erro_regra(lista: List[dict], mensagem: str, planilha: str, linha, coluna: str, tipo: str):
+
+def _erro_regra(erros: ColetorErros, mensagem: str, planilha: str, linha, coluna: str, tipo: str):
     codigo = mapear_codigo_erro(mensagem, coluna, eh_campo_opcional(coluna))
-    _add_erro(lista, codigo, obter_descricao_codigo(codigo), mensagem, planilha, linha, coluna, tipo)
-
-
-def _integridade(aba_fato: str, aba_dim: str, col_fato: str, col_dim: str, df_dict: Dict[str, pd.DataFrame], erros: List[dict]):
-    fact = df_dict.get(aba_fato)
-    dim = df_dict.get(aba_dim)
-    if fact is None or dim is None:
-        return
-    if col_fato not in fact.columns or col_dim not in dim.columns:
-        return
-    validos = set(dim[col_dim].dropna().unique())
-    for idx, val in fact[col_fato].items():
-        if val is not None and val not in validos:
-            _erro_regra(erros, f"Valor {val} inexistente em {aba_dim}.{col_dim}", aba_fato, idx + 2, col_fato, "INTEGRIDADE_REFERENCIAL")
-
-
-def validar_arquivo_excel(file_bytes: bytes) -> Tuple[Dict[str, pd.DataFrame], List[dict], Dict]:
-    """Valida um arquivo Excel completo e retorna dfs normalizados, lista de erros e estatísticas."""
-    erros: List[dict] = []
-    normalized: Dict[str, pd.DataFrame] = {}
-    buf = io.BytesIO(file_bytes)
-    sheets = list(SCHEMAS.keys())
-    df_dict = pd.read_excel(buf, sheet_name=sheets)
-
-    # Normalização base
-    for nome, df in df_dict.items():
-        df = df.applymap(tratar_caracteres)
-        df = clean_names(df, case_type="snake")
-        df = df.replace({np.nan: None})
+    _add_erro(erros, codigo, mensagem, planilha, linha, coluna, tipo)
+
+
+def _erro_limite(erros: ColetorErros, msg: str, planilha: str | None, coluna: str | None):
+    _add_erro(erros, "701", msg, planilha, None, coluna, "LIMITE_ERROS")
+
+
+def _erros_de_limite(aba: str, limites: validacao_blocos.LimitesErros, resultado: validacao_blocos.ResultadoLimitado) -> ColetorErros:
+    """Um erro-resumo por coluna (ou pela aba, "*") que estourou o limite de erros."""
+    erros = ColetorErros()
+    for coluna in dict.fromkeys([*resultado.omitidas, *resultado.linhas_nao_avaliadas]):
+        limite, alvo = (limites.por_aba, "da aba") if coluna == "*" else (limites.por_coluna, "da coluna")
+        msg = f"Limite de {limite} erros {alvo} atingido: {resultado.omitidas.get(coluna, 0)} erros omitidos"
+        if coluna in resultado.linhas_nao_avaliadas:
+            msg += f", {resultado.linhas_nao_avaliadas[coluna]} linhas não avaliadas"
+        _erro_limite(erros, msg, aba, None if coluna == "*" else coluna)
+    return erros
+
+
+def _integridade(relacao: Relacao, df_dict: Dict[str, pd.DataFrame], erros: ColetorErros, limites: validacao_blocos.LimitesErros):
+    omitidos = 0
+    registrados = 0
+    for linha, val in linhas_invalidas(relacao, df_dict):
+        if limites.por_coluna and registrados >= limites.por_coluna:
+            omitidos += 1
+            continue
+        registrados += 1
+        _erro_regra(erros, f"Valor {val} inexistente em {relacao.aba_dim}.{relacao.rotulo_dim}", relacao.aba_fato, linha, relacao.rotulo_fato, "INTEGRIDADE_REFERENCIAL")
+    if omitidos:
+        _erro_limite(erros, f"Limite de {limites.por_coluna} erros da coluna atingido: {omitidos} erros omitidos", relacao.aba_fato, relacao.rotulo_fato)
+
+
+def validar_arquivo_excel(file_bytes: bytes, motor_leitura: str | None = None, usar_cache: bool = True, max_workers: int | None = None) -> Tuple[Dict[str, pd.DataFrame], ColetorErros, Dict]:
+    """Valida um arquivo Excel completo e retorna dfs normalizados, lista de erros e estatísticas.
+
+    motor_leitura: motor do leitor de planilhas ("streaming", "pandas" ou "calamine");
+    se None usa a configuração ``EXCEL_READER_ENGINE``.
+    usar_cache: reaproveita o resultado de uma validação anterior do mesmo arquivo com os
+    mesmos schemas (ver ``cache_validacao``).
+    max_workers: processos usados para normalizar e validar as abas em paralelo;
+    se None usa a configuração ``VALIDACAO_MAX_WORKERS`` (padrão 1, sequencial).
+
+    Os erros vêm num ``ColetorErros``: uma sequência de dicts (``COLUNAS_RELATORIO``) guardada
+    em colunas; ``erros.para_dataframe()`` gera o relatório.
+
+    Com ``VALIDACAO_INSTRUMENTACAO`` ligado, ``stats["timings"]`` traz tempo e memória de
+    cada etapa/aba (ver ``instrumentacao``).
+    """
+    if max_workers is None:
+        max_workers = int(settings.get("VALIDACAO_MAX_WORKERS", 1))
+    medidor = criar_medidor()
+    try:
+        with medidor.etapa("total"):
+            normalized, erros, stats = _validar_com_cache(file_bytes, motor_leitura, usar_cache, max_workers, medidor)
+    finally:
+        medidor.encerrar()
+    timings = medidor.resultado()
+    if timings is not None:
+        stats = {**stats, "timings": timings}
+        medidor.registrar_log("Instrumentação da validação")
+    return normalized, erros, stats
+
+
+def _validar_com_cache(file_bytes: bytes, motor_leitura: str | None, usar_cache: bool, max_workers: int, medidor) -> Tuple[Dict[str, pd.DataFrame], ColetorErros, Dict]:
+    cache = cache_validacao.obter_cache() if usar_cache else None
+    if cache is None:
+        return _validar(file_bytes, motor_leitura, max_workers, medidor)
+
+    with medidor.etapa("cache_leitura"):
+        # Os limites de erros mudam a lista de erros: entram na chave junto com os schemas
+        fingerprint = cache_validacao.fingerprint_schemas(SCHEMAS, CAMPOS_OPCIONAIS, validacao_blocos.limites_de_settings())
+        chave = cache_validacao.chave_validacao(file_bytes, fingerprint)
+        resultado = cache_validacao.carregar(cache, chave)
+    if resultado is not None:
+        logger.info(f"Validação obtida do cache ({chave[:12]}): {resultado[2]}")
+        return resultado
+    resultado = _validar(file_bytes, motor_leitura, max_workers, medidor)
+    with medidor.etapa("cache_gravacao"):
+        cache_validacao.salvar(cache, chave, resultado)
+    return resultado
+
+
+def _normalizar_aba(aba: str, leitura: LeituraAba, medidor=MEDIDOR_NULO) -> LeituraAba:
+    # Nomes de colunas e tipos já vêm normalizados da leitura (ler_planilhas_tipadas)
+    with medidor.etapa("normalizar_textos", aba):
+        df = normalizar_textos(leitura.df)
+    with medidor.etapa("ajustes", aba):
         validar_sexo(df)
         normalizar_coluna_cep(df)
-        df_dict[nome] = df
+    return leitura._replace(df=df)
+
+
+def _erros_de_falhas(aba: str, falhas: pd.DataFrame | None) -> ColetorErros:
+    erros = ColetorErros()
+    if falhas is None:
+        return erros
+    colunas = falhas["column"]
+    erros.adicionar_lote(
+        codigos=TABELA_CODIGOS.codigos(falhas["check"], colunas),
+        mensagens=[f"{caso}, {check}" for caso, check in zip(falhas["failure_case"].tolist(), falhas["check"].tolist())],
+        planilha=aba,
+        linhas=[(indice + 2) if indice is not None else None for indice in falhas["index"].tolist()],
+        colunas=colunas.tolist(),
+        tipos=np.where(colunas.isin(CAMPOS_OPCIONAIS), "OPCIONAL", "OBRIGATORIO").tolist(),
+        severidades=np.where(colunas.isin(COLUNAS_OPCIONAIS), "AVISO", "CRÍTICO").tolist(),
+    )
+    return erros
+
+
+def _validar_schema(aba: str, leitura: LeituraAba, medidor=MEDIDOR_NULO) -> ColetorErros:
+    limites = validacao_blocos.limites_de_settings()
+    erros = _erros_de_falhas(aba, validacao_blocos.falhas_colunas_extras(leitura.colunas_extras))
+    with medidor.etapa("validacao_schema", aba):
+        if not limites.ativos:
+            erros.estender(_erros_de_falhas(aba, validacao_blocos.falhas_completas(SCHEMAS[aba], leitura.df)))
+            return erros
+        resultado = validacao_blocos.validar_com_limites(SCHEMAS[aba], leitura.df, limites)
+        erros.estender(_erros_de_falhas(aba, resultado.falhas))
+        erros.estender(_erros_de_limite(aba, limites, resultado))
+        return erros
+
+
+def _processar_aba(aba: str, leitura: LeituraAba, medidor=MEDIDOR_NULO) -> Tuple[pd.DataFrame, ColetorErros]:
+    """Normaliza e valida o schema de uma aba. Executado no processo principal ou num worker."""
+    leitura = _normalizar_aba(aba, leitura, medidor)
+    return leitura.df, _validar_schema(aba, leitura, medidor)
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _contexto_mp():
+    # forkserver evita fork() de um processo com threads (servidor web); indisponível no Windows
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+def _obter_executor(max_workers: int) -> ProcessPoolExecutor:
+    # Reaproveitado entre chamadas para não pagar a criação dos processos a cada arquivo
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=_contexto_mp())
+            _executor_workers = max_workers
+        return _executor
+
+
+def _ler_aba(file_bytes: bytes, aba: str, motor_leitura: str | None, medidor) -> LeituraAba:
+    with medidor.etapa("leitura", aba):
+        return ler_planilhas_tipadas(file_bytes, {aba: COLUNAS_ESPERADAS[aba]}, motor=motor_leitura)[aba]
+
+
+def _ler_e_processar_aba(file_bytes: bytes, aba: str, motor_leitura: str | None, medidor):
+    # Cada worker lê só a sua aba, então a leitura também é paralelizada.
+    # O medidor volta junto com o resultado para o processo principal incorporar.
+    try:
+        return _processar_aba(aba, _ler_aba(file_bytes, aba, motor_leitura, medidor), medidor), medidor
+    finally:
+        medidor.encerrar()
+
+
+def _ler_e_normalizar_aba(file_bytes: bytes, aba: str, motor_leitura: str | None, medidor):
+    try:
+        return _normalizar_aba(aba, _ler_aba(file_bytes, aba, motor_leitura, medidor), medidor), medidor
+    finally:
+        medidor.encerrar()
+
+
+@lru_cache(maxsize=None)
+def _schema_bloco(aba: str, ignorar: Tuple[str, ...] = ()) -> pa.DataFrameSchema:
+    return validacao_blocos.schema_sem_checks(validacao_blocos.schema_sem_unicidade(SCHEMAS[aba]), ignorar)
+
+
+def _validar_bloco(aba: str, bloco: pd.DataFrame, ignorar: Tuple[str, ...] = ()) -> pd.DataFrame | None:
+    return validacao_blocos.falhas(_schema_bloco(aba, ignorar), bloco)
+
+
+def _validar_em_blocos(executor: ProcessPoolExecutor, aba: str, leitura: LeituraAba, max_workers: int, medidor) -> ColetorErros:
+    """Valida blocos de linhas nos workers e a unicidade sobre a aba inteira no processo principal.
+
+    Com limites de erros os blocos vão aos workers em rodadas de ``max_workers``, e as
+    colunas (ou a aba) que esgotam o limite numa rodada não são avaliadas nas seguintes.
+    """
+    df = leitura.df
+    tamanho_minimo = int(settings.get("VALIDACAO_TAMANHO_MINIMO_BLOCO", TAMANHO_MINIMO_BLOCO))
+    n_blocos = validacao_blocos.numero_de_blocos(len(df), max_workers, tamanho_minimo)
+    if n_blocos <= 1:
+        return _validar_schema(aba, leitura, medidor)
+    limites = validacao_blocos.limites_de_settings()
+    erros = _erros_de_falhas(aba, validacao_blocos.falhas_colunas_extras(leitura.colunas_extras))
+    if limites.ativos:
+        def validar_rodada(blocos, ignorar):
+            futuros = [executor.submit(_validar_bloco, aba, bloco, ignorar) for bloco in blocos]
+            return [futuro.result() for futuro in futuros]
+
+        with medidor.etapa("validacao_schema_blocos", aba):
+            resultado = validacao_blocos.validar_com_limites(
+                SCHEMAS[aba], df, limites, tamanho_bloco=tamanho_minimo,
+                validar_blocos=validar_rodada, blocos_por_rodada=max_workers,
+            )
+        erros.estender(_erros_de_falhas(aba, resultado.falhas))
+        erros.estender(_erros_de_limite(aba, limites, resultado))
+        return erros
+    with medidor.etapa("validacao_schema_blocos", aba):
+        futuros = [executor.submit(_validar_bloco, aba, bloco) for bloco in validacao_blocos.dividir(df, n_blocos)]
+        unicidade = validacao_blocos.falhas_unicidade(SCHEMAS[aba], df)
+        falhas_blocos = [futuro.result() for futuro in futuros]
+    if validacao_blocos.tem_falha_de_tabela(falhas_blocos):
+        logger.info(f"{aba}: falha de coluna inteira em algum bloco, validando a aba sem dividir")
+        return _validar_schema(aba, leitura, medidor)
+    erros.estender(_erros_de_falhas(aba, validacao_blocos.combinar([unicidade, *falhas_blocos])))
+    return erros
+
+
+def _processar_abas(file_bytes: bytes, motor_leitura: str | None, max_workers: int, medidor) -> Dict[str, Tuple[pd.DataFrame, ColetorErros]]:
+    abas = list(SCHEMAS)
+    if max_workers <= 1:
+        with medidor.etapa("leitura"):
+            leituras = ler_planilhas_tipadas(file_bytes, {aba: COLUNAS_ESPERADAS[aba] for aba in abas}, motor=motor_leitura)
+        return {aba: _processar_aba(aba, leitura, medidor) for aba, leitura in leituras.items()}
+    executor = _obter_executor(max_workers)
+    futuros = {
+        aba: executor.submit(_ler_e_normalizar_aba if aba in ABAS_EM_BLOCOS else _ler_e_processar_aba, file_bytes, aba, motor_leitura, medidor.novo())
+        for aba in abas
+    }
+    # Resultados recolhidos na ordem de SCHEMAS, então a saída é determinística
+    resultados = {}
+    for aba, futuro in futuros.items():
+        resultado, medidor_worker = futuro.result()
+        medidor.incorporar(medidor_worker)
+        if aba in ABAS_EM_BLOCOS:
+            resultados[aba] = (resultado.df, _validar_em_blocos(executor, aba, resultado, max_workers, medidor))
+        else:
+            resultados[aba] = resultado
+    return resultados
+
+
+def _validar(file_bytes: bytes, motor_leitura: str | None, max_workers: int = 1, medidor=MEDIDOR_NULO) -> Tuple[Dict[str, pd.DataFrame], ColetorErros, Dict]:
+    erros = ColetorErros()
+
+    # Leitura, normalização base e validação de schema completa, por aba
+    resultados = _processar_abas(file_bytes, motor_leitura, max_workers, medidor)
+    df_dict = {aba: df for aba, (df, _) in resultados.items()}
 
     # Regras de integridade
-    if "Setores" in df_dict:
-        if "Modelo F" in df_dict and "cod_setor" in df_dict["Modelo F"].columns:
-            _integridade("Modelo F", "Setores", "cod_setor", "cod_setor", df_dict, erros)
-        if "Cargos" in df_dict and "cod_setor" in df_dict["Cargos"].columns:
-            _integridade("Cargos", "Setores", "cod_setor", "cod_setor", df_dict, erros)
-    if "Cargos" in df_dict and "Modelo F" in df_dict and "cod_cargo" in df_dict["Modelo F"].columns:
-        _integridade("Modelo F", "Cargos", "cod_cargo", "cod_cargo", df_dict, erros)
-
-    # Validação de schema completa
-    for aba, df in df_dict.items():
-        schema = SCHEMAS[aba]
-        try:
-            schema.validate(df, lazy=True)
-        except pa.errors.SchemaErrors as e:
-            for error in e.failure_cases.itertuples():
-                linha_excel = (error.index + 2) if error.index is not None else None
-                msg = f"{error.failure_case}, {error.check}"
-                codigo = mapear_codigo_erro_pandera(msg, error.column)
-                tipo = "OPCIONAL" if error.column in CAMPOS_OPCIONAIS else "OBRIGATORIO"
-                _add_erro(erros, codigo, obter_descricao_codigo(codigo), msg, aba, linha_excel, error.column, tipo)
-        normalized[aba] = df.copy()
+    limites = validacao_blocos.limites_de_settings()
+    with medidor.etapa("integridade"):
+        for relacao in RELACOES:
+            _integridade(relacao, df_dict, erros, limites)
+
+    for _, erros_aba in resultados.values():
+        erros.estender(erros_aba)
+    omitidos = erros.truncar(limites.total)
+    if omitidos:
+        _erro_limite(erros, f"Limite de {limites.total} erros do arquivo atingido: {omitidos} erros omitidos", None, None)
+    normalized = {aba: df.copy() for aba, df in df_dict.items()}
 
     # Estatísticas
-    if erros:
-        severidade = pd.Series([e["severidade"] for e in erros]).value_counts().to_dict()
-        tipos = pd.Series([e["tipo"] for e in erros]).value_counts().to_dict()
-    else:
-        severidade, tipos = {}, {}
+    with medidor.etapa("estatisticas"):
+        severidade, tipos = erros.contagens()
 
     stats = {
         "total_erros": len(erros),
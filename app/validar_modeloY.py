@@ -1,50 +1,29 @@
 import pandas as pd
 import numpy as np
-import pandera.pandas as pa
 import sys
 import os
 
 from janitor import clean_names
 from core.schemas import metricas_setores, metricas_cargos, metricas_empresas, metricas_funcionarios
-from core.util import tratar_caracteres, validar_sexo, normalizar_coluna_cep, verificar_integridade, settings
-from core.codigos_erro import mapear_codigo_erro, mapear_codigo_erro_pandera, obter_descricao_codigo, eh_campo_opcional
+from core.util import normalizar_textos, validar_sexo, normalizar_coluna_cep, verificar_integridade, settings
+from core.codigos_erro import TabelaCodigos, mapear_codigo_erro, eh_campo_opcional
+from core.coletor_erros import ColetorErros
+from core.validacao_blocos import validar_progressivamente
 
 
 def adicionar_erro_relatorio(lista, mensagem, planilha, linha, coluna, tipo):
     nullable = eh_campo_opcional(coluna)
     codigo_erro = mapear_codigo_erro(mensagem, coluna, nullable)
-    descricao_codigo = obter_descricao_codigo(codigo_erro)
     
-    erro = {
-        "codigoERRO": codigo_erro,
-        "Descrição do Código": descricao_codigo,
-        "Mensagem Detalhada": mensagem,
-        "planilha": planilha,
-        "linha": linha,
-        "coluna": coluna,
-        "tipo": tipo,
-        "severidade": "CRÍTICO" if not nullable else "AVISO"
-    }
-    lista.append(erro)
-
-
-def adicionar_erro_schema(lista, mensagem, planilha, linha, coluna, tipo):
-    """Função específica para erros de validação de schema (pandera)"""
-    codigo_erro = mapear_codigo_erro_pandera(mensagem, coluna)
-    descricao_codigo = obter_descricao_codigo(codigo_erro)
+    lista.adicionar(codigo_erro, mensagem, planilha, linha, coluna, tipo, "CRÍTICO" if not nullable else "AVISO")
+
+
+def adicionar_erro_schema(lista, mensagem, planilha, linha, coluna, tipo, check):
+    """Função específica para erros de validação de schema (pandera); o código vem do (check, coluna)"""
+    codigo_erro = tabela_codigos.codigo(str(check), coluna)
     nullable = eh_campo_opcional(coluna)
     
-    erro = {
-        "codigoERRO": codigo_erro,
-        "Descrição do Código": descricao_codigo,
-        "Mensagem Detalhada": mensagem,
-        "planilha": planilha,
-        "linha": linha,
-        "coluna": coluna,
-        "tipo": tipo,
-        "severidade": "CRÍTICO" if not nullable else "AVISO"
-    }
-    lista.append(erro)
+    lista.adicionar(codigo_erro, mensagem, planilha, linha, coluna, tipo, "CRÍTICO" if not nullable else "AVISO")
 
 
 def print_sucesso(msg):
@@ -75,6 +54,7 @@ schemas = {
     "Cargos": metricas_cargos,
     "Modelo F": metricas_funcionarios
 }
+tabela_codigos = TabelaCodigos(schemas)
 
 
 CAMPOS_OPCIONAIS = [
@@ -105,12 +85,12 @@ def validar_planilha(dir_arquivos: str):
     
     # Normaliza nomes das colunas em todas as abas PRIMEIRO
     for aba_nome, aba_df in df_dict.items():
-        aba_df = aba_df.applymap(tratar_caracteres)
+        aba_df = normalizar_textos(aba_df)
         df_dict[aba_nome] = clean_names(aba_df, case_type="snake")
     
     normalized_dfs = {}
     todas_abas_validas = True
-    lista = []  # Lista para coletar todos os erros
+    lista = ColetorErros(sem_linha="N/A")  # Coletor de todos os erros; "N/A" = erro sem linha
 
     for aba, df in df_dict.items():
         df = df.replace({np.nan: None})
@@ -239,102 +219,66 @@ def validar_planilha(dir_arquivos: str):
 
         normalized_dfs[aba] = df.copy()
 
-        sample_size = max(1, int(len(df) * 0.10))
-        sample_df = df.sample(n=sample_size, random_state=42)
-
-        print_info(f"Amostra usada para validação (10% = {len(sample_df)} linhas)")
-
         schema = schemas[aba]
 
         aba_valida = True
-        
-        # Validação da amostra
-        try:
-            schema.validate(sample_df, lazy=True)
-        except pa.errors.SchemaErrors as e:
-            print_erro("Erros de validação encontrados na amostra:")
-            aviso_opcional = []
-            erro_critico = False
-            erros_criticos = []
-            
-            for error in e.failure_cases.itertuples():
-                linha_excel = (error.index + 2) if error.index is not None else "N/A"
-                mensagem_erro = f"{error.failure_case}, {error.check}"
-                
-                if error.column in CAMPOS_OPCIONAIS:
-                    adicionar_erro_schema(lista, mensagem_erro, aba, linha_excel, error.column, "OPCIONAL")
-                    aviso_opcional.append(
-                        f"  - Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}"
-                    )
-                    continue
-                
-                adicionar_erro_schema(lista, mensagem_erro, aba, linha_excel, error.column, "OBRIGATORIO")
-                erros_criticos.append(
-                    f"  - Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}"
-                )
-                erro_critico = True
-            
-            if erros_criticos:
-                print("\n  Erros críticos na amostra:")
-                for erro in erros_criticos:
-                    print(erro)
-            
-            if aviso_opcional:
-                print("\n  Campos opcionais com problemas na amostra:")
-                for aviso in aviso_opcional:
-                    print(aviso)
-            
-            if erro_critico:
-                aba_valida = False
-                todas_abas_validas = False
-                continue
 
-        # Validação completa
+        # Validação única, em blocos de linhas, parando após VALIDACAO_MAX_ERROS_CRITICOS erros críticos
         try:
-            schema.validate(df, lazy=True)
+            resultado = validar_progressivamente(schema, df, CAMPOS_OPCIONAIS)
+        except Exception as e:
+            print_erro(f"Erro inesperado: {e}")
+            aba_valida = False
+            todas_abas_validas = False
+            continue
+
+        if resultado.interrompida:
+            print_aviso(
+                f"Validação interrompida pelo limite de erros críticos "
+                f"({resultado.linhas_validadas} de {len(df)} linhas validadas)"
+            )
+
+        if resultado.falhas is None:
             print_sucesso("Planilha válida!")
-        except pa.errors.SchemaErrors as e:
-            print_erro("Erros de validação encontrados no arquivo completo:")
-            aviso_opcional = []
-            erro_critico = False
-            erros_criticos = []
+            continue
+
+        print_erro("Erros de validação encontrados:")
+        aviso_opcional = []
+        erro_critico = False
+        erros_criticos = []
+        
+        for error in resultado.falhas.itertuples():
+            linha_excel = (error.index + 2) if error.index is not None else "N/A"
+            mensagem_erro = f"{error.failure_case}, {error.check}"
             
-            for error in e.failure_cases.itertuples():
-                linha_excel = (error.index + 2) if error.index is not None else "N/A"
-                mensagem_erro = f"{error.failure_case}, {error.check}"
-                
-                if error.column in CAMPOS_OPCIONAIS:
-                    adicionar_erro_schema(lista, mensagem_erro, aba, linha_excel, error.column, "OPCIONAL")
-                    aviso_opcional.append(
-                        f"  - Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}"
-                    )
-                    continue
-                
-                adicionar_erro_schema(lista, mensagem_erro, aba, linha_excel, error.column, "OBRIGATORIO")
-                erros_criticos.append(
+            if error.column in CAMPOS_OPCIONAIS:
+                adicionar_erro_schema(lista, mensagem_erro, aba, linha_excel, error.column, "OPCIONAL", error.check)
+                aviso_opcional.append(
                     f"  - Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}"
                 )
-                erro_critico = True
-            
-            if erros_criticos:
-                print("\n  Erros críticos no arquivo completo:")
-                for erro in erros_criticos:
-                    print(erro)
-            
-            if aviso_opcional:
-                print("\n  Campos opcionais com problemas:")
-                for aviso in aviso_opcional:
-                    print(aviso)
+                continue
             
-            if erro_critico:
-                aba_valida = False
-                todas_abas_validas = False
-            else:
-                print_sucesso("Planilha válida! (apenas campos opcionais com problemas)")
-        except Exception as e:
-            print_erro(f"Erro inesperado: {e}")
+            adicionar_erro_schema(lista, mensagem_erro, aba, linha_excel, error.column, "OBRIGATORIO", error.check)
+            erros_criticos.append(
+                f"  - Linha: {linha_excel}, Coluna: {error.column}, Erro: {error.failure_case}, {error.check}"
+            )
+            erro_critico = True
+        
+        if erros_criticos:
+            print("\n  Erros críticos:")
+            for erro in erros_criticos:
+                print(erro)
+        
+        if aviso_opcional:
+            print("\n  Campos opcionais com problemas:")
+            for aviso in aviso_opcional:
+                print(aviso)
+        
+        if erro_critico:
             aba_valida = False
             todas_abas_validas = False
+        else:
+            print_sucesso("Planilha válida! (apenas campos opcionais com problemas)")
 
     return normalized_dfs, lista, todas_abas_validas
 
@@ -345,7 +289,7 @@ def salvar_relatorio_erros(lista, dir_saida="data"):
         print_info("Nenhum erro encontrado para gerar relatório.")
         return None
     
-    df_relatorio = pd.DataFrame(lista)
+    df_relatorio = lista.para_dataframe()
     nome_arquivo = f"{dir_saida}/relatorio_erros_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.xlsx"
     df_relatorio.to_excel(nome_arquivo, index=False, sheet_name="Relatório_Erros")
     print_sucesso(f"Relatório de erros salvo em: {nome_arquivo}")
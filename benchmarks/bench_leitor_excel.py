@@ -0,0 +1,85 @@
+"""Compara tempo de leitura e pico de memória dos motores do leitor de planilhas.
+
+Uso:
+    python benchmarks/bench_leitor_excel.py [arquivo.xlsx] [--repeticoes N] [--tipada]
+
+Com ``--tipada`` mede ``ler_planilhas_tipadas`` com as colunas dos schemas (a leitura
+usada pela validação) em vez de ``ler_planilhas``.
+
+Cada motor roda em um processo novo para que o pico de RSS de um não contamine o outro.
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+ARQUIVO_PADRAO = os.path.join("data", "Modelo Y - Oficial_CALI_20250820.xlsx")
+ABAS = ["Setores", "Empresas", "Cargos", "Modelo F"]
+
+
+def _medir(motor: str, caminho: str, tipada: bool, fila):
+    from app.core.leitor_excel import ler_planilhas, ler_planilhas_tipadas
+
+    if tipada:
+        from app.core.validator_service import COLUNAS_ESPERADAS
+
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    rss_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    if tipada:
+        dfs = {aba: leitura.df for aba, leitura in ler_planilhas_tipadas(conteudo, COLUNAS_ESPERADAS, motor=motor).items()}
+    else:
+        dfs = ler_planilhas(conteudo, ABAS, motor=motor)
+    duracao = time.perf_counter() - inicio
+    _, pico_py = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_final = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    fila.put({
+        "motor": motor,
+        "segundos": duracao,
+        "pico_tracemalloc_mb": pico_py / 1024 / 1024,
+        # ru_maxrss é em KB no Linux
+        "pico_rss_delta_mb": (rss_final - rss_inicial) / 1024,
+        "linhas": sum(len(df) for df in dfs.values()),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("arquivo", nargs="?", default=ARQUIVO_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--motores", nargs="+", default=["pandas", "streaming"])
+    parser.add_argument("--tipada", action="store_true", help="mede ler_planilhas_tipadas (colunas dos schemas)")
+    args = parser.parse_args()
+
+    ctx = get_context("spawn")
+    resultados = []
+    for motor in args.motores:
+        for _ in range(args.repeticoes):
+            fila = ctx.Queue()
+            proc = ctx.Process(target=_medir, args=(motor, args.arquivo, args.tipada, fila))
+            proc.start()
+            resultados.append(fila.get())
+            proc.join()
+
+    print(f"Arquivo: {args.arquivo}{' (leitura tipada)' if args.tipada else ''}")
+    print(f"{'motor':<12}{'linhas':>10}{'tempo (s)':>12}{'tracemalloc (MB)':>18}{'RSS delta (MB)':>16}")
+    for motor in args.motores:
+        runs = [r for r in resultados if r["motor"] == motor]
+        melhor = min(runs, key=lambda r: r["segundos"])
+        print(
+            f"{motor:<12}{melhor['linhas']:>10}{melhor['segundos']:>12.3f}"
+            f"{max(r['pico_tracemalloc_mb'] for r in runs):>18.1f}"
+            f"{max(r['pico_rss_delta_mb'] for r in runs):>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Perfila os Checks Pandera dos schemas validando um arquivo Excel.
+
+Uso:
+    python benchmarks/perfil_checks.py [arquivo.xlsx] [--ordenar tempo_s|chamadas|linhas|linhas_por_s] [--limite N] [--json saida.json]
+
+A validação roda sem cache e num único processo para que todos os checks sejam medidos.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+ARQUIVO_PADRAO = os.path.join("data", "Modelo Y - Oficial_CALI_20250820.xlsx")
+
+
+def main():
+    from app.core.perfil_checks import perfilar_checks
+    from app.core.validator_service import SCHEMAS, validar_arquivo_excel
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("arquivo", nargs="?", default=ARQUIVO_PADRAO)
+    parser.add_argument("--ordenar", default="tempo_s", choices=["tempo_s", "chamadas", "linhas", "linhas_por_s"])
+    parser.add_argument("--limite", type=int, default=None)
+    parser.add_argument("--json", dest="saida_json", default=None)
+    args = parser.parse_args()
+
+    with open(args.arquivo, "rb") as f:
+        conteudo = f.read()
+    with perfilar_checks(SCHEMAS) as perfil:
+        validar_arquivo_excel(conteudo, usar_cache=False, max_workers=1)
+
+    print(perfil.relatorio(args.ordenar, args.limite))
+    if args.saida_json:
+        with open(args.saida_json, "w", encoding="utf-8") as f:
+            f.write(perfil.to_json(args.ordenar))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import io
+import pytest
+from openpyxl import Workbook
+
+
+@pytest.fixture(scope="session")
+def planilha_modelo():
+    """Bytes de um .xlsx com as abas dos schemas e alguns erros conhecidos (código, CPF, duplicatas)."""
+    from app.core import validator_service
+
+    wb = Workbook()
+    wb.remove(wb.active)
+    for aba, schema in validator_service.SCHEMAS.items():
+        wb.create_sheet(aba).append(list(schema.columns))
+    wb["Setores"].append(["1.01", "Administração", "12.345.678/0001-90"])
+    wb["Setores"].append(["X", "", "123"])
+    wb["Cargos"].append([1, None, "Analista", None])
+    wb["Cargos"].append([-2, None, "Gerente", None])
+    colunas_f = list(validator_service.SCHEMAS["Modelo F"].columns)
+    for cod, cpf in [(1, "111.111.111-11"), (2, "222"), (3, "111.111.111-11"), (1, "444.444.444-44")]:
+        linha = dict.fromkeys(colunas_f)
+        linha.update(cod_funcionario=cod, cpf=cpf, cod_setor="1.01", cod_cargo="1")
+        wb["Modelo F"].append(list(linha.values()))
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def armazenamento_local(tmp_path, monkeypatch):
+    """Backend local em ``tmp_path/storage``, com um cache de downloads só do teste."""
+    from app.core import storage_service
+    from app.core.cache_disco import CacheDisco
+
+    cache = CacheDisco(tmp_path / "cache", 1 << 20)
+    monkeypatch.setattr(storage_service, "download_cache", lambda: cache)
+    storage_service.set_storage(storage_service.LocalBackend(tmp_path / "storage"))
+    yield tmp_path / "storage"
+    storage_service.set_storage(None)
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pandas as pd
+import pytest
+from app.core import artefato_normalizado, storage_service
+from app.core.schemas import TEXTO
+
+
+def _abas():
+    funcionarios = pd.DataFrame({
+        "cpf": pd.array(["00011122233", None, "44455566677"], dtype=TEXTO),
+        "sexo": pd.Categorical(pd.array(["F", "M", "F"], dtype=TEXTO)),
+        "cod_empresa": pd.array([1, None, 3], dtype="Int64"),
+        "dt_nascimento": pd.to_datetime(["1990-01-02", None, "1985-12-31"]),
+    })
+    setores = pd.DataFrame({"cod_setor": pd.array(["01", "02"], dtype=TEXTO)})
+    return {"Setores": setores, "Modelo F": funcionarios}
+
+
+def test_ida_e_volta_preserva_tipos(armazenamento_local):
+    abas = _abas()
+    chaves = artefato_normalizado.publicar_normalizado("abc", abas)
+    prefixo = storage_service.normalized_dataset_prefix_for("abc")
+    assert chaves == [f"{prefixo}/0.parquet", f"{prefixo}/1.parquet", f"{prefixo}/abas.json"]
+    lidas = artefato_normalizado.ler_normalizado("abc")
+    assert list(lidas) == ["Setores", "Modelo F"]
+    for aba, df in abas.items():
+        pd.testing.assert_frame_equal(lidas[aba], df)
+    assert isinstance(lidas["Modelo F"]["sexo"].cat.categories.dtype, pd.StringDtype)
+
+
+def test_leitura_restrita_a_abas_e_colunas(armazenamento_local):
+    artefato_normalizado.publicar_normalizado("abc", _abas())
+    lidas = artefato_normalizado.ler_normalizado("abc", {"Modelo F": ["cpf", "cod_empresa", "fora_do_arquivo"]})
+    assert list(lidas) == ["Modelo F"]
+    assert list(lidas["Modelo F"].columns) == ["cpf", "cod_empresa"]
+    with pytest.raises(FileNotFoundError):
+        artefato_normalizado.ler_normalizado("inexistente")
+
+
+def test_coluna_com_tipos_misturados_vai_como_texto(armazenamento_local):
+    artefato_normalizado.publicar_normalizado("abc", {"Cargos": pd.DataFrame({"cod_cbo": [1, "x", None]})})
+    serie = artefato_normalizado.ler_normalizado("abc")["Cargos"]["cod_cbo"]
+    assert serie.dtype == TEXTO and serie.tolist()[:2] == ["1", "x"] and serie.isna().tolist()[2]
+
+
+def test_planilha_normalizada_publica_xlsx_e_parquet(armazenamento_local):
+    abas = _abas()
+    chaves = artefato_normalizado.publicar_planilha_normalizada("abc", "Modelo Y.xlsx", abas)
+    chave_xlsx = storage_service.normalized_key_for("abc", "Modelo Y")
+    assert chaves[-1] == chave_xlsx
+    with storage_service.open_object(chave_xlsx) as arquivo:
+        assert list(pd.read_excel(arquivo, sheet_name=None)) == ["Setores", "Modelo F"]
+    assert list(artefato_normalizado.ler_normalizado("abc")) == ["Setores", "Modelo F"]
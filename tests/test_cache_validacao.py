@@ -0,0 +1,92 @@
+import sys
+import os
+import stat
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pandas as pd
+import pandera.pandas as pa
+import pytest
+from app.core import cache_validacao, validacao_blocos, validator_service
+from app.core.cache_disco import CacheDisco
+
+
+def _gravar(cache, chave, tamanho, instante):
+    with cache.gravar(chave) as destino:
+        (destino / "dados").write_bytes(b"x" * tamanho)
+    os.utime(cache.caminho(chave), (instante, instante))
+
+
+def test_cache_disco_despeja_menos_usadas(tmp_path):
+    cache = CacheDisco(tmp_path, tamanho_maximo=250)
+    _gravar(cache, "a", 100, 1)
+    _gravar(cache, "b", 100, 2)
+    os.utime(cache.caminho("a"), (3, 3))  # "a" usada mais recentemente que "b"
+    _gravar(cache, "c", 100, 4)
+    assert cache.obter("b") is None
+    assert cache.obter("a") is not None and cache.obter("c") is not None
+
+
+def test_fingerprint_muda_quando_regra_muda():
+    def schema(limite):
+        return {"Cargos": pa.DataFrameSchema({"cod_cargo": pa.Column(int, pa.Check(lambda s: s > limite))})}
+
+    base = cache_validacao.fingerprint_schemas(schema(0), {"cod_cbo"})
+    assert base == cache_validacao.fingerprint_schemas(schema(0), {"cod_cbo"})
+    assert base != cache_validacao.fingerprint_schemas(
+        {"Cargos": pa.DataFrameSchema({"cod_cargo": pa.Column(int, pa.Check(lambda s: s >= 0))})}, {"cod_cbo"}
+    )
+    assert base != cache_validacao.fingerprint_schemas(schema(0), {"cod_cbo", "telefone"})
+
+
+def test_fingerprint_enxerga_valores_capturados_em_closures():
+    def schema(limite):
+        return {"Cargos": pa.DataFrameSchema({"cod_cargo": pa.Column(int, pa.Check(lambda s: s > limite))})}
+
+    assert cache_validacao.fingerprint_schemas(schema(0), set()) != cache_validacao.fingerprint_schemas(schema(1), set())
+
+
+def test_fingerprint_enxerga_o_fonte_dos_modulos_usados_pelos_checks(monkeypatch):
+    base = cache_validacao.fingerprint_schemas(validator_service.SCHEMAS, set())
+    hash_real = cache_validacao._hash_fonte
+    for modulo in ("app.core.derivadas", "app.core.documentos"):
+        monkeypatch.setattr(cache_validacao, "_hash_fonte", lambda nome: "outro" if nome == modulo else hash_real(nome))
+        assert cache_validacao.fingerprint_schemas(validator_service.SCHEMAS, set()) != base
+
+
+def test_diretorio_privado(tmp_path):
+    diretorio = cache_validacao.diretorio_privado(tmp_path / "cache" / "validacao")
+    assert stat.S_IMODE(diretorio.stat().st_mode) == 0o700
+    compartilhado = tmp_path / "compartilhado"
+    compartilhado.mkdir()
+    compartilhado.chmod(0o777)
+    with pytest.raises(PermissionError):
+        cache_validacao.diretorio_privado(compartilhado)
+
+
+def test_fingerprint_muda_com_os_limites_de_erros():
+    schemas = {"Cargos": pa.DataFrameSchema({"cod_cargo": pa.Column(int)})}
+    base = cache_validacao.fingerprint_schemas(schemas, set(), validacao_blocos.LimitesErros(10, 50, 100))
+    assert base == cache_validacao.fingerprint_schemas(schemas, set(), validacao_blocos.LimitesErros(10, 50, 100))
+    assert base != cache_validacao.fingerprint_schemas(schemas, set(), validacao_blocos.LimitesErros(20, 50, 100))
+    assert base != cache_validacao.fingerprint_schemas(schemas, set(), validacao_blocos.LimitesErros())
+
+
+def test_validar_arquivo_excel_reaproveita_cache(tmp_path, monkeypatch, planilha_modelo):
+    monkeypatch.setattr(cache_validacao, "obter_cache", lambda: CacheDisco(tmp_path, 1 << 20))
+    conteudo = planilha_modelo
+    normalized, erros, stats = validator_service.validar_arquivo_excel(conteudo)
+
+    def _nao_deve_validar(*args):
+        pytest.fail("validação repetida deveria vir do cache")
+
+    entrada = next(p for p in tmp_path.iterdir() if not p.name.startswith("."))
+    assert sorted(p.suffix for p in entrada.iterdir()) == [".json"] + [".parquet"] * len(normalized)
+
+    monkeypatch.setattr(validator_service, "_validar", _nao_deve_validar)
+    normalized_cache, erros_cache, stats_cache = validator_service.validar_arquivo_excel(conteudo)
+    etapas = {t["etapa"] for t in stats_cache.pop("timings")}
+    assert "cache_leitura" in etapas and "validacao_schema" not in etapas
+    stats.pop("timings")
+    assert erros_cache == erros and stats_cache == stats
+    assert list(normalized_cache) == list(normalized)
+    for aba in normalized:
+        pd.testing.assert_frame_equal(normalized_cache[aba], normalized[aba])
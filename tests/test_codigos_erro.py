@@ -0,0 +1,33 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pandas as pd
+import pandera.pandas as pa
+from app.core.codigos_erro import TabelaCodigos, mapear_codigo_erro_pandera
+
+SCHEMAS = {
+    "Modelo F": pa.DataFrameSchema({
+        "cpf": pa.Column(pa.String, pa.Check.str_matches(r"^\d{3}$", error="CPF deve estar no formato XXX"), unique=True),
+        "cep": pa.Column(pa.String, pa.Check(lambda s: s.str.len() <= 10, error="CEP deve ter até 10 caracteres"), nullable=True),
+    })
+}
+
+
+def test_tabela_resolve_checks_dos_schemas():
+    tabela = TabelaCodigos(SCHEMAS)
+    assert tabela.codigo("CPF deve estar no formato XXX", "cpf") == "202"
+    assert tabela.codigo("field_uniqueness", "cpf") == "601"
+    assert tabela.codigo("CEP deve ter até 10 caracteres", "cep") == "502"
+    # Check fora da tabela cai no mapeamento por mensagem
+    assert tabela.codigo("Data deve ser anterior a data atual", "dt_admissao") == mapear_codigo_erro_pandera("Data deve ser anterior a data atual", "dt_admissao")
+
+
+def test_codigos_vetorizados_nao_dependem_do_valor():
+    tabela = TabelaCodigos(SCHEMAS)
+    falhas = pd.DataFrame({
+        "failure_case": ["HELENA", "123", "x", None],
+        "check": ["CPF deve estar no formato XXX", "CPF deve estar no formato XXX", "CEP deve ter até 10 caracteres", "column_in_dataframe"],
+        "column": ["cpf", "cpf", "cep", None],
+    })
+    codigos = tabela.codigos(falhas["check"], falhas["column"])
+    assert codigos.tolist() == ["202", "202", "502", mapear_codigo_erro_pandera("column_in_dataframe", None)]
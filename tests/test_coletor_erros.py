@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pickle
+import pandas as pd
+from app.core.coletor_erros import COLUNAS_RELATORIO, ColetorErros
+from app.core.codigos_erro import obter_descricao_codigo
+
+
+def _erro(codigo, msg, planilha, linha, coluna, tipo, severidade):
+    return {
+        "codigoERRO": codigo, "Descrição do Código": obter_descricao_codigo(codigo), "Mensagem Detalhada": msg,
+        "planilha": planilha, "linha": linha, "coluna": coluna, "tipo": tipo, "severidade": severidade,
+    }
+
+
+ERROS = [
+    _erro("602", "Valor 9 inexistente em Setores.cod_setor", "Modelo F", 5, "cod_setor", "INTEGRIDADE_REFERENCIAL", "CRÍTICO"),
+    _erro("202", "x, CPF inválido", "Modelo F", 7, "cpf", "OBRIGATORIO", "CRÍTICO"),
+    _erro("502", "abc, CEP deve ter até 10 caracteres", "Modelo F", None, "cep", "OPCIONAL", "AVISO"),
+    _erro("999", "sem código", None, None, None, "LIMITE_ERROS", "CRÍTICO"),
+]
+
+
+def _coletor(erros):
+    coletor = ColetorErros()
+    for e in erros:
+        coletor.adicionar(e["codigoERRO"], e["Mensagem Detalhada"], e["planilha"], e["linha"], e["coluna"], e["tipo"], e["severidade"])
+    return coletor
+
+
+def test_coletor_se_comporta_como_lista_de_dicts():
+    coletor = _coletor(ERROS)
+    assert len(coletor) == 4 and coletor == ERROS and list(coletor) == ERROS
+    assert coletor[-1] == ERROS[-1] and coletor[1:3] == ERROS[1:3]
+    assert pickle.loads(pickle.dumps(coletor)) == coletor
+
+
+def test_lote_estender_e_truncar():
+    coletor = _coletor(ERROS[:1])
+    lote = ColetorErros()
+    lote.adicionar_lote(
+        codigos=["202", "502"], mensagens=[ERROS[1]["Mensagem Detalhada"], ERROS[2]["Mensagem Detalhada"]],
+        planilha="Modelo F", linhas=[7, None], colunas=["cpf", "cep"], tipos=["OBRIGATORIO", "OPCIONAL"],
+        severidades=["CRÍTICO", "AVISO"],
+    )
+    coletor.estender(lote)
+    coletor.estender(_coletor(ERROS[3:]))
+    assert coletor == ERROS
+    assert coletor.contagens() == ({"CRÍTICO": 3, "AVISO": 1}, {"INTEGRIDADE_REFERENCIAL": 1, "OBRIGATORIO": 1, "OPCIONAL": 1, "LIMITE_ERROS": 1})
+    assert coletor.truncar(2) == 2 and coletor == ERROS[:2]
+    assert coletor.contagens() == ({"CRÍTICO": 2}, {"INTEGRIDADE_REFERENCIAL": 1, "OBRIGATORIO": 1})
+
+
+def test_para_dataframe_igual_ao_dataframe_da_lista():
+    relatorio = _coletor(ERROS).para_dataframe()
+    assert list(relatorio.columns) == COLUNAS_RELATORIO
+    assert isinstance(relatorio["coluna"].dtype, pd.CategoricalDtype)
+    esperado = pd.DataFrame(ERROS).astype(object)
+    obtido = relatorio.astype(object)
+    pd.testing.assert_frame_equal(obtido.where(obtido.notna(), None), esperado.where(esperado.notna(), None))
+    assert ColetorErros().para_dataframe().empty
+
+
+def test_marcador_sem_linha_volta_no_relatorio():
+    coletor = ColetorErros(sem_linha="N/A")
+    coletor.adicionar("202", "x, CPF inválido", "Modelo F", 7, "cpf", "OBRIGATORIO", "CRÍTICO")
+    coletor.adicionar("301", "coluna ausente", "Modelo F", "N/A", "cpf", "OBRIGATORIO", "CRÍTICO")
+    coletor.adicionar_lote(["202"], ["y, CPF inválido"], "Modelo F", ["N/A"], ["cpf"], ["OBRIGATORIO"], ["CRÍTICO"])
+    assert [e["linha"] for e in coletor] == [7, "N/A", "N/A"]
+    assert coletor.para_dataframe()["linha"].tolist() == [7, "N/A", "N/A"]
+    assert ColetorErros.de_colunas(coletor.para_colunas()) == coletor
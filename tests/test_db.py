@@ -0,0 +1,172 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from contextlib import contextmanager
+import pandas as pd
+import pytest
+from psycopg.pq import TransactionStatus
+from app.core.db import Operator, DatabaseType
+
+
+@pytest.fixture
+def operador(tmp_path):
+    op = Operator(table="stg_funcionarios", db_type=DatabaseType.SQLITE, database=str(tmp_path / "local.db"))
+    op.conn.execute("CREATE TABLE stg_funcionarios (cod_funcionario INTEGER PRIMARY KEY, nome TEXT NOT NULL, dt_admissao TIMESTAMP)")
+    op.conn.commit()
+    return op
+
+
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_bulk_insert_isola_linhas_rejeitadas(operador):
+    df = pd.DataFrame({
+        "cod_funcionario": [1, 2, 3, 2, 5],
+        "nome": ["Ana", "Bruno", None, "Carla", "Davi"],
+        "dt_admissao": pd.to_datetime(["2020-01-01", None, "2020-01-02", "2020-01-03", "2020-01-04"]),
+    })
+    operador.bulk_insert(df, batch_size=2)
+
+    assert operador.last_stats == {"inserted": 3, "rejected": 2, "failed_batches": 1, "total": 5}
+    linhas = operador.conn.execute("SELECT cod_funcionario, nome FROM stg_funcionarios ORDER BY 1").fetchall()
+    assert linhas == [(1, "Ana"), (2, "Bruno"), (5, "Davi")]
+
+
+def test_bulk_insert_sem_registros(operador):
+    with pytest.raises(ValueError):
+        operador.bulk_insert(pd.DataFrame())
+
+
+def test_insert_sqlite_sobrevive_a_devolucao_ao_pool(operador, tmp_path):
+    with operador:
+        operador.insert([{"cod_funcionario": 1, "nome": "Ana"}, {"cod_funcionario": 2, "nome": "Bruno"}])
+        # Outra conexão do pool (a primeira ainda está emprestada) já enxerga as linhas
+        with Operator(table="stg_funcionarios", db_type=DatabaseType.SQLITE, database=str(tmp_path / "local.db")) as outro:
+            assert outro.conn is not operador.conn
+            assert outro.conn.execute("SELECT count(*) FROM stg_funcionarios").fetchone()[0] == 2
+    with Operator(table="stg_funcionarios", db_type=DatabaseType.SQLITE, database=str(tmp_path / "local.db")) as outro:
+        assert outro.conn.execute("SELECT nome FROM stg_funcionarios ORDER BY 1").fetchall() == [("Ana",), ("Bruno",)]
+
+
+def test_bulk_upsert_insere_atualiza_e_ignora_iguais(tmp_path):
+    op = Operator(table="cargos", db_type=DatabaseType.SQLITE, database=str(tmp_path / "local.db"), key_field="cod_cargo")
+    op.conn.execute("CREATE TABLE cargos (cod_cargo INTEGER PRIMARY KEY, nome_cargo TEXT, updated_at TIMESTAMP)")
+    op.conn.executemany("INSERT INTO cargos (cod_cargo, nome_cargo) VALUES (?, ?)", [(1, "Analista"), (2, "Gerente")])
+    op.conn.commit()
+
+    df = pd.DataFrame({"cod_cargo": [1, 2, 3, 3], "nome_cargo": ["Analista", "Diretor", "Tecnico", "Tecnico II"]})
+    op.bulk_upsert(df)
+
+    assert op.last_stats == {"inserted": 1, "updated": 1, "unchanged": 1, "total": 3}
+    linhas = op.conn.execute("SELECT cod_cargo, nome_cargo, updated_at IS NOT NULL FROM cargos ORDER BY 1").fetchall()
+    assert linhas == [(1, "Analista", 0), (2, "Diretor", 1), (3, "Tecnico II", 0)]
+
+
+class CopiaFalsa:
+    def __init__(self, linhas):
+        self.linhas = linhas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, linha):
+        self.linhas.append(linha)
+
+
+class CursorPgFalso:
+    def __init__(self, conexao):
+        self.conexao = conexao
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy(self, comando):
+        self.conexao.comandos.append(comando.split()[0])
+        return CopiaFalsa(self.conexao.linhas)
+
+    def execute(self, comando, *args):
+        self.conexao.comandos.append(comando.split()[0])
+        self.conexao.sql.append(comando)
+
+    def fetchone(self):
+        return (len(self.conexao.linhas), 0)
+
+
+class ConexaoPgFalsa:
+    """Simula transaction() do psycopg: BEGIN/COMMIT quando ociosa, SAVEPOINT dentro de transação."""
+
+    def __init__(self, status):
+        from types import SimpleNamespace
+        self.info = SimpleNamespace(transaction_status=status)
+        self.comandos = []
+        self.sql = []
+        self.linhas = []
+
+    @contextmanager
+    def transaction(self):
+        externa = self.info.transaction_status == TransactionStatus.IDLE
+        self.comandos.append("BEGIN" if externa else "SAVEPOINT")
+        self.info.transaction_status = TransactionStatus.INTRANS
+        yield
+        self.comandos.append("COMMIT" if externa else "RELEASE")
+        if externa:
+            self.info.transaction_status = TransactionStatus.IDLE
+
+    def cursor(self):
+        return CursorPgFalso(self)
+
+    def commit(self):
+        self.comandos.append("COMMIT")
+
+
+@pytest.fixture
+def operador_pg(operador):
+    conexao_sqlite = operador.conn
+    yield operador
+    operador.conn = conexao_sqlite
+
+
+def test_bulk_insert_pg_confirma_a_propria_transacao(operador_pg):
+    operador_pg.conn = ConexaoPgFalsa(TransactionStatus.IDLE)
+    operador_pg.bulk_insert(pd.DataFrame({"cod_funcionario": [1, 2], "nome": ["Ana", "Bruno"]}))
+    assert operador_pg.conn.comandos == ["BEGIN", "SAVEPOINT", "COPY", "RELEASE", "COMMIT"]
+
+
+def test_bulk_insert_pg_entra_na_transacao_aberta_sem_confirmar(operador_pg):
+    operador_pg.conn = ConexaoPgFalsa(TransactionStatus.INTRANS)
+    operador_pg.bulk_insert(pd.DataFrame({"cod_funcionario": [1], "nome": ["Ana"]}))
+    assert "COMMIT" not in operador_pg.conn.comandos and operador_pg.conn.linhas == [(1, "Ana")]
+    operador_pg.conn = ConexaoPgFalsa(TransactionStatus.INERROR)
+    with pytest.raises(RuntimeError):
+        operador_pg.bulk_insert(pd.DataFrame({"cod_funcionario": [1], "nome": ["Ana"]}))
+
+
+def test_bulk_insert_sqlite_nao_confirma_trabalho_do_chamador(operador):
+    operador.conn.execute("INSERT INTO stg_funcionarios (cod_funcionario, nome) VALUES (9, 'Pendente')")
+    operador.bulk_insert(pd.DataFrame({"cod_funcionario": [1], "nome": ["Ana"]}))
+    operador.conn.rollback()
+    assert operador.conn.execute("SELECT count(*) FROM stg_funcionarios").fetchone()[0] == 0
+
+
+def test_bulk_upsert_pg_confirma_a_propria_transacao(operador_pg):
+    operador_pg.key_field = "cod_funcionario"
+    operador_pg.conn = ConexaoPgFalsa(TransactionStatus.IDLE)
+    operador_pg.bulk_upsert(pd.DataFrame({"cod_funcionario": [1, 2], "nome": ["Ana", "Bruno"]}))
+    assert operador_pg.conn.comandos == ["BEGIN", "CREATE", "COPY", "WITH", "COMMIT"]
+    assert operador_pg.last_stats["inserted"] == 2
+
+
+def test_create_table_from_df_mapeia_tipos_nulaveis_e_arrow(operador_pg, monkeypatch):
+    operador_pg.conn = ConexaoPgFalsa(TransactionStatus.IDLE)
+    monkeypatch.setattr(operador_pg, "_table_exists", lambda: False)
+    operador_pg.create_table_from_df(pd.DataFrame({
+        "cod_empresa": pd.array([1, None], dtype="Int64"),
+        "nome": pd.array(["a", None], dtype=pd.StringDtype("pyarrow")),
+        "ativo": pd.array([True, None], dtype="boolean"),
+    }))
+    criacao = operador_pg.conn.sql[-1]
+    assert "cod_empresa BIGINT" in criacao and "nome TEXT" in criacao and "ativo BOOLEAN" in criacao
@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+import pandas as pd
+import pytest
+from app.core import derivadas
+
+COLUNA = pd.Series([" SP", "rj ", None, " SP", "Fériás", "", "rj ", None] * 3, index=range(5, 29), name="uf")
+
+
+def test_derivadas_iguais_as_expressoes_pandas():
+    pd.testing.assert_series_equal(derivadas.tamanho_sem_espacos(COLUNA), COLUNA.str.strip().str.len())
+    pd.testing.assert_series_equal(derivadas.texto_tamanho_sem_espacos(COLUNA), COLUNA.astype(str).str.strip().str.len())
+    pd.testing.assert_series_equal(derivadas.casa(COLUNA, r"^\s?[A-Z]+$"), COLUNA.str.match(r"^\s?[A-Z]+$"))
+    pd.testing.assert_series_equal(derivadas.casa(COLUNA, r"^\s?[A-Z]+$", na=False), COLUNA.str.match(r"^\s?[A-Z]+$", na=False))
+    pd.testing.assert_series_equal(
+        derivadas.minusculo_sem_espacos(COLUNA), COLUNA.fillna("").astype(str).str.strip().str.lower()
+    )
+    assert derivadas.maiusculo_ascii(COLUNA).tolist()[:5] == ["SP", "RJ", "", "SP", "FERIAS"]
+
+
+def test_none_e_nan_misturados_calculam_direto_na_coluna():
+    s = pd.Series(["a", None, np.nan, "a"] * 3)
+    pd.testing.assert_series_equal(derivadas.derivada(s, "texto", lambda u: u.astype(str)), s.astype(str))
+
+
+def test_mesma_excecao_da_expressao_pandas():
+    s = pd.Series(["1.01", "2", "x", None, "y"] * 4)
+    with pytest.raises(ValueError) as esperado:
+        s.str.replace(".", "", regex=False).astype(int)
+    with pytest.raises(ValueError) as obtido:
+        derivadas.inteiro_sem_pontos(s)
+    assert str(obtido.value) == str(esperado.value)
+
+
+def test_escopo_calcula_cada_derivada_uma_vez_por_coluna():
+    chamadas = []
+
+    def sem_espacos(u):
+        chamadas.append(len(u))
+        return u.str.strip()
+
+    df = pd.DataFrame({"uf": COLUNA, "outra": COLUNA.copy()})
+    with derivadas.escopo():
+        for _ in range(3):
+            derivadas.derivada(df["uf"], "sem_espacos", sem_espacos)
+        derivadas.derivada(df["outra"], "sem_espacos", sem_espacos)
+    assert chamadas == [5, 5]  # valores distintos, uma vez por coluna
+    derivadas.derivada(df["uf"], "sem_espacos", sem_espacos)
+    assert len(chamadas) == 3  # fora do escopo nada fica memorizado
+
+
+@pytest.mark.parametrize("tipo", ["string[pyarrow]", "category"])
+def test_texto_arrow_e_categorias_iguais_a_coluna_object(tipo):
+    s = COLUNA.astype("string[pyarrow]").astype(tipo)
+    assert derivadas.tamanho_sem_espacos(s).fillna(-1).tolist() == COLUNA.str.strip().str.len().fillna(-1).tolist()
+    assert derivadas.casa(s, r"^\s?[A-Z]+$", na=False).tolist() == COLUNA.str.match(r"^\s?[A-Z]+$", na=False).tolist()
+    assert derivadas.minusculo_sem_espacos(s).tolist() == COLUNA.fillna("").str.strip().str.lower().tolist()
+    assert derivadas.maiusculo_ascii(s).index.equals(COLUNA.index)
+
+
+def test_casa_ancora_todas_as_alternativas_em_arrow():
+    s = pd.Series(["xx12345-678", "12.345-678", "12345-678"], dtype="string[pyarrow]")
+    assert derivadas.casa(s, r"^\d{2}\.\d{3}-\d{3}|\d{5}-\d{3}$", na=False).tolist() == [False, True, True]
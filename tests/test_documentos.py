@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pandas as pd
+import pandera.pandas as pa
+from app.core.documentos import cnpj_valido, cpf_valido
+from app.core.codigos_erro import CHECK_DIGITOS_VERIFICADORES, TabelaCodigos, mapear_codigo_erro_pandera
+from app.core.validator_service import SCHEMAS
+
+
+def test_cpf_com_e_sem_mascara():
+    s = pd.Series(["529.982.247-25", "52998224725", "529.982.247-24", "111.111.111-11", "529 982 247 25", "529.982.247-26"], index=range(3, 9))
+    resultado = cpf_valido(s)
+    assert resultado.index.equals(s.index)
+    assert resultado.tolist() == [True, True, False, False, True, False]
+
+
+def test_cnpj_com_e_sem_mascara():
+    s = pd.Series(["11.222.333/0001-81", "11222333000181", "11.222.333/0001-80", "00.000.000/0000-00", "11.222.333/0001-8"])
+    assert cnpj_valido(s).tolist() == [True, True, False, False, True]
+
+
+def test_nulos_e_fora_do_formato_ficam_para_os_checks_de_formato():
+    s = pd.Series([None, "", "abc", "5299822472", "529.982.247-2555", "Ⅻ29.982.247-25"])
+    assert cpf_valido(s).all()
+    assert cnpj_valido(pd.Series([], dtype=object)).empty
+
+
+def test_check_de_digitos_verificadores_tem_codigo_202():
+    tabela = TabelaCodigos(SCHEMAS)
+    checks = [
+        (c.error, nome) for schema in SCHEMAS.values() for nome, coluna in schema.columns.items()
+        for c in coluna.checks if c.name == CHECK_DIGITOS_VERIFICADORES
+    ]
+    assert {nome for _, nome in checks} == {"cpf", "cnpj", "cnpj_empresa", "cnpj_da_empresa", "cnpj_da_matriz"}
+    assert {tabela.codigo(check, nome) for check, nome in checks} == {"202"}
+
+
+def test_codigo_202_independe_do_texto_da_mensagem():
+    check = pa.Check(lambda s: cpf_valido(s), error="Documento não confere", name=CHECK_DIGITOS_VERIFICADORES)
+    tabela = TabelaCodigos({"Modelo F": pa.DataFrameSchema({"cpf": pa.Column(str, check)})})
+    assert mapear_codigo_erro_pandera("Documento não confere", "cpf") != "202"
+    assert tabela.codigo("Documento não confere", "cpf") == "202"
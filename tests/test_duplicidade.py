@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pandas as pd
+from app.core import duplicidade
+from app.core.codigos_erro import codigo_check_pandera
+
+
+def test_primeira_ocorrencia_lista_as_repeticoes():
+    df = pd.DataFrame({"cpf": ["a", "b", "a", None, "c", "a", None, "b"]})
+    falhas = duplicidade.falhas_duplicidade(df, ["cpf"])
+    assert falhas["index"].tolist() == [0, 1, 2, 5, 7]  # nulos não são comparados
+    assert falhas["failure_case"].tolist() == [
+        "a (primeira ocorrência; repetido nas linhas 4, 7)",
+        "b (primeira ocorrência; repetido nas linhas 9)",
+        "a (repetição da linha 2)",
+        "a (repetição da linha 2)",
+        "b (repetição da linha 3)",
+    ]
+    assert set(falhas["check"]) == {"field_uniqueness"} and set(falhas["column"]) == {"cpf"}
+    assert duplicidade.falhas_duplicidade(df.dropna().drop_duplicates(), ["cpf"]) is None
+
+
+def test_chave_composta_e_indice_original():
+    df = pd.DataFrame({
+        "cod_setor": ["1.01", "1.01", "1.01", "2", None],
+        "cnpj_da_empresa": ["X", "Y", "X", "X", "X"],
+    }, index=range(10, 15))
+    falhas = duplicidade.falhas_duplicidade(df, ["cod_setor", "cnpj_da_empresa"])
+    assert falhas["index"].tolist() == [10, 12]
+    assert falhas["failure_case"].tolist() == [
+        "('1.01', 'X') (primeira ocorrência; repetido nas linhas 14)",
+        "('1.01', 'X') (repetição da linha 12)",
+    ]
+    assert set(falhas["column"]) == {"cod_setor+cnpj_da_empresa"}
+    assert codigo_check_pandera("multiple_fields_uniqueness", "cod_setor+cnpj_da_empresa") == "601"
+
+
+def test_mensagem_limita_as_linhas_citadas():
+    n = duplicidade.MAX_LINHAS_NA_MENSAGEM + 5
+    falhas = duplicidade.falhas_duplicidade(pd.DataFrame({"cod": [7] * n}), ["cod"])
+    assert len(falhas) == n
+    assert falhas["failure_case"].iloc[0].endswith(", 12 e mais 4)")
+
+
+def test_grupos_na_ordem_da_primeira_ocorrencia():
+    df = pd.DataFrame({"cod": [3, 1, 3, 1, 2, 3]})
+    agrupadas, inicios = duplicidade.posicoes_duplicadas(df, ["cod"])
+    assert agrupadas.tolist() == [0, 2, 5, 1, 3] and inicios.tolist() == [0, 3]
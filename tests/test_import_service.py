@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import importlib
+import types
+import pandas as pd
+import pytest
+from app.core import storage_service
+from app.core.coletor_erros import ColetorErros
+from app.core.models_validacao import StatusArquivo
+from app.core.schemas import TEXTO
+
+
+class ArquivoRepositoryFalso:
+    """Registra as transições de status no lugar do repositório de banco."""
+    status = []
+
+    def atualizar_status(self, arquivo_id, status, stats=None):
+        self.status.append(status)
+
+
+@pytest.fixture
+def import_service(monkeypatch, armazenamento_local):
+    # app.core.repository não faz parte deste pacote: o serviço é importado com um repositório falso
+    repositorio = types.ModuleType("app.core.repository")
+    repositorio.ArquivoRepository = ArquivoRepositoryFalso
+    monkeypatch.setitem(sys.modules, "app.core.repository", repositorio)
+    monkeypatch.delitem(sys.modules, "app.core.import_service", raising=False)
+    ArquivoRepositoryFalso.status = []
+    modulo = importlib.import_module("app.core.import_service")
+    yield modulo
+    # Publicações ainda em curso precisam terminar antes de o storage do teste sair de cena
+    if modulo._uploads is not None:
+        modulo._uploads.shutdown(wait=True)
+    sys.modules.pop("app.core.import_service", None)
+
+
+def _normalizado():
+    return {"Setores": pd.DataFrame({"cod_setor": pd.array(["01", "02"], dtype=TEXTO)})}
+
+
+def test_fluxo_completo_reaproveita_dataframes(import_service, monkeypatch):
+    normalized = _normalizado()
+    monkeypatch.setattr(import_service, "validar_arquivo_excel", lambda _: (normalized, ColetorErros(), {"linhas": 2}))
+    cargas = []
+    monkeypatch.setattr(import_service, "_carregar_planilhas", lambda dfs: cargas.append(dfs) or {"staging": {}})
+
+    res = import_service.validar_e_importar("abc", "planilha.xlsx", b"")
+
+    assert ArquivoRepositoryFalso.status == [
+        StatusArquivo.VALIDANDO, StatusArquivo.VALIDADO, StatusArquivo.IMPORTANDO, StatusArquivo.IMPORTADO,
+    ]
+    assert res["status"] == StatusArquivo.IMPORTADO
+    assert cargas == [normalized] and cargas[0] is normalized
+    chaves = res["artefatos"].result(timeout=30)
+    assert storage_service.normalized_key_for("abc", "planilha") in chaves
+    assert not any("erros_" in c for c in chaves)
+    pd.testing.assert_frame_equal(import_service.ler_normalizado("abc")["Setores"], normalized["Setores"])
+
+
+def test_erro_critico_interrompe_antes_da_carga(import_service, monkeypatch, planilha_modelo):
+    monkeypatch.setattr(import_service, "_carregar_planilhas", lambda dfs: pytest.fail("não deveria carregar"))
+
+    res = import_service.validar_e_importar("abc", "planilha.xlsx", planilha_modelo)
+
+    assert ArquivoRepositoryFalso.status == [StatusArquivo.VALIDANDO, StatusArquivo.ERROS]
+    assert res["status"] == StatusArquivo.ERROS
+    chaves = res["artefatos"].result(timeout=30)
+    assert storage_service.report_key_for("abc", "erros_abc.xlsx") in chaves
+
+
+def test_excecao_na_validacao_encerra_status(import_service, monkeypatch):
+    def falha(_):
+        raise ValueError("arquivo corrompido")
+    monkeypatch.setattr(import_service, "validar_arquivo_excel", falha)
+
+    with pytest.raises(ValueError):
+        import_service.validar_e_importar("abc", "planilha.xlsx", b"")
+    assert ArquivoRepositoryFalso.status == [StatusArquivo.VALIDANDO, StatusArquivo.FALHA_VALIDACAO]
+
+
+def test_excecao_na_carga_encerra_status(import_service, monkeypatch):
+    monkeypatch.setattr(import_service, "validar_arquivo_excel", lambda _: (_normalizado(), ColetorErros(), {}))
+    def falha(_):
+        raise RuntimeError("banco indisponível")
+    monkeypatch.setattr(import_service, "_carregar_planilhas", falha)
+
+    with pytest.raises(RuntimeError):
+        import_service.validar_e_importar("abc", "planilha.xlsx", b"")
+    assert ArquivoRepositoryFalso.status == [
+        StatusArquivo.VALIDANDO, StatusArquivo.VALIDADO, StatusArquivo.IMPORTANDO, StatusArquivo.FALHA_IMPORT,
+    ]
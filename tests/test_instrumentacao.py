@@ -0,0 +1,25 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import tracemalloc
+from app.core.instrumentacao import Medidor, MEDIDOR_NULO
+
+
+def test_pico_tracemalloc_da_etapa_interna_conta_na_externa():
+    medidor = Medidor(usar_tracemalloc=True)
+    with medidor.etapa("externa"):
+        with medidor.etapa("interna"):
+            bloco = bytearray(8 << 20)
+            del bloco
+    medidor.encerrar()
+    interna, externa = medidor.resultado()
+    assert interna["etapa"] == "interna" and interna["alocado_pico_mb"] >= 8
+    assert externa["alocado_pico_mb"] >= interna["alocado_pico_mb"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_medidor_nulo_nao_registra():
+    with MEDIDOR_NULO.etapa("leitura", "Setores"):
+        pass
+    assert MEDIDOR_NULO.resultado() is None
+    assert MEDIDOR_NULO.novo() is MEDIDOR_NULO
@@ -0,0 +1,129 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import io
+import datetime
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from app.core.leitor_excel import ler_planilhas, ler_planilhas_tipadas, iterar_lotes
+
+
+def _planilha_bytes():
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Modelo F"
+    ws.append(["Cod Funcionario", "Matricula", "Dt Nascimento", "Nome"])
+    ws.append([1, "049164", datetime.datetime(1990, 1, 1), "Ana"])
+    ws.append([2, 46124, None, "José"])
+    ws.append([])
+    ws.append([3.0, "01010105337 2025", datetime.datetime(1985, 5, 2), None])
+    ws.append([None, None, None, None])
+    vazia = wb.create_sheet("Setores")
+    vazia.append(["Cod Setor"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("tamanho_lote", [None, 1, 2])
+def test_streaming_mesmo_contrato_do_read_excel(tamanho_lote):
+    conteudo = _planilha_bytes()
+    abas = ["Modelo F", "Setores"]
+    esperado = pd.read_excel(io.BytesIO(conteudo), sheet_name=abas)
+    obtido = ler_planilhas(conteudo, abas, motor="streaming", tamanho_lote=tamanho_lote)
+    for aba in abas:
+        pd.testing.assert_frame_equal(obtido[aba], esperado[aba])
+
+
+def test_iterar_lotes_mantem_indice():
+    lotes = list(iterar_lotes(_planilha_bytes(), "Modelo F", tamanho_lote=2))
+    assert [list(lote.index) for lote in lotes] == [[0, 1], [2, 3]]
+
+
+def test_motor_invalido():
+    with pytest.raises(ValueError):
+        ler_planilhas(_planilha_bytes(), ["Modelo F"], motor="xlrd")
+
+
+def test_aba_inexistente():
+    with pytest.raises(ValueError):
+        ler_planilhas(_planilha_bytes(), ["Cargos"], motor="streaming")
+
+
+COLUNAS_TIPADAS = {"cod_funcionario": "int64", "matricula": "str", "dt_nascimento": "datetime64[ns]", "cpf": "str"}
+
+
+@pytest.mark.parametrize("motor,tamanho_lote", [("streaming", None), ("streaming", 2), ("pandas", None)])
+def test_leitura_tipada_so_colunas_esperadas(motor, tamanho_lote):
+    conteudo = _planilha_bytes()
+    completo = ler_planilhas(conteudo, ["Modelo F"])["Modelo F"]
+    leitura = ler_planilhas_tipadas(conteudo, {"Modelo F": COLUNAS_TIPADAS}, motor=motor, tamanho_lote=tamanho_lote)["Modelo F"]
+    df = leitura.df
+    assert list(df.columns) == ["cod_funcionario", "matricula", "dt_nascimento"]  # cpf não existe no arquivo
+    assert leitura.colunas_extras == ["nome"]
+    assert df.index.equals(completo.index)
+    # Texto sem passar por número: o zero à esquerda fica e 46124 não vira "46124.0"
+    assert df["matricula"].tolist() == ["049164", "46124", None, "01010105337 2025"]
+    assert df["dt_nascimento"].dtype == "datetime64[ns]" and df["dt_nascimento"].isna().tolist() == [False, True, True, False]
+    # Inteiro com célula vazia não converte limpo: fica para a coerção do schema
+    assert df["cod_funcionario"].tolist() == [1.0, 2.0, None, 3.0]
+
+
+def test_leitura_tipada_reporta_celulas_alem_do_cabecalho():
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Cargos"
+    ws.append(["Cod Cargo"])
+    ws.append([1, None, "sobra"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    leitura = ler_planilhas_tipadas(buf.getvalue(), {"Cargos": {"cod_cargo": "int64"}})["Cargos"]
+    assert leitura.df["cod_cargo"].dtype == "int64"
+    assert leitura.colunas_extras == ["unnamed_1", "unnamed_2"]
+
+
+def test_leitura_tipada_em_arrow_categoria_e_inteiro_nulavel():
+    tipos = {"cod_funcionario": "Int64", "matricula": "string[pyarrow]", "nome": "category"}
+    df = ler_planilhas_tipadas(_planilha_bytes(), {"Modelo F": tipos})["Modelo F"].df
+    assert df["matricula"].dtype == "string[pyarrow]"
+    assert df["matricula"].tolist() == ["049164", "46124", pd.NA, "01010105337 2025"]
+    assert df["cod_funcionario"].dtype == "Int64" and df["cod_funcionario"].tolist() == [1, 2, pd.NA, 3]
+    assert df["nome"].cat.categories.dtype == "string[pyarrow]"
+    assert df["nome"].cat.codes.tolist() == [0, 1, -1, -1]
+
+
+def _planilha_tipos_mistos():
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Modelo F"
+    ws.append(["Cod Funcionario", "Matricula", "Nome", "Dt Admissao"])
+    ws.append([1, 10, "Ana", datetime.datetime(2020, 1, 1)])
+    ws.append([2, 11.5, "Bia", datetime.datetime(2021, 2, 3)])
+    ws.append([3, "049164", "Ana", "01/02/2022"])
+    ws.append([None, None, None, None, "sobra"])
+    ws.append([5, 7, "Caio", datetime.datetime(2023, 4, 5)])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("tamanho_lote", [1, 2])
+def test_lotes_com_tipos_diferentes_igual_ao_read_excel(tamanho_lote):
+    # Cada lote é tipado ao chegar; uma coluna cujo tipo muda entre lotes volta ao resultado da coluna inteira
+    conteudo = _planilha_tipos_mistos()
+    esperado = pd.read_excel(io.BytesIO(conteudo), sheet_name="Modelo F")
+    obtido = ler_planilhas(conteudo, ["Modelo F"], motor="streaming", tamanho_lote=tamanho_lote)["Modelo F"]
+    pd.testing.assert_frame_equal(obtido, esperado)
+    assert list(map(type, obtido["Dt Admissao"])) == list(map(type, esperado["Dt Admissao"]))
+
+
+@pytest.mark.parametrize("tamanho_lote", [1, 2])
+def test_leitura_tipada_por_lote_igual_a_leitura_inteira(tamanho_lote):
+    tipos = {"cod_funcionario": "Int64", "matricula": "int64", "nome": "category", "dt_admissao": "datetime64[ns]"}
+    conteudo = _planilha_tipos_mistos()
+    inteira = ler_planilhas_tipadas(conteudo, {"Modelo F": tipos}, tamanho_lote=1000)["Modelo F"]
+    por_lote = ler_planilhas_tipadas(conteudo, {"Modelo F": tipos}, tamanho_lote=tamanho_lote)["Modelo F"]
+    pd.testing.assert_frame_equal(por_lote.df, inteira.df)
+    assert por_lote.colunas_extras == inteira.colunas_extras
+    assert por_lote.df["nome"].cat.categories.tolist() == ["Ana", "Bia", "Caio"]
@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import json
+import pandas as pd
+import pandera.pandas as pa
+from app.core.cache_validacao import fingerprint_schemas
+from app.core.perfil_checks import perfilar_checks
+
+
+def _schemas():
+    return {"Cargos": pa.DataFrameSchema({
+        "cod_cargo": pa.Column(int, pa.Check(lambda s: s > 0, error="Cod Cargo deve ser maior que zero")),
+        "nome_cargo": pa.Column(str, [
+            pa.Check(lambda s: s.str.strip().str.len().between(1, 30), error="Nome Cargo até 30 caracteres"),
+            pa.Check.str_matches(r"^[A-Z]", error="Nome Cargo começa com maiúscula"),
+        ]),
+    })}
+
+
+def test_perfil_conta_chamadas_e_linhas_por_check():
+    schemas = _schemas()
+    df = pd.DataFrame({"cod_cargo": [1, 2, 3], "nome_cargo": ["Analista", "gerente", "Diretor"]})
+    with perfilar_checks(schemas) as perfil:
+        for _ in range(2):
+            try:
+                schemas["Cargos"].validate(df, lazy=True)
+            except pa.errors.SchemaErrors:
+                pass
+
+    tabela = perfil.tabela(ordenar_por="chamadas")
+    assert list(tabela.columns) == ["aba", "coluna", "check", "chamadas", "tempo_s", "linhas", "linhas_por_s"]
+    assert len(tabela) == 3
+    assert (tabela["chamadas"] == 2).all() and (tabela["linhas"] == 6).all()
+    registros = json.loads(perfil.to_json())
+    assert {r["check"] for r in registros} >= {"Nome Cargo começa com maiúscula"}
+    assert "Tempo total em checks" in perfil.relatorio(limite=1)
+
+
+def test_perfil_restaura_checks_e_preserva_fingerprint():
+    schemas = _schemas()
+    check = schemas["Cargos"].columns["cod_cargo"].checks[0]
+    antes = fingerprint_schemas(schemas, set())
+    with perfilar_checks(schemas):
+        assert "get_backend" in vars(check)
+        assert fingerprint_schemas(schemas, set()) == antes
+    assert "get_backend" not in vars(check)
@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import sqlite3
+import pytest
+from app.core.db import Operator, DatabaseType
+from app.core import pool as pool_module
+from app.core.pool import ConnectionPool, PoolTimeout
+
+
+class ConexaoFalsa:
+    """Imita uma conexão psycopg: expõe closed/broken e falha no SELECT 1 quando caída."""
+
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+        self.caida = False
+
+    def execute(self, sql):
+        if self.caida:
+            raise ConnectionError("server closed the connection unexpectedly")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_operator_reutiliza_conexao_do_pool(tmp_path):
+    banco = str(tmp_path / "local.db")
+    with Operator(table="t", db_type=DatabaseType.SQLITE, database=banco) as op:
+        primeira = op.conn
+    with Operator(table="t", db_type=DatabaseType.SQLITE, database=banco) as op:
+        assert op.conn is primeira
+
+
+def test_pool_respeita_tamanho_maximo():
+    pool = ConnectionPool(lambda: sqlite3.connect(":memory:"), size=1, acquire_timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+
+def test_pool_descarta_conexao_ociosa_expirada():
+    pool = ConnectionPool(ConexaoFalsa, idle_timeout=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    nova = pool.acquire()
+    assert nova is not conn and conn.closed
+    assert pool.open_connections == 1
+
+
+def test_pool_descarta_conexao_que_falha_no_health_check():
+    pool = ConnectionPool(ConexaoFalsa, health_check_interval=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.caida = True
+    nova = pool.acquire()
+    assert nova is not conn and conn.closed
+    assert pool.open_connections == 1
+
+
+def test_get_pool_aceita_none_para_desativar_timeouts(monkeypatch):
+    monkeypatch.setattr(pool_module, "_pools", {})
+    monkeypatch.setattr(pool_module, "settings", {"DATABASE_POOL_IDLE_TIMEOUT": None, "DATABASE_POOL_HEALTH_CHECK_INTERVAL": None})
+    pool = pool_module.get_pool(("sqlite", ":memory:"), lambda: sqlite3.connect(":memory:"))
+    assert pool.idle_timeout is None and pool.health_check_interval is None
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
@@ -0,0 +1,203 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.core import storage_service
+from app.core.storage_service import S3Backend
+
+
+def test_backend_local_com_as_mesmas_chaves(armazenamento_local):
+    chave = storage_service.normalized_key_for("abc", "planilha")
+    storage_service.put_bytes(chave, b"conteudo")
+    assert storage_service.get_bytes(chave) == b"conteudo"
+    assert (armazenamento_local / chave).read_bytes() == b"conteudo"
+    assert not [p for p in (armazenamento_local / chave).parent.iterdir() if p.name.endswith(".tmp")]
+    info = storage_service.generate_presigned_get(chave)
+    assert info.key == chave and info.url == (armazenamento_local / chave).resolve().as_uri()
+
+
+def test_backend_local_recusa_chave_fora_da_raiz(armazenamento_local):
+    with pytest.raises(ValueError):
+        storage_service.put_bytes("../fora.txt", b"x")
+    with pytest.raises(FileNotFoundError):
+        storage_service.get_bytes(storage_service.report_key_for("inexistente"))
+
+
+def test_s3_cria_um_unico_cliente_compartilhado():
+    backend = S3Backend("bucket", max_pool_connections=3)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        clientes = list(executor.map(lambda _: backend.client, range(8)))
+    assert all(cliente is clientes[0] for cliente in clientes)
+    assert clientes[0].meta.config.max_pool_connections == 3
+
+
+class ClienteFalso:
+    """S3 em memória: objetos, upload multipart e GET por intervalo (Range/IfMatch)."""
+
+    def __init__(self):
+        self.objetos = {}
+        self.uploads = {}
+        self.intervalos = []
+        self.abortados = []
+        self.partes_simultaneas = self.maximo_simultaneas = 0
+        self.trava = threading.Lock()
+        self.falhar_parte = None
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objetos[(Bucket, Key)] = bytes(Body)
+
+    def head_object(self, Bucket, Key):
+        corpo = self.objetos[(Bucket, Key)]
+        return {"ContentLength": len(corpo), "ETag": f'"{hash(corpo)}"'}
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+        corpo = self.objetos[(Bucket, Key)]
+        if IfMatch is not None:
+            assert IfMatch == self.head_object(Bucket, Key)["ETag"]
+        if Range is not None:
+            inicio, fim = map(int, Range.removeprefix("bytes=").split("-"))
+            self.intervalos.append((inicio, fim))
+            corpo = corpo[inicio:fim + 1]
+        return {"Body": io.BytesIO(corpo)}
+
+    def create_multipart_upload(self, Bucket, Key, ContentType):
+        self.uploads["u1"] = {}
+        return {"UploadId": "u1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self.trava:
+            self.partes_simultaneas += 1
+            self.maximo_simultaneas = max(self.maximo_simultaneas, self.partes_simultaneas)
+        time.sleep(0.01)
+        with self.trava:
+            self.partes_simultaneas -= 1
+        if PartNumber == self.falhar_parte:
+            raise ConnectionError("falha na parte")
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        partes = MultipartUpload["Parts"]
+        assert [p["PartNumber"] for p in partes] == list(range(1, len(partes) + 1))
+        enviadas = self.uploads.pop(UploadId)
+        self.objetos[(Bucket, Key)] = b"".join(enviadas[p["PartNumber"]] for p in partes)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.abortados.append(UploadId)
+
+    def generate_presigned_url(self, operacao, Params, ExpiresIn):
+        return f"https://{Params['Bucket']}/{Params['Key']}?op={operacao}&expira={ExpiresIn}"
+
+
+def test_s3_delega_ao_cliente():
+    storage_service.set_storage(S3Backend("bucket", client=ClienteFalso()))
+    try:
+        storage_service.put_bytes("a/b.xlsx", b"123")
+        assert storage_service.get_bytes("a/b.xlsx") == b"123"
+        assert storage_service.generate_presigned_put("a/b.xlsx", 60).url == "https://bucket/a/b.xlsx?op=put_object&expira=60"
+        assert storage_service.get_s3_client() is storage_service.get_storage().client
+    finally:
+        storage_service.set_storage(None)
+
+
+def test_s3_upload_multipart_em_partes_limitadas():
+    cliente = ClienteFalso()
+    backend = S3Backend("bucket", client=cliente, part_size=10, concurrency=2)
+    pedacos = [bytes([i]) * 7 for i in range(20)]  # 140 bytes em pedaços que não alinham com as partes
+    backend.put_stream("grande.bin", iter(pedacos))
+    assert cliente.objetos[("bucket", "grande.bin")] == b"".join(pedacos)
+    assert cliente.maximo_simultaneas <= 2
+    backend.put_stream("pequeno.bin", [b"abc", b"de"])  # cabe numa parte: PUT simples
+    assert cliente.objetos[("bucket", "pequeno.bin")] == b"abcde" and not cliente.uploads
+
+
+def test_s3_upload_multipart_aborta_em_falha():
+    cliente = ClienteFalso()
+    cliente.falhar_parte = 3
+    backend = S3Backend("bucket", client=cliente, part_size=10, concurrency=2)
+    with pytest.raises(ConnectionError):
+        backend.put_stream("grande.bin", [b"x" * 100])
+    assert cliente.abortados == ["u1"] and ("bucket", "grande.bin") not in cliente.objetos
+
+
+def test_s3_leitura_por_intervalos_com_seek():
+    cliente = ClienteFalso()
+    conteudo = bytes(range(256)) * 4
+    cliente.objetos[("bucket", "obj")] = conteudo
+    backend = S3Backend("bucket", client=cliente, part_size=100, concurrency=3)
+    with backend.open_object("obj") as arquivo:
+        assert arquivo.read() == conteudo
+        arquivo.seek(-30, io.SEEK_END)
+        assert arquivo.read(10) == conteudo[-30:-20]
+        arquivo.seek(250)
+        assert arquivo.read(60) == conteudo[250:310]
+    assert max(fim - inicio + 1 for inicio, fim in cliente.intervalos) == 100
+
+
+def test_backend_local_em_streaming(armazenamento_local):
+    storage_service.put_fileobj("a/b.bin", io.BytesIO(b"0123456789" * 5), chunk_size=7)
+    with storage_service.open_object("a/b.bin") as arquivo:
+        arquivo.seek(45)
+        assert arquivo.read() == b"56789"
+
+
+@pytest.fixture
+def cache_downloads(tmp_path, monkeypatch):
+    cache = storage_service.CacheDisco(tmp_path / "cache", 1000)
+    monkeypatch.setattr(storage_service, "download_cache", lambda: cache)
+    return cache
+
+
+def test_cache_local_evita_novo_download(cache_downloads):
+    cliente = ClienteFalso()
+    cliente.objetos[("bucket", "obj")] = conteudo = bytes(range(200))
+    storage_service.set_storage(S3Backend("bucket", client=cliente, part_size=64, concurrency=2))
+    try:
+        with storage_service.open_cached("obj") as arquivo:
+            assert arquivo.read() == conteudo
+        baixados = len(cliente.intervalos)
+        with storage_service.open_cached("obj") as arquivo:  # retentativa: lê do disco (mmap)
+            arquivo.seek(150)
+            assert arquivo.read(10) == conteudo[150:160]
+        assert len(cliente.intervalos) == baixados
+        cliente.objetos[("bucket", "obj")] = b"novo"  # ETag novo: nova entrada
+        with storage_service.open_cached("obj") as arquivo:
+            assert arquivo.read() == b"novo"
+        assert len(cliente.intervalos) > baixados
+    finally:
+        storage_service.set_storage(None)
+
+
+def test_cache_local_despeja_e_aceita_objeto_vazio(armazenamento_local, cache_downloads):
+    storage_service.put_bytes("vazio", b"")
+    with storage_service.open_cached("vazio") as arquivo:
+        assert arquivo.read() == b""
+    storage_service.put_bytes("enorme", b"x" * 5000)  # maior que o cache: lido direto do backend
+    with storage_service.open_cached("enorme") as arquivo:
+        assert arquivo.read() == b"x" * 5000
+    for i in range(5):
+        storage_service.put_bytes(f"obj{i}", bytes([i]) * 400)
+        with storage_service.open_cached(f"obj{i}") as arquivo:
+            assert arquivo.read() == bytes([i]) * 400
+    ocupado = sum(p.stat().st_size for p in cache_downloads.diretorio.rglob("*") if p.is_file())
+    assert ocupado <= 1000
+
+
+def test_s3_objeto_inexistente_levanta_file_not_found():
+    from botocore.exceptions import ClientError
+
+    class ClienteSemObjetos(ClienteFalso):
+        def head_object(self, Bucket, Key):
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+        def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+
+    backend = S3Backend("bucket", client=ClienteSemObjetos())
+    for operacao in (backend.get_bytes, backend.etag, backend.open_object):
+        with pytest.raises(FileNotFoundError):
+            operacao("nada")
@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+import pandas as pd
+from app.core.util import normalizar_coluna_cep, normalizar_textos, tratar_caracteres, validar_sexo, verificar_integridade
+
+
+def test_normalizar_textos_equivale_ao_applymap():
+    df = pd.DataFrame({
+        "nome": ["João", "Conceição", None, "João"],
+        "misto": ["Ação", 10, np.nan, True],
+        "numero": [1, 2, 3, 4],
+        "data": pd.to_datetime(["2020-01-01", None, "2021-05-03", "2022-02-02"]),
+    })
+    esperado = df.map(tratar_caracteres)
+    pd.testing.assert_frame_equal(normalizar_textos(df), esperado)
+
+
+def test_normalizar_textos_nao_altera_original():
+    df = pd.DataFrame({"cidade": ["São Paulo", "Maceió"]})
+    resultado = normalizar_textos(df)
+    assert list(resultado["cidade"]) == ["Sao Paulo", "Maceio"]
+    assert list(df["cidade"]) == ["São Paulo", "Maceió"]
+
+
+def test_normalizacao_mantem_texto_arrow_e_categorias():
+    texto = pd.StringDtype("pyarrow")
+    df = pd.DataFrame({
+        "cidade": pd.Series(["São Paulo", "Sao Paulo", None], dtype=texto).astype("category"),
+        "sexo": pd.Series([" f", "Masculino", "x"], dtype=texto).astype("category"),
+        "cep": pd.Series(["01310100", "1234", None], dtype=texto),
+    })
+    df = normalizar_textos(df)
+    validar_sexo(df)
+    normalizar_coluna_cep(df)
+    assert df["cidade"].cat.categories.tolist() == ["Sao Paulo"]  # categorias que passam a coincidir se fundem
+    assert df["cidade"].cat.categories.dtype == texto and df["cidade"].cat.codes.tolist() == [0, 0, -1]
+    assert df["sexo"].cat.categories.dtype == texto and df["sexo"].astype(texto).tolist() == ["F", "M", pd.NA]
+    assert df["cep"].dtype == texto and df["cep"].tolist() == ["01310-100", "1234", pd.NA]
+
+
+def test_verificar_integridade_agrupa_linhas_por_codigo():
+    fato = pd.DataFrame({"cod_setor": ["1.01", "9.99", None, "9.99", "1.02", "8.88"]})
+    dim = pd.DataFrame({"cod_setor": ["1.01", "1.02"]})
+    erros = verificar_integridade(fato, dim, "cod_setor", "cod_setor")
+    assert [(e["codigo_invalido"], e["quantidade_registros"], e["linhas_afetadas"]) for e in erros] == [
+        ("9.99", 2, [3, 5]),
+        ("8.88", 1, [7]),
+    ]
+
+
+def test_verificar_integridade_chave_composta():
+    fato = pd.DataFrame({
+        "cod_setor": ["1", "1", "2"],
+        "cnpj_empresa": ["A", "B", "A"],
+    })
+    dim = pd.DataFrame({"cod_setor": ["1", "2"], "cnpj_da_empresa": ["A", "A"]})
+    erros = verificar_integridade(fato, dim, ["cod_setor", "cnpj_empresa"], ["cod_setor", "cnpj_da_empresa"])
+    assert len(erros) == 1
+    assert erros[0]["codigo_invalido"] == ("1", "B")
+    assert erros[0]["linhas_afetadas"] == [3]
+
+
+def test_verificar_integridade_coluna_ausente():
+    erros = verificar_integridade(pd.DataFrame({"x": [1]}), pd.DataFrame({"cod_setor": [1]}), "cod_setor", "cod_setor")
+    assert erros[0]["quantidade_registros"] == 0
+    assert "não encontrada" in erros[0]["erro"]
+
+
+def test_verificar_integridade_chave_texto_contra_numerica():
+    fato = pd.DataFrame({"cod_cargo": ["00415", "146", "abc", None]})
+    dim = pd.DataFrame({"cod_cargo": [415, 146]})
+    erros = verificar_integridade(fato, dim, "cod_cargo", "cod_cargo")
+    assert [(e["codigo_invalido"], e["linhas_afetadas"]) for e in erros] == [("abc", [4])]
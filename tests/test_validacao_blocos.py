@@ -0,0 +1,128 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pandas as pd
+import pandera.pandas as pa
+from app.core import validacao_blocos
+
+SCHEMA = pa.DataFrameSchema({
+    "cod_funcionario": pa.Column(pa.Int, pa.Check(lambda s: s > 0, error="Cod Funcionario deve ser maior que zero"), unique=True),
+    "cpf": pa.Column(pa.String, pa.Check.str_matches(r"^\d{3}\.\d{3}\.\d{3}-\d{2}$", error="CPF inválido"), unique=True),
+    "nome": pa.Column(pa.String, nullable=False),
+}, strict=True, coerce=True)
+
+
+def _casos(falhas):
+    return sorted(falhas[["column", "check", "index"]].astype(str).itertuples(index=False, name=None))
+
+
+def _validar_em_blocos(df, n_blocos):
+    local = validacao_blocos.schema_sem_unicidade(SCHEMA)
+    blocos = [validacao_blocos.falhas(local, bloco) for bloco in validacao_blocos.dividir(df, n_blocos)]
+    return blocos, validacao_blocos.combinar([validacao_blocos.falhas_unicidade(SCHEMA, df), *blocos])
+
+
+def test_blocos_produzem_as_mesmas_falhas_da_validacao_inteira():
+    df = pd.DataFrame({
+        "cod_funcionario": [1, 2, -3, 4, 2, 6, 7],
+        "cpf": ["111.111.111-11", "222.222.222-22", "x", "444.444.444-44", "111.111.111-11", "666.666.666-66", "777"],
+        "nome": ["Ana", None, "Caio", "Davi", "Eva", None, "Gil"],
+    }, index=range(10, 17))
+    blocos, combinadas = _validar_em_blocos(df, 3)
+    assert not validacao_blocos.tem_falha_de_tabela(blocos)
+    assert _casos(combinadas) == _casos(validacao_blocos.falhas(SCHEMA, df))
+    # Unicidade avaliada sobre o conjunto completo, mesmo com duplicatas em blocos diferentes
+    unicidade = combinadas[combinadas["check"] == "field_uniqueness"]
+    assert sorted(unicidade["index"].tolist()) == [10, 11, 14, 14]
+    assert not validacao_blocos.schema_sem_unicidade(SCHEMA).columns["cpf"].unique
+    assert SCHEMA.columns["cpf"].unique
+
+
+def test_falha_de_coercao_exige_validacao_inteira():
+    df = pd.DataFrame({"cod_funcionario": [1, "abc", 3, 4], "cpf": ["111.111.111-11"] * 4, "nome": ["a"] * 4})
+    blocos, _ = _validar_em_blocos(df, 2)
+    assert validacao_blocos.tem_falha_de_tabela(blocos)
+
+
+def test_numero_de_blocos_respeita_tamanho_minimo():
+    assert validacao_blocos.numero_de_blocos(3_000, max_workers=8, tamanho_minimo=10_000) == 1
+    assert validacao_blocos.numero_de_blocos(25_000, max_workers=8, tamanho_minimo=10_000) == 3
+    assert validacao_blocos.numero_de_blocos(1_000_000, max_workers=8, tamanho_minimo=10_000) == 8
+
+
+def test_validacao_progressiva_sem_interrupcao_igual_a_validacao_inteira():
+    df = pd.DataFrame({
+        "cod_funcionario": [1, 2, -3, 4, 2, 6, 7],
+        "cpf": ["111.111.111-11", "222.222.222-22", "x", "444.444.444-44", "111.111.111-11", "666.666.666-66", "777"],
+        "nome": ["Ana", None, "Caio", "Davi", "Eva", None, "Gil"],
+    })
+    resultado = validacao_blocos.validar_progressivamente(SCHEMA, df, [], max_erros_criticos=0, tamanho_bloco=2)
+    assert not resultado.interrompida and resultado.linhas_validadas == 7
+    assert _casos(resultado.falhas) == _casos(validacao_blocos.falhas(SCHEMA, df))
+
+
+def test_validacao_progressiva_para_no_limite_de_erros_criticos():
+    df = pd.DataFrame({"cod_funcionario": range(-9, 1), "cpf": ["x"] * 10, "nome": ["a"] * 10})
+    resultado = validacao_blocos.validar_progressivamente(SCHEMA, df, ["cpf"], max_erros_criticos=3, tamanho_bloco=2)
+    assert resultado.interrompida and resultado.linhas_validadas == 4
+    # Só os erros críticos (cod_funcionario) contam para o limite; os de cpf continuam reportados
+    assert sorted(resultado.falhas["index"].unique().tolist()) == [0, 1, 2, 3]
+    assert set(resultado.falhas["column"]) == {"cod_funcionario", "cpf"}
+
+
+def test_limite_por_coluna_deixa_de_avaliar_a_coluna():
+    df = pd.DataFrame({"cod_funcionario": range(1, 11), "cpf": [f"x{i}" for i in range(10)], "nome": ["a"] * 10})
+    limites = validacao_blocos.LimitesErros(por_coluna=3)
+    resultado = validacao_blocos.validar_com_limites(SCHEMA, df, limites, tamanho_bloco=2)
+    assert resultado.falhas["index"].tolist() == [0, 1, 2]
+    # Dois blocos avaliados (4 falhas, 1 omitida); os outros 6 registros não são avaliados
+    assert resultado.omitidas == {"cpf": 1}
+    assert resultado.linhas_nao_avaliadas == {"cpf": 6}
+
+
+def test_limite_por_aba_interrompe_a_validacao():
+    df = pd.DataFrame({"cod_funcionario": range(-9, 1), "cpf": [f"x{i}" for i in range(10)], "nome": ["a"] * 10})
+    limites = validacao_blocos.LimitesErros(por_aba=3)
+    resultado = validacao_blocos.validar_com_limites(SCHEMA, df, limites, tamanho_bloco=2)
+    assert len(resultado.falhas) == 3
+    assert resultado.omitidas == {"*": 1} and resultado.linhas_nao_avaliadas == {"*": 8}
+
+
+def test_limite_por_coluna_poupa_avaliacao_em_aba_de_um_bloco():
+    df = pd.DataFrame({"cod_funcionario": range(1, 11), "cpf": [f"x{i}" for i in range(10)], "nome": ["a"] * 10})
+    limites = validacao_blocos.LimitesErros(por_coluna=3)
+    assert [len(b) for b in validacao_blocos.dividir_para_limites(df, 100, limites)] == [3, 6, 1]
+    resultado = validacao_blocos.validar_com_limites(SCHEMA, df, limites, tamanho_bloco=100)
+    assert resultado.falhas["index"].tolist() == [0, 1, 2]
+    assert resultado.omitidas == {} and resultado.linhas_nao_avaliadas == {"cpf": 7}
+
+
+def test_rodadas_deixam_de_avaliar_colunas_esgotadas():
+    df = pd.DataFrame({"cod_funcionario": range(1, 11), "cpf": [f"x{i}" for i in range(10)], "nome": ["a"] * 10})
+    chamadas = []
+    local = validacao_blocos.schema_sem_unicidade(SCHEMA)
+
+    def validar_rodada(blocos, ignorar):
+        chamadas.append((len(blocos), ignorar))
+        schema = validacao_blocos.schema_sem_checks(local, ignorar)
+        return [validacao_blocos.falhas(schema, bloco) for bloco in blocos]
+
+    limites = validacao_blocos.LimitesErros(por_coluna=3)
+    resultado = validacao_blocos.validar_com_limites(SCHEMA, df, limites, tamanho_bloco=2, validar_blocos=validar_rodada, blocos_por_rodada=2)
+    assert chamadas == [(2, ()), (2, ("cpf",)), (1, ("cpf",))]
+    assert resultado.falhas["index"].tolist() == [0, 1, 2]
+    assert resultado.omitidas == {"cpf": 1} and resultado.linhas_nao_avaliadas == {"cpf": 6}
+
+
+def test_falha_de_coercao_com_limites_nao_reavalia_colunas_esgotadas():
+    df = pd.DataFrame({
+        "cod_funcionario": [1, 2, 3, 4, 5, 6, 7, 8, "abc", 10],
+        "cpf": [f"x{i}" for i in range(10)],
+        "nome": ["a"] * 10,
+    })
+    limites = validacao_blocos.LimitesErros(por_coluna=3)
+    resultado = validacao_blocos.validar_com_limites(SCHEMA, df, limites, tamanho_bloco=2)
+    cpf = resultado.falhas[resultado.falhas["column"] == "cpf"]
+    assert cpf["index"].tolist() == [0, 1, 2]
+    assert resultado.omitidas == {"cpf": 1} and resultado.linhas_nao_avaliadas == {"cpf": 6}
+    assert "abc" in resultado.falhas.loc[resultado.falhas["column"] == "cod_funcionario", "failure_case"].tolist()
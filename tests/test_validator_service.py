@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import io
+import pandas as pd
+from openpyxl import Workbook
+from app.core import validator_service
+from app.core.instrumentacao import MEDIDOR_NULO
+
+
+def _chave(erro):
+    return tuple(sorted((k, str(v)) for k, v in erro.items()))
+
+
+def test_validacao_paralela_igual_a_sequencial(planilha_modelo):
+    conteudo = planilha_modelo
+    normalized, erros, stats = validator_service.validar_arquivo_excel(conteudo, usar_cache=False, max_workers=1)
+    normalized_par, erros_par, stats_par = validator_service.validar_arquivo_excel(conteudo, usar_cache=False, max_workers=2)
+    assert erros and erros_par == erros
+    assert stats_par.pop("timings") and stats.pop("timings")
+    assert stats_par == stats
+    assert list(normalized_par) == list(normalized)
+    for aba in normalized:
+        pd.testing.assert_frame_equal(normalized_par[aba], normalized[aba])
+
+
+def test_validacao_em_blocos_igual_a_sequencial(monkeypatch, planilha_modelo):
+    monkeypatch.setattr(validator_service, "TAMANHO_MINIMO_BLOCO", 1)
+    conteudo = planilha_modelo
+    _, erros, stats = validator_service.validar_arquivo_excel(conteudo, usar_cache=False, max_workers=1)
+    _, erros_blocos, stats_blocos = validator_service.validar_arquivo_excel(conteudo, usar_cache=False, max_workers=3)
+    assert any("field_uniqueness" in e["Mensagem Detalhada"] for e in erros_blocos)
+    assert sorted(map(_chave, erros_blocos)) == sorted(map(_chave, erros))
+    etapas_blocos = [(t["etapa"], t["aba"]) for t in stats_blocos.pop("timings")]
+    assert ("validacao_schema_blocos", "Modelo F") in etapas_blocos
+    assert ("leitura", "Modelo F") in etapas_blocos  # medido no worker e incorporado
+    stats.pop("timings")
+    assert stats_blocos == stats
+
+
+def test_timings_por_etapa_e_aba(planilha_modelo):
+    _, _, stats = validator_service.validar_arquivo_excel(planilha_modelo, usar_cache=False)
+    etapas = {(t["etapa"], t["aba"]) for t in stats["timings"]}
+    assert {("leitura", None), ("normalizar_textos", "Setores"), ("validacao_schema", "Modelo F"), ("integridade", None), ("total", None)} <= etapas
+    assert all(t["wall_s"] >= 0 and t["cpu_s"] >= 0 for t in stats["timings"])
+
+
+def test_instrumentacao_desligada_nao_gera_timings(monkeypatch, planilha_modelo):
+    monkeypatch.setattr(validator_service, "criar_medidor", lambda: MEDIDOR_NULO)
+    _, _, stats = validator_service.validar_arquivo_excel(planilha_modelo, usar_cache=False)
+    assert "timings" not in stats
+
+
+def test_limites_de_erros_geram_erro_resumo(monkeypatch, planilha_modelo):
+    monkeypatch.setattr(validator_service.validacao_blocos, "limites_de_settings", lambda: validator_service.validacao_blocos.LimitesErros(por_coluna=1, total=6))
+    _, erros, stats = validator_service.validar_arquivo_excel(planilha_modelo, usar_cache=False)
+    resumos = [e for e in erros if e["codigoERRO"] == "701"]
+    assert len(erros) == 7 and stats["total_erros"] == 7
+    assert resumos[-1]["Mensagem Detalhada"].startswith("Limite de 6 erros do arquivo atingido")
+    assert all(e["tipo"] == "LIMITE_ERROS" for e in resumos)
+
+
+def test_coluna_extra_reportada_sem_ser_lida():
+    wb = Workbook()
+    wb.remove(wb.active)
+    for aba, schema in validator_service.SCHEMAS.items():
+        wb.create_sheet(aba).append(list(schema.columns) + (["Observação"] if aba == "Cargos" else []))
+    wb["Cargos"].append([1, None, "Analista", None, "texto livre"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    normalized, erros, _ = validator_service.validar_arquivo_excel(buf.getvalue(), usar_cache=False)
+    assert "observacao" not in normalized["Cargos"].columns
+    assert normalized["Cargos"]["cod_cargo"].dtype == "int64"
+    extras = [e for e in erros if e["Mensagem Detalhada"] == "observacao, column_in_schema"]
+    assert len(extras) == 1 and extras[0]["planilha"] == "Cargos" and extras[0]["linha"] is None
+
+
+def test_abas_normalizadas_em_texto_arrow_e_categorias(planilha_modelo):
+    normalized, _, _ = validator_service.validar_arquivo_excel(planilha_modelo, usar_cache=False)
+    modelo_f = normalized["Modelo F"]
+    assert modelo_f["cpf"].dtype == "string[pyarrow]" and modelo_f["cod_cargo"].tolist() == ["1"] * 4
+    for coluna in ("sexo", "situacao", "uf", "cnpj_empresa"):
+        assert isinstance(modelo_f[coluna].dtype, pd.CategoricalDtype)
+    assert modelo_f["sexo"].cat.categories.dtype == "string[pyarrow]"
+    assert normalized["Empresas"]["cod_empresa"].dtype == "Int64"